@@ -1,7 +1,160 @@
-from .core.core import Core
+import json
+import sys
+from argparse import ArgumentParser
+from os.path import dirname, join, realpath
+
+from .core import coreutils, headless, memoryio
+from .core.breakpoints import parse_watch
+
+PROGRAMS_PATH = join(dirname(realpath(__file__)), 'programs')
+HEADLESS_TICKS = 11000
 
 if __name__ == '__main__':
-    program = []
-    with open('py-virpu/programs/fib.cor', 'r') as file:
-        program = [line.strip() for line in file.readlines()]
-    core = Core(program, execute_n=0, visual=True)
\ No newline at end of file
+    parser = ArgumentParser(description='Run assembly programs on the py-virpu default CPU.')
+    parser.add_argument('programs', nargs='*', default=[join(PROGRAMS_PATH, 'fib.cor')],
+                        help='assembly programs to run (default programs/fib.cor)')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without graphics and print the final state as JSON')
+    parser.add_argument('--ticks', type=int,
+                        help=f'clock cycles to run (default 0, or {HEADLESS_TICKS} if headless)')
+    parser.add_argument('--instructions', type=int,
+                        help='instructions to run, instead of --ticks')
+    parser.add_argument('--until', action='append', default=[], metavar='CONDITION',
+                        help="stop once a condition holds, e.g. 'r2=55', 'm3>=100' or 'pc=12'")
+    parser.add_argument('--watch', action='append', default=[], metavar='WATCH',
+                        help="stop on the tick a watch fires, e.g. 'pc=12', 'm3' for any "
+                             "write to address 3, or 'r2>=100' for a write meeting a condition")
+    parser.add_argument('--mem', action='append', default=[], metavar='START:END',
+                        help='data memory range to report when headless')
+    parser.add_argument('--mode', default='interpreted', choices=headless.RUN_MODES,
+                        help='headless tick mode, or the instruction-level emulator '
+                             'with or without translated blocks (default interpreted)')
+    parser.add_argument('--lockstep', action='store_true',
+                        help='compare the emulator against the simulation in --mode '
+                             'after every instruction and print the first mismatch')
+    parser.add_argument('--fast-forward', type=int, metavar='TICKS',
+                        help='emulate this many clock cycles before simulating in --mode')
+    parser.add_argument('--fast-forward-until', action='append', default=[],
+                        metavar='CONDITION',
+                        help='emulate until a condition holds before simulating in --mode')
+    parser.add_argument('--profile', action='store_true',
+                        help='print a per-component profile of each headless run to stderr')
+    parser.add_argument('--profile-stacks', metavar='PATH',
+                        help='write the profile as collapsed stacks for flamegraph tools')
+    parser.add_argument('--data-image', metavar='PATH',
+                        help='back data memory with a raw image of little-endian 32-bit words')
+    parser.add_argument('--image-mode', default='copy', choices=['read', 'copy'],
+                        help="'read' rejects writes to the data image, 'copy' keeps them "
+                             "private to the run (default copy)")
+    parser.add_argument('--load-mem', action='append', default=[], metavar='PATH[@START]',
+                        help='load data memory from a raw, Intel HEX (.hex) or run-length '
+                             '(.rle) file before each headless run (repeatable)')
+    parser.add_argument('--dump-mem', action='append', default=[], metavar='PATH[@START:END]',
+                        help='dump data memory to a file, in the format of its extension, '
+                             'after each headless run (repeatable)')
+    parser.add_argument('--program-images', action='store_true',
+                        help='run the programs as raw images of little-endian 32-bit machine '
+                             'code words instead of assembling them (headless only)')
+    parser.add_argument('--assemble', metavar='PATH',
+                        help='write the machine code of the first program as a raw image '
+                             'for --program-images and exit')
+    parser.add_argument('--log', help='write the component log to this file when headless')
+    parser.add_argument('--memory-file', metavar='PATH', default=coreutils.MEMORY_FILE,
+                        help='the file the tools panel dumps and loads data memory with '
+                             f'(default {coreutils.MEMORY_FILE})')
+    parser.add_argument('--resume', metavar='PATH',
+                        help='start headless runs from this checkpoint file')
+    parser.add_argument('--checkpoint', metavar='PATH',
+                        help='save the final headless state to this checkpoint file')
+    args = parser.parse_args()
+
+    if args.assemble:
+        from bitarray.util import ba2int
+        from .components.memorystore import write_image
+        from .corium import corium, translator
+        corium.init()
+        with open(args.programs[0], 'r') as file:
+            program = [line.strip() for line in file.readlines()]
+        write_image(args.assemble, [ba2int(word) for word in translator.translate(program)])
+        sys.exit(0)
+
+    if not args.headless:
+        if args.program_images:
+            parser.error('--program-images needs --headless')
+        from .core.core import Core
+        with open(args.programs[0], 'r') as file:
+            program = [line.strip() for line in file.readlines()]
+        ticks = args.ticks or 0
+        if args.instructions is not None:
+            ticks = args.instructions * coreutils.INS_CYCLES
+        core = Core(program, execute_n=ticks, visual=True, memory_path=args.memory_file)
+        sys.exit(0)
+
+    ticks = HEADLESS_TICKS if args.ticks is None else args.ticks
+    if args.instructions is not None:
+        ticks = args.instructions * coreutils.INS_CYCLES
+    try:
+        ranges = [headless.parse_range(text) for text in args.mem]
+        for text in args.until + args.fast_forward_until:
+            headless.parse_condition(text)
+        for text in args.watch:
+            parse_watch(text)
+        for text in args.load_mem + args.dump_mem:
+            memoryio.parse_file(text)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.checkpoint and len(args.programs) > 1:
+        parser.error('--checkpoint needs a single program')
+    profile = args.profile or args.profile_stacks is not None
+    if args.mode not in headless.MODES and (args.checkpoint or args.resume or args.lockstep
+                                            or args.watch or profile or args.data_image):
+        parser.error('--checkpoint, --resume, --lockstep, --watch, --profile and --data-image '
+                     'need a simulation --mode')
+    fast_forward = args.fast_forward is not None or args.fast_forward_until
+    if fast_forward and (args.mode not in headless.MODES or args.resume or args.lockstep
+                            or args.data_image or args.load_mem or args.program_images):
+        parser.error('--fast-forward needs a simulation --mode, without --resume, --lockstep, '
+                     '--data-image, --load-mem or --program-images')
+    if args.lockstep and args.program_images:
+        parser.error('--lockstep needs assembly programs')
+
+    if args.lockstep:
+        from .core.emulator import lockstep
+        mismatches = {}
+        for path in args.programs:
+            with open(path, 'r') as file:
+                program = [line.strip() for line in file.readlines()]
+            mismatches[path] = lockstep(program, ticks // coreutils.INS_CYCLES, args.mode)
+        print(json.dumps(mismatches, indent=2))
+        if any(mismatch is not None for mismatch in mismatches.values()):
+            sys.exit(1)
+        sys.exit(0)
+    options = headless.RunOptions(conditions=args.until,
+                                    ranges=ranges,
+                                    mode=args.mode,
+                                    resume_path=args.resume,
+                                    checkpoint_path=args.checkpoint,
+                                    fast_forward=args.fast_forward,
+                                    fast_forward_until=args.fast_forward_until,
+                                    watches=args.watch,
+                                    profile=profile,
+                                    data_image=args.data_image,
+                                    image_mode=args.image_mode,
+                                    load_files=args.load_mem,
+                                    dump_files=args.dump_mem,
+                                    images=args.program_images
+                                )
+    results = headless.run_programs(args.programs, ticks, options, log_path=args.log)
+    if profile:
+        stacks = []
+        for path, result in results.items():
+            profiled = result.pop('profile')
+            if args.profile:
+                print(f'{path}\n{profiled["report"]}', file=sys.stderr)
+            stacks.append(profiled['collapsed'])
+        if args.profile_stacks:
+            with open(args.profile_stacks, 'w') as file:
+                file.write('\n'.join(stacks) + '\n')
+    print(json.dumps(results, indent=2))
+    if (args.until or args.watch) and not all(result['stopped'] for result in results.values()):
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from os.path import dirname, join, realpath
+from typing import Dict, List
+
+PROGRAMS_PATH = join(dirname(dirname(realpath(__file__))), 'programs')
+
+def read_program(path:str) -> List[str]:
+    '''Read the lines of an assembly program.'''
+    with open(path, 'r') as file:
+        return [line.strip() for line in file.readlines()]
+
+def machine_info() -> Dict[str, object]:
+    '''Get metadata describing the machine and interpreter running a benchmark.'''
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count()
+    }
+
+def write_results(path:str, results:Dict[str, object]) -> None:
+    '''Write benchmark results to a JSON file in a stable, diffable order.'''
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+def read_results(path:str) -> Dict[str, object]:
+    '''Read benchmark results from a JSON file.'''
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def compare(baseline:Dict[str, float], 
+            current:Dict[str, float], 
+            threshold:float,
+            higher_is_better:bool=False
+        ) -> List[str]:
+    '''
+    Compare benchmark measurements against a baseline and report each one.
+
+    Parameters:
+        baseline: the baseline measurements by benchmark name
+        current: the current measurements by benchmark name
+        threshold: the relative change considered a regression
+        higher_is_better: whether larger measurements are improvements
+
+    Returns:
+        regressions: the names of the benchmarks that regressed
+    '''
+    regressions = []
+    for name in sorted(current):
+        if name not in baseline:
+            print(f'{name:<28} {"new":>10}')
+            continue
+        ratio = current[name] / baseline[name] if baseline[name] else 1.0
+        if higher_is_better:
+            regressed = ratio < 1.0 - threshold
+        else:
+            regressed = ratio > 1.0 + threshold
+        flag = 'REGRESSION' if regressed else ''
+        print(f'{name:<28} {ratio:>9.2f}x {flag}')
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def exit_on_regressions(regressions:List[str]) -> None:
+    '''Exit with a failure status if any benchmarks regressed.'''
+    if regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from os.path import join
+from typing import List
+
+from .common import PROGRAMS_PATH, read_program
+from ..components.ioport import IOPort
+from ..core.core import Core
+from ..signal.signal import Signal
+
+def instance_size(obj:object) -> int:
+    '''Get the size in bytes of an object and its attribute dict (if any).'''
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def memory_report(program:List[str], top:int=10) -> str:
+    '''
+    Build a report of the memory used by a headless core session.
+
+    The core is created with visual=False and the default setup loaded.
+    Only Python allocations are traced, so pygame surfaces are not counted.
+
+    Parameters:
+        program: the assembly program to load into memory
+        top: the number of source lines to list by allocated size (default 10)
+    '''
+    tracemalloc.start()
+    core = Core(program, execute_n=0, visual=False)
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    lines = ['Core(visual=False) memory report']
+    lines.append(f'  current: {current / 2**20:.2f} MiB')
+    lines.append(f'  peak:    {peak / 2**20:.2f} MiB')
+    lines.append(f'  Signal:  {instance_size(Signal.from_value(1))} B each')
+    lines.append(f'  IOPort:  {instance_size(IOPort("data", "any", "out"))} B each')
+    lines.append(f'Top {top} allocation sites:')
+    for stat in snapshot.statistics('lineno')[:top]:
+        frame = stat.traceback[0]
+        site = f'{os.path.basename(frame.filename)}:{frame.lineno}'
+        lines.append(f'  {site:<32} {stat.size / 2**10:>10.1f} KiB {stat.count:>8} blocks')
+    del core
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Report the memory footprint of a headless core.')
+    parser.add_argument('program', nargs='?', default=join(PROGRAMS_PATH, 'fib.cor'))
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    print(memory_report(read_program(args.program), args.top))
\ No newline at end of file
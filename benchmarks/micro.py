@@ -0,0 +1,222 @@
+import timeit
+from argparse import ArgumentParser
+from typing import Callable, Dict
+
+from bitarray.util import int2ba
+
+from .common import (compare, exit_on_regressions, machine_info,
+                     read_results, write_results)
+from ..components.alu import ALU
+from ..components.component import Component
+from ..components.controlunit import ControlUnit
+from ..components.decoder import Decoder
+from ..components.ioport import IOPort
+from ..components.memory import Memory
+from ..components.multiplexer import Multiplexer
+from ..components.net import Net
+from ..components.register import Register
+from ..components.stageregister import StageRegister
+from ..components.wire import Wire
+from ..core.canvas import Canvas
+from ..core.coredata import CoreData
+from ..corium import corium, translator
+from ..signal.signal import Signal
+
+BENCHMARKS = {}
+
+def benchmark(name:str) -> Callable:
+    '''Register a benchmark setup function under a name.'''
+    def register(setup:Callable[[], Callable[[], object]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+@benchmark('signal-init')
+def _signal_init() -> Callable[[], object]:
+    bits = int2ba(123456789, 32)
+    return lambda: Signal(bits)
+
+@benchmark('signal-from-value')
+def _signal_from_value() -> Callable[[], object]:
+    return lambda: Signal.from_value(12345)
+
+@benchmark('signal-add')
+def _signal_add() -> Callable[[], object]:
+    a = Signal.from_value(12345)
+    b = Signal.from_value(-678)
+    return lambda: a + b
+
+@benchmark('signal-sub')
+def _signal_sub() -> Callable[[], object]:
+    a = Signal.from_value(12345)
+    b = Signal.from_value(-678)
+    return lambda: a - b
+
+@benchmark('signal-invert')
+def _signal_invert() -> Callable[[], object]:
+    a = Signal.from_value(12345)
+    return lambda: ~a
+
+@benchmark('signal-and')
+def _signal_and() -> Callable[[], object]:
+    a = Signal.from_value(12345)
+    b = Signal.from_value(-678)
+    return lambda: a & b
+
+@benchmark('signal-or')
+def _signal_or() -> Callable[[], object]:
+    a = Signal.from_value(12345)
+    b = Signal.from_value(-678)
+    return lambda: a | b
+
+@benchmark('ioport-assign')
+def _ioport_assign() -> Callable[[], object]:
+    port = IOPort('data', 'data', 'in')
+    value = Signal.from_value(12345)
+    def assign() -> None: port.value = value
+    return assign
+
+@benchmark('ioport-assign-fit')
+def _ioport_assign_fit() -> Callable[[], object]:
+    port = IOPort('address', 'address', 'in', 16, False)
+    value = Signal.from_value(12345)
+    def assign() -> None: port.value = value
+    return assign
+
+@benchmark('wire-tick')
+def _wire_tick() -> Callable[[], object]:
+    wire_in = IOPort('data', 'data', 'out')
+    wire_in.value = Signal.from_value(12345)
+    wire = Wire(wire_in, IOPort('data', 'data', 'in'))
+    return wire.tick
+
+@benchmark('wire-fanout')
+def _wire_fanout() -> Callable[[], object]:
+    wire_in = IOPort('imm', 'data', 'out', 16)
+    wire_in.value = Signal.from_value(-123, 16)
+    sinks = [IOPort('imm', 'data', 'in', 16) for _ in range(3)]
+    wires = [Wire(wire_in, sink) for sink in sinks]
+    def transfer() -> None:
+        for wire in wires:
+            wire.tick()
+        for sink in sinks:
+            sink.value
+    return transfer
+
+@benchmark('net-fanout')
+def _net_fanout() -> Callable[[], object]:
+    source = IOPort('imm', 'data', 'out', 16)
+    source.value = Signal.from_value(-123, 16)
+    sinks = [IOPort('imm', 'data', 'in', 16) for _ in range(3)]
+    net = Net(source)
+    for sink in sinks:
+        net.attach(sink)
+    def transfer() -> None:
+        net.commit()
+        for sink in sinks:
+            sink.value
+    return transfer
+
+@benchmark('alu-execute')
+def _alu_execute() -> Callable[[], object]:
+    alu = ALU()
+    alu.in_by_id['data-a'].value = Signal.from_value(12345)
+    alu.in_by_id['data-b'].value = Signal.from_value(-678)
+    alu.in_by_id['alu-op'].value = Signal.from_value(2, 4, False)
+    return alu._execute
+
+@benchmark('decoder-execute')
+def _decoder_execute() -> Callable[[], object]:
+    dec = Decoder()
+    ins = translator.translate_line('ADDI 1 3 3')
+    dec.in_by_id['ins'].value = Signal(ins, 32, False)
+    return dec._execute
+
+@benchmark('controlunit-execute')
+def _controlunit_execute() -> Callable[[], object]:
+    con = ControlUnit()
+    con.in_by_id['opcode'].value = Signal.from_value(13, 8, False)
+    return con._execute
+
+@benchmark('memory-execute')
+def _memory_execute() -> Callable[[], object]:
+    mem = Memory()
+    mem.in_by_id['address'].value = Signal.from_value(42, 16, False)
+    return mem._execute
+
+@benchmark('register-execute')
+def _register_execute() -> Callable[[], object]:
+    reg = Register()
+    reg.in_by_id['reg-a'].value = Signal.from_value(1, 4, False)
+    reg.in_by_id['reg-b'].value = Signal.from_value(2, 4, False)
+    return reg._execute_read
+
+@benchmark('multiplexer-execute')
+def _multiplexer_execute() -> Callable[[], object]:
+    mult = Multiplexer()
+    mult.in_by_id['src'].value = Signal.from_bool(True)
+    mult.in_by_id['input-1'].value = Signal.from_value(12345)
+    return mult._execute
+
+@benchmark('stageregister-execute')
+def _stageregister_execute() -> Callable[[], object]:
+    stage = StageRegister()
+    stage.n_inputs = 8
+    for in_port in stage.in_ports:
+        in_port.value = Signal.from_value(12345)
+    return stage._execute
+
+def _slow_canvas(scheduled:bool) -> Canvas:
+    '''Get a canvas of stage registers that execute once every MAX_CYCLES ticks.'''
+    canvas = Canvas(CoreData(), None, scheduled=scheduled)
+    for phase in range(64):
+        stage = StageRegister()
+        stage.n_inputs = 1
+        stage.cycles = Component.MAX_CYCLES
+        stage.counter = phase % Component.MAX_CYCLES + 1
+        canvas.add_component(stage)
+    return canvas
+
+@benchmark('canvas-tick-slow')
+def _canvas_tick_slow() -> Callable[[], object]:
+    return _slow_canvas(False).tick
+
+@benchmark('canvas-tick-slow-scheduled')
+def _canvas_tick_slow_scheduled() -> Callable[[], object]:
+    return _slow_canvas(True).tick
+
+def run(names:list=None, number:int=20000, repeat:int=5) -> Dict[str, float]:
+    '''
+    Run microbenchmarks and return the best time per call in nanoseconds.
+
+    Parameters:
+        names: the benchmarks to run (default None, meaning all)
+        number: the number of calls per timing (default 20000)
+        repeat: the number of timings to take the best of (default 5)
+    '''
+    corium.init()
+    timings = {}
+    for name in names or sorted(BENCHMARKS):
+        func = BENCHMARKS[name]()
+        best = min(timeit.Timer(func).repeat(repeat, number))
+        timings[name] = best / number * 1e9
+        print(f'{name:<28} {timings[name]:>10.1f} ns')
+    return timings
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Time the Signal and component hot paths.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default all)')
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown flagged as a regression (default 0.10)')
+    args = parser.parse_args()
+
+    timings = run(args.names, args.number, args.repeat)
+    if args.out:
+        write_results(args.out, {'machine': machine_info(), 'ns_per_call': timings})
+    if args.compare:
+        baseline = read_results(args.compare)['ns_per_call']
+        exit_on_regressions(compare(baseline, timings, args.threshold))
\ No newline at end of file
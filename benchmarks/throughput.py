@@ -0,0 +1,105 @@
+import resource
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from os.path import basename, join
+from typing import Dict, List
+
+import pygame as pg
+
+from .common import (compare, exit_on_regressions, machine_info, 
+                     PROGRAMS_PATH, read_program, read_results, write_results)
+from ..core import coreutils
+from ..core import logger
+from ..core.canvas import Canvas
+from ..core.coredata import CoreData
+from ..core.headless import MODES
+from ..corium import corium
+
+PROGRAMS = ['fib.cor', 'mult.cor', 'first-n.cor']
+
+def peak_rss_kib() -> int:
+    '''Get the peak resident set size of the process in KiB.'''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def run_program(path:str, ticks:int, mode:str='interpreted') -> Dict[str, float]:
+    '''
+    Run a program on the default setup for a fixed number of ticks.
+
+    Parameters:
+        path: the path of the assembly program to run
+        ticks: the number of clock cycles to run
+        mode: the way the canvas ticks, one of MODES (default 'interpreted')
+    '''
+    canvas = Canvas(CoreData(), None,
+                    compiled=mode == 'compiled',
+                    event_driven=mode == 'event-driven',
+                    netted=mode == 'netted',
+                    scheduled=mode == 'scheduled')
+    coreutils.load_default_setup(canvas, read_program(path))
+    start = time.perf_counter()
+    canvas.run(ticks)
+    elapsed = time.perf_counter() - start
+    return {
+        'ticks': ticks,
+        'seconds': round(elapsed, 4),
+        'ticks_per_sec': round(ticks / elapsed, 1),
+        'instructions_per_sec': round(ticks / coreutils.INS_CYCLES / elapsed, 1),
+        'peak_rss_kib': peak_rss_kib()
+    }
+
+def _measure(path:str, ticks:int, mode:str) -> Dict[str, float]:
+    '''Set up a fresh worker process and measure a single program in it.'''
+    corium.init()
+    pg.init()
+    logger.init()
+    result = run_program(path, ticks, mode)
+    logger.cleanup()
+    return result
+
+def run(paths:List[str], ticks:int, mode:str='interpreted') -> Dict[str, Dict[str, float]]:
+    '''
+    Run each program on the default setup and measure its throughput.
+
+    Each program runs in its own freshly spawned process, so its peak RSS
+    is its own rather than the high-water mark of every earlier program.
+
+    Parameters:
+        paths: the paths of the assembly programs to run
+        ticks: the number of clock cycles to run each program for
+        mode: the way the canvas ticks, one of MODES (default 'interpreted')
+    '''
+    results = {}
+    for path in paths:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(_measure, path, ticks, mode).result()
+        results[basename(path)] = result
+        print(f'{basename(path):<16} {result["ticks_per_sec"]:>12.1f} ticks/s '
+              f'{result["instructions_per_sec"]:>10.1f} ins/s '
+              f'{result["peak_rss_kib"]:>10} KiB')
+    return results
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Measure end-to-end throughput of the default CPU.')
+    parser.add_argument('programs', nargs='*', 
+                        default=[join(PROGRAMS_PATH, name) for name in PROGRAMS])
+    parser.add_argument('--ticks', type=int, default=11000)
+    parser.add_argument('--mode', choices=MODES, default='interpreted',
+                        help='the way the canvas ticks (default interpreted)')
+    parser.add_argument('--out', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown flagged as a regression (default 0.10)')
+    args = parser.parse_args()
+
+    results = run(args.programs, args.ticks, args.mode)
+    if args.out:
+        write_results(args.out, {'machine': machine_info(), 'programs': results})
+    if args.compare:
+        baseline = read_results(args.compare)['programs']
+        current = {name: res['ticks_per_sec'] for name, res in results.items()}
+        previous = {name: res['ticks_per_sec'] for name, res in baseline.items()}
+        exit_on_regressions(compare(previous, current, args.threshold, True))
\ No newline at end of file
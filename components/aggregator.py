@@ -1,5 +1,3 @@
-from bitarray import bitarray
-
 from .component import Component
 from .ioport import IOPort
 from ..signal.signal import Signal
@@ -13,6 +11,8 @@ class Aggregator(Component):
     No logic is performed on the individual bit signals.
     '''
 
+    PURE = True
+
     def __init__(self):
         '''Initialize Aggregator object and extend Component'''
         in_ports = [IOPort('bit-0', 'any', 'in', 1, False)]
@@ -68,8 +68,6 @@ class Aggregator(Component):
         The aggregator combines n 1-bit unsigned inputs into one n-bit
         (un)signed output without performing any bit logic on the inputs.
         '''
-        bits = bitarray(self._width)
-        for i in range(self._width):
-            bits[i] = self.in_ports[i].value[0]
-        value = Signal(bits, self._width, self._signed)
+        bits = [in_port.value for in_port in self.in_ports[:self._width]]
+        value = Signal.concat(*bits, signed=self._signed)
         self.out_by_id['data'].value = value
\ No newline at end of file
@@ -9,6 +9,8 @@ class ALU(Component):
     This class is a functional logic component that performs logical and 
     arithmatic functions on two incoming values.
     '''
+
+    PURE = True
     
     def __init__(self):
         '''Initialize the ALU object and extend Component.'''
@@ -37,7 +39,7 @@ class ALU(Component):
         data_a = self.in_by_id['data-a'].value
         data_b = self.in_by_id['data-b'].value
 
-        value = Signal()
+        value = Signal.from_value(0)
         flag = Signal.from_bool(False)
         if op == 0:
             value = data_a & data_b
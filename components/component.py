@@ -1,14 +1,15 @@
 from __future__ import annotations
 from math import ceil
-from typing import List, Tuple, Union
-
-from pygame import Rect, Surface
+from typing import Callable, List, TYPE_CHECKING, Tuple, Union
 
 from .ioport import IOPort
 from ..panels.panel import Panel
 from ..signal.signal import Signal
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Rect, Surface
+
 class Component(Panel):
     '''
     A class to represent functional logic components that extends Panel. 
@@ -31,9 +32,11 @@ class Component(Panel):
         counter (int): the number of cycles until the component's next execution
         config_options (str): the component's available configuration options
         bounding_box (Rect): the minimum rectangle that contains the component and its IO ports
+        PURE (bool): whether execution depends only on the input port values
     '''        
 
     NEXT_ID = 0
+    PURE = False
     MAX_CYCLES = 10
     HEIGHT = 120
     WIDTH = 300
@@ -65,11 +68,12 @@ class Component(Panel):
         self.out_ports = [] if out_ports is None else out_ports
         self.out_by_id = {out_port.id: out_port for out_port in self.out_ports}
 
-        self._value = Signal()
+        self._value = Signal.from_value(0)
         self._width = 32
         self._signed = True
         self._cycles = 1
         self._counter = 1
+        self._scheduler = None
 
         self.config_options = config_options
         
@@ -77,9 +81,7 @@ class Component(Panel):
 
     def reposition_ports(self) -> None:
         '''Reposition the component's IO ports.'''
-        bb_x = self._x - IOPort.SIZE[0] // 2
-        bb_w = self._w + IOPort.SIZE[0]
-        self._bounding_box = Rect(bb_x, self._y, bb_w, self._h)
+        self._bounding_box = None
         in_x = self._x - IOPort.SIZE[0] // 2
         in_y_off = 0 if self._ins == 0 else self._h // self._ins
         in_y = self._y + in_y_off // 2 - IOPort.SIZE[1] // 2
@@ -133,7 +135,7 @@ class Component(Panel):
     def _set_width(self, val:int) -> None:
         '''Set the bit width of the component.'''
         self._width = max(1, min(32, val))
-        self._value = Signal(width=self._width, signed=self._signed)
+        self._value = Signal.from_value(0, self._width, self._signed)
 
     width = property(_get_width, _set_width)
 
@@ -144,7 +146,7 @@ class Component(Panel):
     def _set_signed(self, val:bool) -> None:
         '''Set the signage of the component.'''
         self._signed = val
-        self._value = Signal(width=self._width, signed=self._signed)
+        self._value = Signal.from_value(0, self._width, self._signed)
 
     signed = property(_get_signed, _set_signed)
 
@@ -160,22 +162,37 @@ class Component(Panel):
     @property
     def counter(self) -> int:
         '''Get or set the number of cycles until next component execution'''
+        if self._scheduler is not None:
+            return self._scheduler.counter(self)
         return self._counter
 
     @counter.setter
     def counter(self, val:int) -> None:
         self._counter = max(1, min(self._cycles, val))
+        if self._scheduler is not None:
+            self._scheduler.reschedule(self)
 
     def _comp_size(self) -> Tuple[int, int]:
         '''Get the best size of the component for the number of IO ports.'''
         return Component.WIDTH, ceil(max([1, self._ins, self._outs]) / 2.0) * Component.HEIGHT
 
+    @property
+    def bounding_box(self) -> Rect:
+        '''Get the minimum rectangle that contains the component and its IO ports.'''
+        if self._bounding_box is None:
+            from pygame import Rect
+            bb_x = self._x - IOPort.SIZE[0] // 2
+            bb_w = self._w + IOPort.SIZE[0]
+            self._bounding_box = Rect(bb_x, self._y, bb_w, self._h)
+        return self._bounding_box
+
     def collides(self, collision_pos:Tuple[int, int]) -> bool:
         '''Extend Panel to detect IO port collision.'''
-        return self._bounding_box.collidepoint(collision_pos)
+        return self.bounding_box.collidepoint(collision_pos)
 
     def _add_port(self, port:IOPort) -> None:
         '''Add an IO port to the component.'''
+        IOPort.GENERATION += 1
         if port.dir == 'in' and self._ins + 1 <= 32:
             self.in_ports.insert(0, port)
             self.in_by_id[port.id] = port
@@ -188,6 +205,7 @@ class Component(Panel):
 
     def _remove_port(self, port:IOPort) -> None:
         '''Remove an IO port from the component.'''
+        IOPort.GENERATION += 1
         if port.dir == 'in':
             self.in_ports.remove(port)
             self.in_by_id.pop(port.port_id)
@@ -208,7 +226,7 @@ class Component(Panel):
         Parameters:
                 pos: the position to check for a collision
         '''
-        if self._bounding_box.collidepoint(pos):
+        if self.bounding_box.collidepoint(pos):
             for in_port in self.in_ports:
                 if in_port.collides(pos):
                     return in_port
@@ -222,6 +240,22 @@ class Component(Panel):
         '''Execute the component's functional logic.'''
         pass
 
+    def _passthrough(self) -> List[Tuple[IOPort, IOPort]]:
+        '''
+        Get the (input, output) port pairs that execution copies values
+        between, in order, or None if execution does anything else.
+        '''
+        return None
+
+    def _clocks(self) -> List[Tuple[str, Callable[[], None]]]:
+        '''
+        Get the (counter attribute, execute method) pairs that tick counts
+        down and runs, in order, or None if tick does anything else.
+        '''
+        if type(self).tick is not Component.tick:
+            return None
+        return [('_counter', self._execute)]
+
     def tick(self) -> None:
         '''
         Decrement the cycle counter and execute the component's logic.
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from .component import Component
 from .ioport import IOPort
 from ..corium import corium
@@ -14,7 +16,18 @@ class ControlUnit(Component):
         data (List[Signal]): the control bits corresponding to each opcode
     '''
 
+    PURE = True
+
     OPCODES = 16
+    FIELDS = [
+                ('reg-w-con', 10, 1),
+                ('alu-a-src', 9, 1),
+                ('alu-b-src', 7, 2),
+                ('alu-op', 3, 4),
+                ('branch', 2, 1),
+                ('mem-w', 1, 1),
+                ('wrt-src', 0, 1)
+            ]
 
     def __init__(self):
         '''Initialize ControlUnit object and extend Component.'''
@@ -44,35 +57,27 @@ class ControlUnit(Component):
 
         raw_bitarrays = corium.get_control_bits()
         self._data = []
+        self._outputs = []
         for bitarray in raw_bitarrays:
-            self._data.append(Signal(bitarray, 11, False))
+            data = Signal(bitarray, 11, False)
+            self._data.append(data)
+            self._outputs.append(self._split(data))
+
+    def _split(self, data:Signal) -> Dict[str, Signal]:
+        '''Split a set of control bits into output signals by port ID.'''
+        outputs = {}
+        for port_id, lo, width in ControlUnit.FIELDS:
+            outputs[port_id] = data.field(lo, width)
+        return outputs
         
     def _execute(self) -> None:
         '''
         Execute the control unit's function logic.
 
-        The control unit splits an opcode into its control bits.
+        The control unit splits an opcode into its control bits. The split
+        signals are computed once per opcode when the unit is initialized.
         '''
         address = self.in_by_id['opcode'].value
-        data = self._data[address.value]
-
-        reg_w = Signal(data[:1], 1, False)
-        self.out_by_id['reg-w-con'].value = reg_w
-
-        alu_a = Signal(data[1:2], 1, False)
-        self.out_by_id['alu-a-src'].value = alu_a
-
-        alu_b = Signal(data[2:4], 2, False)
-        self.out_by_id['alu-b-src'].value = alu_b
-
-        alu_op = Signal(data[4:8], 4, False)
-        self.out_by_id['alu-op'].value = alu_op
-
-        branch = Signal(data[8:9], 1, False)
-        self.out_by_id['branch'].value = branch
-
-        mem_w = Signal(data[9:10], 1, False)
-        self.out_by_id['mem-w'].value = mem_w
-
-        wrt_src = Signal(data[10:], 1, False)
-        self.out_by_id['wrt-src'].value = wrt_src
\ No newline at end of file
+        outputs = self._outputs[address.value]
+        for port_id, value in outputs.items():
+            self.out_by_id[port_id].value = value
\ No newline at end of file
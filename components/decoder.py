@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from .component import Component
 from .ioport import IOPort
 from ..corium import corium
@@ -9,8 +11,15 @@ class Decoder(Component):
 
     This class is a functional logic component that splits an instruction into
     its opcode and arguments.
+
+    The split signals of each instruction word are cached by the word, so a
+    loop decodes each of its instructions once. Keying on the word rather
+    than its address means a rewritten program word simply misses the cache.
     '''
 
+    PURE = True
+    CACHE_SIZE = 4096
+
     def __init__(self):
         '''Initialize the Decoder object and extend Component.'''
         ins_port = IOPort('ins', 'data', 'in', 32, False)
@@ -34,6 +43,26 @@ class Decoder(Component):
                             in_ports=in_ports,
                             out_ports=out_ports
                         )
+        self._decoded = {}
+
+    def _split(self, ins:Signal) -> List[Tuple[str, Signal]]:
+        '''
+        Split an instruction into output signals by port ID, with None for
+        the ports its opcode does not use.
+        '''
+        opcode = ins.field(24, 8)
+        outputs = [('opcode', opcode)]
+        args = corium.get_arg_dests(opcode.value)
+
+        arg_hi = 24
+        for port_id in ['imm', 'reg-a', 'reg-b', 'reg-w']:
+            if port_id in args:
+                arg_w = 16 if port_id == 'imm' else 4
+                arg_hi -= arg_w
+                outputs.append((port_id, ins.field(arg_hi, arg_w, port_id == 'imm')))
+            else:
+                outputs.append((port_id, None))
+        return outputs
         
     def _execute(self) -> None:
         '''
@@ -42,17 +71,13 @@ class Decoder(Component):
         The decoder splits an instruction into its opcode and arguments.
         '''
         ins = self.in_by_id['ins'].value
-        opcode = Signal(ins[:8], 8, False)
-        self.out_by_id['opcode'].value = opcode
-        args = corium.get_arg_dests(opcode.value)
-
-        curr_bit = 8
-        for port_id in ['imm', 'reg-a', 'reg-b', 'reg-w']:
-            if port_id in args:
-                arg_w = 16 if port_id == 'imm' else 4
-                arg_bits = ins[curr_bit:curr_bit + arg_w]
-                curr_bit += arg_w
-                out_sig = Signal(arg_bits, arg_w, port_id == 'imm')
-                self.out_by_id[port_id].value = out_sig
+        outputs = self._decoded.get(ins)
+        if outputs is None:
+            if len(self._decoded) >= Decoder.CACHE_SIZE:
+                self._decoded.clear()
+            outputs = self._decoded[ins] = self._split(ins)
+        for port_id, value in outputs:
+            if value is None:
+                self.out_by_id[port_id].zero()
             else:
-                self.out_by_id[port_id].zero()
\ No newline at end of file
+                self.out_by_id[port_id].value = value
\ No newline at end of file
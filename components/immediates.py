@@ -1,5 +1,3 @@
-from bitarray import bitarray
-
 from .component import Component
 from .ioport import IOPort
 from ..signal.signal import Signal
@@ -12,6 +10,8 @@ class LeftShifter(Component):
     immediate into a 32-bit signed value by shifting it left 16 bits.
     '''
 
+    PURE = True
+
     def __init__(self):
         '''Initialize the LeftShifter object and extend Component.'''
         in_ports = [IOPort('imm', 'data', 'in', 16)]
@@ -29,10 +29,8 @@ class LeftShifter(Component):
         The left shifter extends a 16-bit signed immediate into a 32-bit
         signed value by shifting it left 16 bits.
         '''
-        zeros = bitarray(16)
-        zeros.setall(0)
-        bits = self.in_by_id['imm'].value.bits + zeros
-        value = Signal(bits)
+        imm = self.in_by_id['imm'].value
+        value = Signal.concat(imm, Signal.from_value(0, 16, False))
         self.out_by_id['data'].value = value
 
 
@@ -45,6 +43,8 @@ class SignExtender(Component):
     immediate into a 32-bit signed value by replicating its sign bit.
     '''
 
+    PURE = True
+
     def __init__(self):
         '''Initialize the SignExtender object and extend Component.'''
         in_ports = [IOPort('imm', 'data', 'in', 16)]
@@ -62,6 +62,5 @@ class SignExtender(Component):
         The sign extender extends a 16-bit signed immediate into a 32-bit
         signed value by replicating its sign bit.
         '''
-        dec_val = self.in_by_id['imm'].value.value
-        value = Signal.from_value(dec_val)
+        value = self.in_by_id['imm'].value.sign_extend(32)
         self.out_by_id['data'].value = value
\ No newline at end of file
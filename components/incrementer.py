@@ -8,6 +8,8 @@ class Incrementer(Component):
     This class is a functional logic component that adds 1 to an incoming
     value.
     '''
+
+    PURE = True
     
     def __init__(self):
         '''Initialize the Incrementer object and extend Component.'''
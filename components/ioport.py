@@ -1,9 +1,13 @@
-from pygame import draw, Surface
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
 
 from ..panels.panel import Panel
 from ..signal.signal import Signal
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Surface
+
 class IOPort(Panel):
     '''
     Class to represent IO ports that extends Panel.
@@ -19,6 +23,19 @@ class IOPort(Panel):
     '''
 
     SIZE = (100, 40)
+    GENERATION = 0
+
+    __slots__ = (
+                    'id',
+                    'type',
+                    'dir',
+                    'config_options',
+                    '_width',
+                    '_signed',
+                    '_value',
+                    '_net',
+                    '_net_adapter'
+                )
 
     def __init__(self, 
                     id:str,
@@ -37,18 +54,21 @@ class IOPort(Panel):
             width (int): bit-width of IO signal (default 32)
             signed (bool): signage of IO signal (default True)
         '''
-        Panel.__init__(self, [id], size=IOPort.SIZE)
+        Panel.__init__(self, id, size=IOPort.SIZE)
         self.id = id
         self.type = type
         self.dir = dir
         self._width = width
         self._signed = signed
-        self._value = Signal(width=width, signed=signed)
+        self._value = Signal.from_value(0, width, signed)
+        self._net = None
+        self._net_adapter = None
         self.config_options = 'ws'
 
     def zero(self) -> None:
         '''Zero out the value of the IO port.'''
-        self._value = Signal(width=self._width, signed=self._signed)
+        self._hold()
+        self._value = Signal.from_value(0, self._width, self._signed)
 
     @property
     def width(self) -> int:
@@ -58,6 +78,7 @@ class IOPort(Panel):
     @width.setter
     def width(self, val:int) -> None:
         self._width = max(1, min(32, val))
+        IOPort.GENERATION += 1
         self.zero()
 
     @property
@@ -68,24 +89,68 @@ class IOPort(Panel):
     @signed.setter
     def signed(self, val:bool) -> None:
         self._signed = val
+        IOPort.GENERATION += 1
         self.zero()
 
     @property
     def value(self) -> Signal:
-        '''Get or set the current value of the IO port.'''
-        return self._value
+        '''
+        Get or set the current value of the IO port.
+
+        Ports attached to a net read the net's value. Setting the value 
+        holds it until the net's next commit, as a wire would overwrite it.
+        '''
+        net = self._net
+        if net is None:
+            return self._value
+        if self._net_adapter is None:
+            return net.value
+        return self._net_adapter(net.value)
 
     @value.setter
     def value(self, val:Signal):
-        w_sm = val.width < self._width
-        w_lg = val.width > self._width
-        bits = val.bits
-        if w_sm:
-            pass
-        elif w_lg:
-            i = val.width - self._width
-            bits = bits[i:]
-        self._value = Signal(bits, self._width, self._signed)
+        if self._net is not None:
+            self._hold()
+        if val.width == self._width and val.signed == self._signed:
+            self._value = val
+        else:
+            self._value = self.adapter(val.width, val.signed)(val)
+
+    def _hold(self) -> None:
+        '''Detach the port from its net until the net's next commit.'''
+        if self._net is not None:
+            self._net.held.append((self, self._net))
+            self._net = None
+
+    def adapter(self, width:int, signed:bool) -> Callable[[Signal], Signal]:
+        '''
+        Get a function that fits signals of a given width and signage to the 
+        port, or None if the signals can be used as they are.
+
+        Wider signals are truncated to their lowest bits. Narrower signals are
+        sign extended if the port is signed and zero extended otherwise.
+
+        Parameters:
+            width: the bit-width of the incoming signals
+            signed: the signage of the incoming signals
+        '''
+        port_w = self._width
+        port_s = self._signed
+        if width == port_w and signed == port_s:
+            return None
+        mask = (1 << port_w) - 1
+        if width < port_w and port_s:
+            sign_bit = 1 << (width - 1)
+            ext = mask ^ ((1 << width) - 1)
+            def adapt(val:Signal) -> Signal:
+                raw = val.raw
+                if raw & sign_bit:
+                    raw |= ext
+                return Signal.from_raw(raw, port_w, port_s)
+        else:
+            def adapt(val:Signal) -> Signal:
+                return Signal.from_raw(val.raw & mask, port_w, port_s)
+        return adapt
 
     def render(self, buffer:Surface, theme:Theme) -> None:
         '''
@@ -95,8 +160,9 @@ class IOPort(Panel):
             buffer: the pygame surface to render on to
             theme: the color and layout scheme to use for rendering
         '''
+        from pygame import draw
         if self._hovered:
-            content = theme.medium_text(self._value)
+            content = theme.medium_text(self.value)
         else:
             content = theme.medium_text(self.id)
         super().render(
@@ -110,7 +176,7 @@ class IOPort(Panel):
             draw.rect(
                         buffer, 
                         theme.bord_col, 
-                        self._rect, 
+                        self.rect, 
                         theme.bord_w,
                         border_top_right_radius=theme.bord_r,
                         border_bottom_right_radius=theme.bord_r
@@ -119,11 +185,11 @@ class IOPort(Panel):
             draw.rect(
                         buffer, 
                         theme.bord_col, 
-                        self._rect, 
+                        self.rect, 
                         theme.bord_w,
                         border_top_left_radius=theme.bord_r,
                         border_bottom_left_radius=theme.bord_r
                     )
-        content_x = self._rect.centerx - content.get_width() // 2
-        content_y = self._rect.centery - content.get_height() // 2
+        content_x = self.rect.centerx - content.get_width() // 2
+        content_y = self.rect.centery - content.get_height() // 2
         buffer.blit(content, (content_x, content_y))
\ No newline at end of file
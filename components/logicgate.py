@@ -10,6 +10,8 @@ class LogicGate(Component):
     not be directly instantiated.
     '''
 
+    PURE = True
+
     def __init__(self, comp_name:str, n_inputs:int=2):
         '''
         Initialize LogicGate object and extend Component.
@@ -1,9 +1,10 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from bitarray import bitarray
 
 from .component import Component
 from .ioport import IOPort
+from .memorystore import MemoryImage, MemoryStore
 from ..core import logger
 from ..signal.signal import Signal
 
@@ -14,8 +15,12 @@ class Memory(Component):
     This class is a functional logic component that retrieves or stores data 
     at a given memory address.
 
+    The contents are held in a MemoryStore, which only keeps the cells that
+    were written. Every other cell of a data memory holds its address, and
+    every cell past a loaded program holds its distance from the program.
+
     Attributes:
-        data (List[Signal]): the memory contents indexed by memory address
+        data (MemoryStore): the memory contents indexed by memory address
     '''
 
     MAX_MEM = 65536
@@ -33,7 +38,8 @@ class Memory(Component):
                             out_ports=out_ports,
                             config_options='t'
                         )
-        self._data = [Signal.from_value(i) for i in range(Memory.MAX_MEM)]
+        self._data = MemoryStore(Memory.MAX_MEM)
+        self._watches = {}
 
     def __getitem__(self, key:object) -> Union[Signal, List[Signal]]:
         '''Return a signal or slice of signals from the memory cell.'''
@@ -43,13 +49,57 @@ class Memory(Component):
         '''Load a program into memory.'''
         self._label = 'Program'
         self.out_by_id['data'].signed = False
-        mem = [Signal(bitarr, signed=False) for bitarr in program]
-        rem_mem = Memory.MAX_MEM - len(mem)
-        mem_ext = [Signal.from_value(i, signed=False) for i in range(rem_mem)]
-        mem.extend(mem_ext)
+        mem = MemoryStore(Memory.MAX_MEM, len(program), False)
+        for address, bitarr in enumerate(program):
+            mem.write(address, Signal(bitarr, signed=False))
         self._data = mem
         self._execute()
-        
+
+    def load_program_image(self, path:str) -> None:
+        '''
+        Load a program from a raw binary image of machine code words.
+
+        The image is mapped read-only, so the program cannot be written.
+        '''
+        self._label = 'Program'
+        self.out_by_id['data'].signed = False
+        image = MemoryImage(path, 'read')
+        self._data = MemoryStore(Memory.MAX_MEM, len(image), False, image)
+        self._execute()
+
+    def map_image(self, path:str, mode:str='copy') -> None:
+        '''
+        Back the memory with a raw binary image of 32-bit words.
+
+        The first cells of the memory take their contents from the image,
+        and cells written before are reset. In 'read' mode writes to the
+        image cells raise a ValueError; in 'copy' mode they only change this
+        memory.
+
+        Parameters:
+            path: the path of the image file
+            mode: 'read' or 'copy' (default 'copy')
+        '''
+        data = self._data
+        self._data = MemoryStore(Memory.MAX_MEM, data.offset, data.signed, MemoryImage(path, mode))
+        self._data.mark_dirty(0, Memory.MAX_MEM)
+
+    def dirty_pages(self) -> List[int]:
+        '''Get the numbers of the pages written since the last clear_dirty.'''
+        return self._data.dirty_pages()
+
+    def dirty_ranges(self) -> List[Tuple[int, int]]:
+        '''Get the (start, end) address ranges of runs of dirty pages.'''
+        return self._data.dirty_ranges()
+
+    def clear_dirty(self) -> None:
+        '''Mark every page clean.'''
+        self._data.clear_dirty()
+
+    def diff(self, other:'Memory', start:int=0, end:int=None) -> List[int]:
+        '''Get the addresses from start up to end whose contents differ from another memory.'''
+        return self._data.diff(other._data, start, end)
+
     def _execute(self) -> None:
         '''
         Execute the memory's functional logic.
@@ -59,7 +109,9 @@ class Memory(Component):
         address = self.in_by_id['address'].value
         if bool(self.in_by_id['mem-w'].value):
             value = self.in_by_id['data'].value
-            self._data[address.value] = value
+            self._data.write(address.value, value)
+            if self._watches and address.value in self._watches:
+                self._watches[address.value](value)
             logger.log(f'Memory: wrote {value} to address {hex(address.value)}')
         else:
-            self.out_by_id['data'].value = self._data[address.value]
\ No newline at end of file
+            self.out_by_id['data'].value = self._data.read(address.value)
\ No newline at end of file
@@ -0,0 +1,257 @@
+from __future__ import annotations
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from ..signal.signal import Signal
+
+IMAGE_MODES = ['read', 'copy']
+PAGE_BITS = 8
+
+class MemoryImage:
+    '''
+    A class to map a raw binary image of little-endian 32-bit words into
+    memory.
+
+    The file is mapped read-only, so opening it takes constant time, no
+    per-word objects are built, and every process mapping the same file
+    shares its physical pages. In 'read' mode a memory backed by the image
+    rejects writes. In 'copy' mode writes go to the memory's own cells and
+    the image is left untouched.
+
+    Attributes:
+        path (str): The absolute path of the image file
+        mode (str): 'read' or 'copy'
+    '''
+
+    def __init__(self, path:str, mode:str='copy'):
+        '''
+        Initialize the MemoryImage object and map the file.
+
+        Parameters:
+            path: the path of the image file
+            mode: 'read' or 'copy' (default 'copy')
+        '''
+        if mode not in IMAGE_MODES:
+            raise ValueError(f'Unknown image mode: {mode}')
+        self.path = os.path.abspath(path)
+        self.mode = mode
+        self._map = None
+        self._words = []
+        with open(path, 'rb') as file:
+            size = file.seek(0, 2)
+            if size % 4:
+                raise ValueError(f'Image size is not a whole number of words: {path}')
+            if size:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                view = memoryview(self._map)
+                if sys.byteorder == 'little':
+                    self._words = view.cast('I')
+                else:
+                    self._words = array('I')
+                    self._words.frombytes(view)
+                    self._words.byteswap()
+
+    def __len__(self) -> int:
+        '''Get the number of words in the image.'''
+        return len(self._words)
+
+    def __getitem__(self, index:int) -> int:
+        '''Get a word of the image as an unsigned integer.'''
+        return self._words[index]
+
+    def words(self, start:int, end:int) -> array:
+        '''Get the words of the image from index start up to end.'''
+        words = array('I')
+        words.frombytes(self._words[start:end].tobytes())
+        return words
+
+def write_image(path:str, words:Iterable[int]) -> None:
+    '''Write integers as a raw binary image of little-endian 32-bit words.'''
+    image = array('I', [word & 0xffffffff for word in words])
+    if sys.byteorder != 'little':
+        image.byteswap()
+    with open(path, 'wb') as file:
+        image.tofile(file)
+
+class MemoryStore:
+    '''
+    A class to hold the contents of a memory component sparsely.
+
+    Only written cells hold a signal. Every other cell holds its default
+    contents, built when the cell is read: the word at its address in the
+    backing image, if there is one, or else the 32-bit signal for its address
+    minus an offset. Writing a cell its default contents releases it, so two
+    stores with the same contents hold the same cells.
+
+    Every write also marks its page of 2 ** PAGE_BITS cells dirty in a byte
+    per page, so the pages written since the last clear_dirty can be listed
+    without scanning the cells.
+
+    Attributes:
+        offset (int): The address whose default contents are zero
+        signed (bool): The signage of the default contents
+        image (MemoryImage): The image backing the first cells, or None
+    '''
+
+    def __init__(self,
+                    size:int,
+                    offset:int=0,
+                    signed:bool=True,
+                    image:MemoryImage=None
+                ):
+        '''
+        Initialize the MemoryStore object with every cell at its default.
+
+        Parameters:
+            size: the number of cells
+            offset: the address whose default contents are zero (default 0)
+            signed: the signage of the default contents (default True)
+            image: an image backing the first cells (default None)
+        '''
+        self._size = size
+        self.offset = offset
+        self.signed = signed
+        self.image = image
+        self._image_words = 0 if image is None else min(len(image), size)
+        self._cells = {}
+        self._dirty = bytearray((size + (1 << PAGE_BITS) - 1) >> PAGE_BITS)
+
+    def default(self, address:int) -> Signal:
+        '''Get the default contents of a cell.'''
+        if address < self._image_words:
+            return Signal.from_raw(self.image[address], 32, self.signed)
+        return Signal.from_raw((address - self.offset) & 0xffffffff, 32, self.signed)
+
+    def read(self, address:int) -> Signal:
+        '''Get the contents of a cell.'''
+        cell = self._cells.get(address)
+        if cell is None:
+            return self.default(address)
+        return cell
+
+    def write(self, address:int, signal:Signal) -> None:
+        '''Set the contents of a cell.'''
+        if not 0 <= address < self._size:
+            raise IndexError('memory address out of range')
+        if address < self._image_words and self.image.mode == 'read':
+            raise ValueError(f'Cannot write to read-only image address {hex(address)}')
+        self._dirty[address >> PAGE_BITS] = 1
+        if signal == self.default(address):
+            self._cells.pop(address, None)
+        else:
+            self._cells[address] = signal
+
+    def words(self, start:int, end:int) -> array:
+        '''Get the contents of the cells from address start up to end as raw words.'''
+        start, end, _ = slice(start, end).indices(self._size)
+        offset = self.offset
+        words = array('I', [(address - offset) & 0xffffffff for address in range(start, end)])
+        image_end = min(end, self._image_words)
+        if start < image_end:
+            words[:image_end - start] = self.image.words(start, image_end)
+        for address, signal in self._cells.items():
+            if start <= address < end:
+                words[address - start] = signal._raw
+        return words
+
+    def load_words(self, start:int, words:Iterable[int]) -> None:
+        '''Set the contents of the cells from address start to raw words.'''
+        signed = self.signed
+        for address, word in enumerate(words, start):
+            self.write(address, Signal.from_raw(word & 0xffffffff, 32, signed))
+
+    def dirty_pages(self) -> List[int]:
+        '''Get the numbers of the pages written since the last clear_dirty.'''
+        dirty = self._dirty
+        return [page for page in range(len(dirty)) if dirty[page]]
+
+    def dirty_ranges(self) -> List[Tuple[int, int]]:
+        '''Get the (start, end) address ranges of runs of dirty pages.'''
+        ranges = []
+        for page in self.dirty_pages():
+            start = page << PAGE_BITS
+            end = min(start + (1 << PAGE_BITS), self._size)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def clear_dirty(self) -> None:
+        '''Mark every page clean.'''
+        self._dirty[:] = bytes(len(self._dirty))
+
+    def mark_dirty(self, start:int, end:int) -> None:
+        '''Mark the pages holding the addresses from start up to end dirty.'''
+        if start < end:
+            first = start >> PAGE_BITS
+            last = (end - 1) >> PAGE_BITS
+            self._dirty[first:last + 1] = b'\x01' * (last + 1 - first)
+
+    def follow(self, previous:MemoryStore) -> None:
+        '''
+        Take over the dirty pages of a store this store replaces, and mark
+        dirty every page whose contents differ from it.
+        '''
+        self._dirty[:] = previous._dirty
+        for address in self.diff(previous):
+            self._dirty[address >> PAGE_BITS] = 1
+
+    def diff(self, other:MemoryStore, start:int=0, end:int=None) -> List[int]:
+        '''
+        Get the addresses from start up to end whose contents differ from
+        another store of the same size.
+
+        Stores with the same defaults only compare their written cells.
+        '''
+        start, end, _ = slice(start, end).indices(self._size)
+        if (self.offset == other.offset and self.signed == other.signed
+                and self.image is other.image):
+            addresses = sorted({address for address in (*self._cells, *other._cells)
+                                if start <= address < end})
+            return [address for address in addresses
+                    if self.read(address) != other.read(address)]
+        words = self.words(start, end)
+        other_words = other.words(start, end)
+        return [start + index for index in range(len(words))
+                if words[index] != other_words[index]]
+
+    def cells(self) -> Dict[int, Signal]:
+        '''Get the cells that do not hold their default contents, by address.'''
+        return self._cells
+
+    def copy(self) -> MemoryStore:
+        '''Get a copy of the store.'''
+        store = MemoryStore(self._size, self.offset, self.signed, self.image)
+        store._cells = dict(self._cells)
+        store._dirty[:] = self._dirty
+        return store
+
+    def __len__(self) -> int:
+        '''Get the number of cells.'''
+        return self._size
+
+    def __iter__(self) -> Iterator[Signal]:
+        '''Iterate over the contents of every cell.'''
+        read = self.read
+        return (read(address) for address in range(self._size))
+
+    def __getitem__(self, key:Union[int, slice]) -> Union[Signal, List[Signal]]:
+        '''Get the contents of a cell or a slice of cells.'''
+        if isinstance(key, slice):
+            read = self.read
+            return [read(address) for address in range(*key.indices(self._size))]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError('memory address out of range')
+        return self.read(key)
+
+    def __setitem__(self, key:int, signal:Signal) -> None:
+        '''Set the contents of a cell.'''
+        if key < 0:
+            key += self._size
+        self.write(key, signal)
\ No newline at end of file
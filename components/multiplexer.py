@@ -9,6 +9,8 @@ class Multiplexer(Component):
     multiple according to a control signal.
     '''
 
+    PURE = True
+
     MAX_IN = 4
     MIN_IN = 2
 
@@ -0,0 +1,71 @@
+from typing import List, Tuple
+
+from .ioport import IOPort
+
+def rejoin(held:List[Tuple[IOPort, 'Net']]) -> None:
+    '''Reattach sinks that were set directly to their nets, and forget them.'''
+    for sink, net in held:
+        sink._net = net
+    held.clear()
+
+class Net:
+    '''
+    A class to represent IO ports that share a single value.
+
+    A net connects an outbound IO port (the source) to inbound IO ports (the
+    sinks). Sinks do not hold their own copy of the value; reading a sink 
+    reads the net's value, fitted to the sink's width and signage only if 
+    they differ from the source's. The net's value is updated from the source
+    once per clock cycle by commit, no matter how many sinks it has.
+
+    Attributes:
+        source (IOPort): the outbound IO port that drives the net
+        sinks (List[IOPort]): the inbound IO ports that read the net
+        value (Signal): the value of the net as of the last commit
+        held (List[Tuple[IOPort, Net]]): sinks set directly since the last
+            commit, with their nets, shared by nets that commit together
+    '''
+
+    __slots__ = ('source', 'sinks', 'value', 'held')
+
+    def __init__(self, source:IOPort, held:List[Tuple[IOPort, 'Net']]=None):
+        '''
+        Initialize the Net object with the source's current value.
+
+        Parameters:
+            source: the outbound IO port that drives the net
+            held: the list of held sinks to share with other nets (default None)
+        '''
+        self.source = source
+        self.sinks = []
+        self.value = source.value
+        self.held = [] if held is None else held
+
+    def attach(self, sink:IOPort) -> None:
+        '''Attach an inbound IO port to the net.'''
+        sink._net_adapter = sink.adapter(self.source.width, self.source.signed)
+        sink._net = self
+        self.sinks.append(sink)
+
+    def detach(self) -> None:
+        '''
+        Detach all sinks, leaving each holding the value it reads. Held sinks
+        of every net sharing the held list are forgotten.
+        '''
+        for sink in self.sinks:
+            if sink._net is self:
+                sink._value = sink.value
+                sink._net = None
+        self.sinks = []
+        self.held.clear()
+
+    def commit(self) -> None:
+        '''
+        Update the net's value from its source.
+        
+        Sinks that were set directly since the last commit read their nets
+        again, just as a wire would have overwritten their value.
+        '''
+        self.value = self.source._value
+        if self.held:
+            rejoin(self.held)
\ No newline at end of file
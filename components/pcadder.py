@@ -9,6 +9,8 @@ class PCAdder(Component):
     This class is a functional logic component that adds an offset to the
     program counter.
     '''
+
+    PURE = True
     
     def __init__(self):
         '''Initialize the PCAdder object and extend Component.'''
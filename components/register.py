@@ -1,3 +1,5 @@
+from typing import Callable, List, Tuple
+
 from .component import Component
 from .ioport import IOPort
 from ..core import logger
@@ -42,7 +44,8 @@ class Register(Component):
                             config_options='t'
                         )
 
-        self._data = [Signal() for _ in range(Register.REGISTERS)]
+        self._data = [Signal.from_value(0) for _ in range(Register.REGISTERS)]
+        self._watches = {}
         self._read_counter = self._cycles
         self._write_counter = self._cycles
 
@@ -70,8 +73,14 @@ class Register(Component):
             reg_w_add = self.in_by_id['reg-w'].value
             reg_w_val = self.in_by_id['data-w'].value
             self._data[reg_w_add.value] = reg_w_val
+            if self._watches and reg_w_add.value in self._watches:
+                self._watches[reg_w_add.value](reg_w_val)
             logger.log(f'Register: wrote {reg_w_val} to register {reg_w_add.value}')
 
+    def _clocks(self) -> List[Tuple[str, Callable[[], None]]]:
+        '''Override Component to account for writing, then reading.'''
+        return [('_write_counter', self._execute_write), ('_read_counter', self._execute_read)]
+
     def tick(self) -> None:
         '''Override Component to account for reading and writing.'''
         self._write_counter -= 1
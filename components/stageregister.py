@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from .component import Component
 from .ioport import IOPort
 
@@ -12,6 +14,8 @@ class StageRegister(Component):
         n_inputs (int): the number of values the register should store and pass
     '''
 
+    PURE = True
+
     def __init__(self):
         '''Initialize the StageRegister object and extend Component.'''
         Component.__init__(self,
@@ -70,4 +74,8 @@ class StageRegister(Component):
         processor stages.
         '''
         for port_id, in_port in self.in_by_id.items():
-            self.out_by_id[port_id].value = in_port.value
\ No newline at end of file
+            self.out_by_id[port_id].value = in_port.value
+
+    def _passthrough(self) -> List[Tuple[IOPort, IOPort]]:
+        '''Override Component as execution only copies inputs to outputs.'''
+        return [(in_port, self.out_by_id[port_id]) for port_id, in_port in self.in_by_id.items()]
\ No newline at end of file
@@ -1,10 +1,12 @@
-from typing import Tuple
-
-from pygame import draw, Surface
+from __future__ import annotations
+from typing import TYPE_CHECKING, Tuple
 
 from .ioport import IOPort
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Surface
+
 class Wire:
     '''
     A class to represent a wire connecting two IO ports.
@@ -24,9 +26,38 @@ class Wire:
             wire_out: the IOPort that serves as the wire's output (default None)
         '''
         self.wire_in = wire_in
+        self._wire_out = None
+        self._adapter = None
+        self._generation = -1
+        self._last_in = None
+        self._last_out = None
         self.wire_out = wire_out
         self._route = []
 
+    @property
+    def wire_out(self) -> IOPort:
+        '''Get or set the IOPort that serves as the wire's output.'''
+        return self._wire_out
+
+    @wire_out.setter
+    def wire_out(self, val:IOPort) -> None:
+        self._wire_out = val
+        self._generation = -1
+
+    def _plan(self) -> None:
+        '''
+        Plan the transfer between the wire's ports.
+
+        Matching ports pass values through as they are; otherwise the output
+        port's adapter is stored for the wire to use. The plan is redone
+        whenever any IO port's width or signage changes.
+        '''
+        self._generation = IOPort.GENERATION
+        self._adapter = self.wire_out.adapter(
+                                                self.wire_in.width,
+                                                self.wire_in.signed
+                                            )
+
     def __str__(self) -> str:
         '''Return a string representing the wire.'''
         return str(self.wire_in.value)
@@ -55,8 +86,41 @@ class Wire:
 
     def tick(self) -> None:
         '''Transfer the wire's input value to the wire's output port.'''
-        if self.wire_out is not None:
-            self.wire_out.value = self.wire_in.value
+        wire_out = self._wire_out
+        if wire_out is None:
+            return
+        if self._generation != IOPort.GENERATION:
+            self._plan()
+        if self._adapter is None:
+            wire_out._value = self.wire_in._value
+        else:
+            wire_out._value = self._adapter(self.wire_in._value)
+
+    def propagate(self) -> bool:
+        '''
+        Transfer the wire's input value only if it has changed.
+
+        Returns:
+            fired: boolean indicating if the output port's value was set
+        '''
+        wire_out = self._wire_out
+        if wire_out is None:
+            return False
+        if self._generation != IOPort.GENERATION:
+            self._plan()
+            self._last_in = None
+        value = self.wire_in._value
+        if self._adapter is None:
+            if wire_out._value is value:
+                return False
+            wire_out._value = value
+            return True
+        if value is self._last_in and wire_out._value is self._last_out:
+            return False
+        self._last_in = value
+        self._last_out = self._adapter(value)
+        wire_out._value = self._last_out
+        return True
 
     def _render_segment(self, 
                         buffer:Surface, 
@@ -75,6 +139,7 @@ class Wire:
             pos_a: the start position of the line segment
             pos_b: the end position of the line segment
         '''
+        from pygame import draw
         y_off = self.wire_in.width // 2
         a_x = pos_a[0]
         a_y = pos_a[1] - y_off
@@ -98,10 +163,10 @@ class Wire:
             theme: the color and layout scheme to use for rendering
             mouse_pos: position for drawing a wire to the mouse (default None)
         '''
-        route = [(self.wire_in._rect.right, self.wire_in._rect.centery)]
+        route = [(self.wire_in.rect.right, self.wire_in.rect.centery)]
         route += self._route
         if self.wire_out is not None:
-            route += [(self.wire_out._rect.left, self.wire_out._rect.centery)]
+            route += [(self.wire_out.rect.left, self.wire_out.rect.centery)]
         elif mouse_pos is not None:
             route += [mouse_pos]
 
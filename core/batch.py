@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import time
+from argparse import ArgumentParser
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from itertools import product
+from typing import Dict, Iterator, List, Union
+
+from . import coreutils, memoryio
+from .emulator import Emulator
+from .headless import Headless, Run, RunOptions, RUN_MODES, parse_range, read_program
+from ..components.memory import Memory
+
+SLICE_TICKS = 1100
+
+JOB_OPTIONS = {
+    'until': 'conditions',
+    'mem': 'ranges',
+    'mode': 'mode',
+    'resume': 'resume_path',
+    'checkpoint': 'checkpoint_path',
+    'fast-forward': 'fast_forward',
+    'fast-forward-until': 'fast_forward_until',
+    'watch': 'watches',
+    'profile': 'profile',
+    'data-image': 'data_image',
+    'image-mode': 'image_mode',
+    'load-mem': 'load_files',
+    'dump-mem': 'dump_files',
+    'registers': 'registers',
+    'memory': 'memory',
+    'program-image': 'images'
+}
+
+def digest(core:Union[Headless, Emulator]) -> str:
+    '''Get a SHA-256 digest of the PC, registers and data memory of a run.'''
+    state = hashlib.sha256(','.join(map(str, [core.pc] + core.registers)).encode())
+    state.update(memoryio.encode_raw(core.words(0, Memory.MAX_MEM)))
+    return state.hexdigest()
+
+def job_options(job:Dict[str, object]) -> RunOptions:
+    '''Get the run options of a job from its JOB_OPTIONS keys.'''
+    values = {name: job[key] for key, name in JOB_OPTIONS.items() if key in job}
+    values['ranges'] = [parse_range(text) for text in values.get('ranges', [])]
+    for name in ('registers', 'memory'):
+        values[name] = {int(index): value for index, value in values.get(name, {}).items()}
+    return RunOptions(**values)
+
+def run_job(job:Dict[str, object]) -> Dict[str, object]:
+    '''
+    Run a single batch job and report its result.
+
+    A job is a dict with the path of the 'program' to run and, optionally,
+    the maximum 'ticks' (default 11000), a per-run 'timeout' in seconds, and
+    the run options in JOB_OPTIONS, named as on the command line: the tick
+    'mode', 'until' stop conditions, 'mem' ranges to report, a checkpoint
+    to 'resume' from or save to ('checkpoint'), 'fast-forward' ticks or
+    'fast-forward-until' conditions, 'watch'es, 'profile', a raw
+    'data-image' to back data memory with (in 'image-mode' 'read' or
+    'copy'), memory files to 'load-mem' and 'dump-mem', initial 'registers'
+    and data 'memory' values by index, and 'program-image' if the program
+    is a raw machine code image. The run is set up by headless.Run, and a
+    run that exceeds its timeout is stopped between slices of SLICE_TICKS
+    ticks.
+
+    Parameters:
+        job: the job to run
+    '''
+    start = time.perf_counter()
+    result = {'program': job['program']}
+    try:
+        options = job_options(job)
+        if options.images:
+            run = Run([], job.get('ticks', 11000), options, job['program'])
+        else:
+            run = Run(read_program(job['program']), job.get('ticks', 11000), options)
+        timeout = job.get('timeout')
+        status = 'done'
+        while run.remaining > 0:
+            if run.step(SLICE_TICKS):
+                status = 'stopped'
+                break
+            if timeout is not None and time.perf_counter() - start > timeout:
+                status = 'timeout'
+                break
+        result.update(run.report())
+        result['status'] = status
+        result['digest'] = digest(run.core)
+    except Exception as error:
+        result['status'] = 'error'
+        result['error'] = f'{type(error).__name__}: {error}'
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+def _run_chunk(chunk:List[Dict[str, object]]) -> List[Dict[str, object]]:
+    '''Run a chunk of indexed jobs in a worker process.'''
+    results = []
+    for index, job in chunk:
+        result = run_job(job)
+        result['index'] = index
+        results.append(result)
+    return results
+
+def run_batch(jobs:List[Dict[str, object]],
+                workers:int=None,
+                chunksize:int=1,
+                ordered:bool=False
+            ) -> Iterator[Dict[str, object]]:
+    '''
+    Fan jobs out to a pool of worker processes and yield their results.
+
+    Results are yielded as soon as their chunk completes, or in job order if
+    ordered. Each result carries the index of its job.
+
+    Parameters:
+        jobs: the jobs to run, as accepted by run_job
+        workers: the number of worker processes (default one per CPU)
+        chunksize: the number of jobs sent to a worker at once (default 1)
+        ordered: whether to yield results in job order (default False)
+    '''
+    indexed = list(enumerate(jobs))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), max(1, chunksize))]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+        if not ordered:
+            for future in as_completed(futures):
+                yield from future.result()
+            return
+        pending = {}
+        next_index = 0
+        for future in as_completed(futures):
+            for result in future.result():
+                pending[result['index']] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+
+def make_jobs(programs:List[str],
+                modes:List[str],
+                ticks:int,
+                until:List[str],
+                mem:List[str],
+                timeout:float=None,
+                repeat:int=1,
+                resume:str=None,
+                data_image:str=None,
+                image_mode:str='copy'
+            ) -> List[Dict[str, object]]:
+    '''Make a job for every combination of program, mode and repetition.'''
+    jobs = []
+    for program, mode, _ in product(programs, modes, range(repeat)):
+        job = {'program': program, 'mode': mode, 'ticks': ticks, 'until': until, 'mem': mem}
+        if timeout is not None:
+            job['timeout'] = timeout
+        if resume is not None:
+            job['resume'] = resume
+        if data_image is not None:
+            job['data-image'] = data_image
+            job['image-mode'] = image_mode
+        jobs.append(job)
+    return jobs
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run many programs and configurations in parallel.')
+    parser.add_argument('programs', nargs='*', help='assembly programs to run')
+    parser.add_argument('--jobs', help='JSON lines file of jobs, as accepted by run_job')
+    parser.add_argument('--mode', action='append', choices=RUN_MODES,
+                        help='tick mode to run each program in (repeatable)')
+    parser.add_argument('--ticks', type=int, default=11000)
+    parser.add_argument('--instructions', type=int, help='instructions to run, instead of --ticks')
+    parser.add_argument('--until', action='append', default=[], metavar='CONDITION')
+    parser.add_argument('--mem', action='append', default=[], metavar='START:END')
+    parser.add_argument('--repeat', type=int, default=1, help='runs of each configuration')
+    parser.add_argument('--workers', type=int, help='worker processes (default one per CPU)')
+    parser.add_argument('--chunksize', type=int, default=1, help='jobs sent to a worker at once')
+    parser.add_argument('--timeout', type=float, help='per-run timeout in seconds')
+    parser.add_argument('--resume', metavar='PATH', help='start every run from this checkpoint')
+    parser.add_argument('--data-image', metavar='PATH',
+                        help='back data memory of every run with this raw word image')
+    parser.add_argument('--image-mode', default='copy', choices=['read', 'copy'])
+    parser.add_argument('--ordered', action='store_true', help='print results in job order')
+    args = parser.parse_args()
+
+    ticks = args.ticks
+    if args.instructions is not None:
+        ticks = args.instructions * coreutils.INS_CYCLES
+    jobs = make_jobs(args.programs, args.mode or ['interpreted'], ticks, args.until,
+                        args.mem, args.timeout, args.repeat, args.resume, args.data_image,
+                        args.image_mode)
+    if args.jobs:
+        with open(args.jobs, 'r') as file:
+            jobs += [json.loads(line) for line in file if line.strip()]
+    if not jobs:
+        parser.error('no programs or jobs given')
+
+    start = time.perf_counter()
+    failed = 0
+    for result in run_batch(jobs, args.workers, args.chunksize, args.ordered):
+        failed += result['status'] in ('error', 'timeout')
+        print(json.dumps(result, sort_keys=True), flush=True)
+    print(json.dumps({
+        'jobs': len(jobs),
+        'failed': failed,
+        'seconds': round(time.perf_counter() - start, 4)
+    }, sort_keys=True), flush=True)
+    if failed:
+        raise SystemExit(1)
\ No newline at end of file
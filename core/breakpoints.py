@@ -0,0 +1,151 @@
+import operator
+import re
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from .coredata import CoreData
+from ..components.component import Component
+from ..components.memory import Memory
+from ..components.register import Register
+from ..signal.signal import Signal
+
+OPERATORS = {
+    '==': operator.eq,
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '>': operator.gt
+}
+
+WATCH = re.compile(r'^\s*(pc|r\d+|m\d+)\s*(?:(==|!=|<=|>=|=|<|>)\s*(-?(?:0x)?[0-9a-fA-F]+))?\s*$')
+
+class Breakpoints:
+    '''
+    A class to hold breakpoints and watchpoints on the default setup.
+
+    A watch is written like a stop condition. 'pc=12' breaks when the PC
+    changes to 12, 'm3' or 'r2' breaks on any write to data memory address 3
+    or register 2, and 'm3>=100' or 'r2!=0' breaks on a write of a value that
+    meets the condition.
+
+    Memory and register watches are installed as a lookup table on the data
+    memory and register bank, which consult it only when it is not empty and
+    only on writes. PC watches are checked when the PC changes.
+
+    Attributes:
+        hits (List[Dict[str, object]]): The watches that fired since the last
+            start, with the tick and the value that fired them
+        active (bool): Whether any watch is set
+        watches (List[str]): The text of every watch that is set
+    '''
+
+    def __init__(self, core_data:CoreData, parts:Dict[str, Component]):
+        '''
+        Initialize the Breakpoints object.
+
+        Parameters:
+            core_data: The current core state object
+            parts: The default setup components, as returned by load_default_setup
+        '''
+        self._core_data = core_data
+        self._pc_port = parts['ins-reg'].out_by_id['next-ins']
+        self._targets = {'m': parts['data-mem'], 'r': parts['reg']}
+        self._watches = {}
+        self._pc_checks = []
+        self._last_pc = None
+        self.hits = []
+
+    @property
+    def active(self) -> bool:
+        '''Get whether any watch is set.'''
+        return bool(self._watches)
+
+    @property
+    def watches(self) -> List[str]:
+        '''Get the text of every watch that is set.'''
+        return list(self._watches)
+
+    def add(self, text:str) -> None:
+        '''Add a watch such as 'pc=12', 'm3' or 'r2>=100'.'''
+        self._watches[text] = parse_watch(text)
+        self._install()
+
+    def remove(self, text:str) -> None:
+        '''Remove a watch.'''
+        del self._watches[text]
+        self._install()
+
+    def clear(self) -> None:
+        '''Remove every watch.'''
+        self._watches.clear()
+        self._install()
+
+    def _install(self) -> None:
+        '''Rebuild the lookup tables consulted by the watched components.'''
+        tables = {kind: {} for kind in self._targets}
+        self._pc_checks = []
+        for text, (kind, index, check) in self._watches.items():
+            if kind == 'p':
+                self._pc_checks.append((text, check))
+            else:
+                tables[kind].setdefault(index, []).append((text, check))
+        for kind, component in self._targets.items():
+            component._watches = {index: partial(self._written, checks)
+                                    for index, checks in tables[kind].items()}
+
+    def _written(self, checks:List, value:Signal) -> None:
+        '''Record the watches fired by a write to a watched address.'''
+        for text, check in checks:
+            if check is None or check(value.value):
+                self._hit(text, value.value)
+
+    def _hit(self, text:str, value:int) -> None:
+        '''Record a fired watch.'''
+        self.hits.append({'ticks': self._core_data.ticks, 'watch': text, 'value': value})
+
+    def start(self) -> None:
+        '''Clear the hits before a run and note the current PC.'''
+        self.hits.clear()
+        self._last_pc = self._pc_port.value.value
+
+    def fired(self) -> bool:
+        '''Check the PC watches after a tick and get whether any watch fired.'''
+        if self._pc_checks:
+            pc = self._pc_port.value.value
+            if pc != self._last_pc:
+                self._last_pc = pc
+                for text, check in self._pc_checks:
+                    if check(pc):
+                        self._hit(text, pc)
+        return bool(self.hits)
+
+def parse_watch(text:str) -> Tuple[str, int, Callable[[int], bool]]:
+    '''
+    Parse a watch such as 'pc=12', 'm3' or 'r2>=100'.
+
+    Returns:
+        kind: 'p' for the PC, 'm' for data memory or 'r' for a register
+        index: the watched address or register, or None for the PC
+        check: the condition on the value, or None to fire on every write
+    '''
+    match = WATCH.match(text)
+    if match is None:
+        raise ValueError(f'Invalid watch: {text}')
+    target, op, value = match.groups()
+    if target == 'pc':
+        if op is None:
+            raise ValueError(f'Invalid watch: {text}')
+        index = None
+    else:
+        index = int(target[1:])
+        limit = Memory.MAX_MEM if target[0] == 'm' else Register.REGISTERS
+        if index >= limit:
+            raise ValueError(f'Invalid watch: {text}')
+    check = None
+    if op is not None:
+        compare = OPERATORS[op]
+        value = int(value, 0)
+        check = lambda actual: compare(actual, value)
+    return target[0], index, check
\ No newline at end of file
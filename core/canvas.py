@@ -1,11 +1,17 @@
-from typing import Tuple, Union
+from __future__ import annotations
+from typing import Dict, TYPE_CHECKING, Tuple, Union
 
 from .coredata import CoreData
-from .graphics import Graphics
+from .engine import Engine
+from .scheduler import Scheduler
 from ..components.component import Component
 from ..components.ioport import IOPort
+from ..components.net import Net, rejoin
 from ..components.wire import Wire
 
+if TYPE_CHECKING:
+    from .graphics import Graphics
+
 class Canvas:
     '''
     A class to track and manage functional logic components.
@@ -15,14 +21,30 @@ class Canvas:
         graphics (Graphics): The current graphics object
         components (List[Component]): The components currently on the canvas
         wires (List[Wire]): The wires currently on the canvas
+        compiled (bool): Whether ticks run through the compiled netlist engine
+        event_driven (bool): Whether ticks skip unchanged wires and components
+        netted (bool): Whether connected ports share values through nets
+        scheduled (bool): Whether components only run on ticks they execute
+        stats (Dict[str, int]): Counts of work done and skipped in event mode
     '''
-    def __init__(self, core_data:CoreData, graphics:Graphics):
+    def __init__(self, 
+                    core_data:CoreData, 
+                    graphics:Graphics, 
+                    compiled:bool=False,
+                    event_driven:bool=False,
+                    netted:bool=False,
+                    scheduled:bool=False
+                ):
         '''
         Initialize the Canvas object.
 
         Parameters:
             core_data: The current core state object
             graphics: The current graphics object
+            compiled: Whether to tick using the compiled engine (default False)
+            event_driven: Whether to skip unchanged work (default False)
+            netted: Whether to share port values through nets (default False)
+            scheduled: Whether to schedule component execution (default False)
         '''
         self._core_data = core_data
         self._graphics = graphics
@@ -30,21 +52,65 @@ class Canvas:
         self._components = []
         self._wires = []
 
+        self._engine = Engine(core_data)
+        self.compiled = compiled
+
+        self.event_driven = event_driven
+        self._last_inputs = {}
+        self._fanout = None
+        self._always = []
+        self._ports = []
+        self._seen = None
+        self._generation = IOPort.GENERATION
+        self._stale = True
+        self.stats = {}
+        self.reset_stats()
+
+        self.netted = netted
+        self._nets = None
+        self._net_sources = []
+        self._held = []
+        self._net_generation = -1
+        self._profiled = False
+
+        self.scheduled = scheduled
+        self._scheduler = Scheduler(core_data)
+
+    def _changed(self) -> None:
+        '''Note that the components or wires on the canvas have changed.'''
+        self._engine.invalidate()
+        self._fanout = None
+        self._unbind_nets()
+        self._scheduler.release()
+
+    def reset_stats(self) -> None:
+        '''Reset the counts of work done and skipped in event-driven mode.'''
+        self.stats = {
+            'executions': 0,
+            'executions-skipped': 0,
+            'wire-transfers': 0,
+            'wire-transfers-skipped': 0
+        }
+
     def add_component(self, component:Component) -> None:
         '''Add a component to the canvas.'''
         self._components.append(component)
+        self._changed()
 
     def remove_component(self, component:Component) -> None:
         '''Remove a component from the canvas.'''
         self._components.remove(component)
+        self._changed()
 
     def add_wire(self, wire:Wire) -> None:
         '''Add a wire to the canvas.'''
         self._wires.append(wire)
+        self._changed()
 
     def remove_wire(self, wire:Wire) -> None:
         '''Remove a wire from the canvas.'''
         self._wires.remove(wire)
+        self._changed()
 
     def remove_wires(self, component:Component) -> None:
         '''Remove all wires connected to component from the canvas.'''
@@ -57,6 +123,7 @@ class Canvas:
                     to_remove.append(wire)
             for wire in to_remove:
                 self._wires.remove(wire)
+            self._changed()
 
     def remove_wires_from_port(self, io_port:IOPort) -> None:
         '''Remove all wires connected to io_port from the canvas.'''
@@ -67,6 +134,7 @@ class Canvas:
                     to_remove.append(wire)
             for wire in to_remove:
                 self._wires.remove(wire)
+            self._changed()
 
     def at_pos(self, pos:Tuple[int, int]) -> Union[Component, IOPort]:
         '''Return the component or IO port at the given position.'''
@@ -74,13 +142,200 @@ class Canvas:
             if component.collides(pos):
                 return component.at_pos(pos)
 
-    def tick(self) -> None:
-        '''Perform a single clock cycle on all components and wires.'''
-        self._core_data.ticks += 1
+    def _plan_events(self) -> None:
+        '''
+        Plan which wires to propagate after each component executes.
+
+        Wires are grouped by the component that owns their input port. Wires
+        that share an output port with another wire, or whose input port is 
+        not owned by a component on the canvas, are propagated every tick.
+        '''
+        owners = {}
+        for component in self._components:
+            for out_port in component.out_ports:
+                owners[id(out_port)] = component
+        drivers = {}
+        for wire in self._wires:
+            drivers[id(wire.wire_out)] = drivers.get(id(wire.wire_out), 0) + 1
+        self._fanout = {component: [] for component in self._components}
+        self._always = []
+        for index, wire in enumerate(self._wires):
+            owner = owners.get(id(wire.wire_in))
+            if owner is None or drivers[id(wire.wire_out)] > 1:
+                self._always.append((index, wire))
+            else:
+                self._fanout[owner].append((index, wire))
+        ports = {}
         for component in self._components:
+            for port in component.in_ports + component.out_ports:
+                ports[id(port)] = port
+        for wire in self._wires:
+            for port in (wire.wire_in, wire.wire_out):
+                if port is not None:
+                    ports[id(port)] = port
+        self._ports = list(ports.values())
+        self._generation = IOPort.GENERATION
+        self._last_inputs.clear()
+        self._stale = True
+
+    def _tick_component(self, component:Component) -> bool:
+        '''
+        Tick a component, skipping its execution if it is pure and its inputs
+        have not changed since it last executed.
+
+        Returns:
+            executed: boolean indicating if the component may have executed
+        '''
+        if type(component).tick is not Component.tick:
             component.tick()
+            return True
+        component._counter -= 1
+        if component._counter != 0:
+            return False
+        component._counter = component._cycles
+        if not component.PURE:
+            component._execute()
+            self.stats['executions'] += 1
+            return True
+        inputs = [in_port.value for in_port in component.in_ports]
+        if self._last_inputs.get(component) == inputs:
+            self.stats['executions-skipped'] += 1
+            return False
+        component._execute()
+        self._last_inputs[component] = inputs
+        self.stats['executions'] += 1
+        return True
+
+    def _tick_events(self) -> None:
+        '''
+        Perform a single clock cycle, skipping work whose inputs are unchanged.
+
+        Pure components only execute when an input changed since their last
+        execution, and only wires driven by components that executed are
+        propagated (in their usual order). Wires only fire if their value
+        changed. If a port was set from outside the components since the
+        last tick, this tick does all the work, as an ordinary tick would.
+        '''
+        if self._fanout is None or self._generation != IOPort.GENERATION:
+            self._plan_events()
+        if [port._value for port in self._ports] != self._seen:
+            self._last_inputs.clear()
+            self._stale = True
+        self._core_data.ticks += 1
+        if self._stale:
+            self._stale = False
+            for component in self._components:
+                self._tick_component(component)
+            wires = list(enumerate(self._wires))
+        else:
+            wires = list(self._always)
+            for component in self._components:
+                if self._tick_component(component):
+                    wires.extend(self._fanout[component])
+            wires.sort(key=lambda entry: entry[0])
+        fired = 0
+        for _, wire in wires:
+            if wire.propagate():
+                fired += 1
+        self.stats['wire-transfers'] += fired
+        self.stats['wire-transfers-skipped'] += len(self._wires) - fired
+        self._seen = [port._value for port in self._ports]
+
+    def _bind_nets(self) -> None:
+        '''
+        Group the wires on the canvas into nets, one per outbound IO port.
+
+        Each inbound IO port is attached to the net of the last wire that
+        drives it, as that wire overwrites the others on every tick. All nets
+        share one list of held sinks.
+        '''
+        drivers = {}
         for wire in self._wires:
-            wire.tick()
+            if wire.wire_out is not None:
+                drivers[id(wire.wire_out)] = wire
+        nets = {}
+        for wire in drivers.values():
+            net = nets.get(id(wire.wire_in))
+            if net is None:
+                net = Net(wire.wire_in, self._held)
+                nets[id(wire.wire_in)] = net
+            net.attach(wire.wire_out)
+        self._nets = list(nets.values())
+        self._net_sources = [(net, net.source) for net in self._nets]
+        self._net_generation = IOPort.GENERATION
+
+    def _unbind_nets(self) -> None:
+        '''Detach all ports from their nets.'''
+        if self._nets is not None:
+            for net in self._nets:
+                net.detach()
+            self._nets = None
+            self._net_sources = []
+
+    def _tick_wires(self) -> None:
+        '''
+        Transfer values along the wires, or commit the nets if netted.
+
+        Nets are (re)built at the end of a normal wire transfer, so the shared
+        values start out identical to the ones the wires produced. Commits are
+        a single loop over the nets rather than a call per net. While a
+        profiler is enabled, the wires transfer values instead, so their calls
+        are counted.
+        '''
+        if not self.netted or self._profiled:
+            self._unbind_nets()
+        elif self._net_generation != IOPort.GENERATION:
+            self._unbind_nets()
+        if self._nets is None:
+            for wire in self._wires:
+                wire.tick()
+            if self.netted and not self._profiled:
+                self._bind_nets()
+            return
+        for net, source in self._net_sources:
+            net.value = source._value
+        if self._held:
+            rejoin(self._held)
+
+    def _tick_components(self) -> None:
+        '''Tick each component, or only the due ones if scheduled.'''
+        if self._scheduler.active:
+            self._scheduler.tick()
+            return
+        for component in self._components:
+            component.tick()
+
+    def tick(self) -> None:
+        '''Perform a single clock cycle on all components and wires.'''
+        if self.event_driven or self.compiled:
+            self._unbind_nets()
+        if self.event_driven or self.compiled or not self.scheduled:
+            self._scheduler.release()
+        elif not self._scheduler.active:
+            self._scheduler.schedule(self._components)
+        if self.event_driven:
+            self._tick_events()
+            return
+        if self.compiled:
+            self._engine.tick(self._components, self._wires)
+            return
+        self._core_data.ticks += 1
+        self._tick_components()
+        self._tick_wires()
+
+    def run(self, ticks:int) -> None:
+        '''
+        Perform a number of clock cycles on all components and wires.
+
+        In compiled mode, the cycles run inside a single call to the engine.
+        '''
+        if self.compiled and not self.event_driven:
+            self._unbind_nets()
+            self._scheduler.release()
+            self._engine.run(self._components, self._wires, ticks)
+            return
+        for _ in range(ticks):
+            self.tick()
 
     def redraw(self) -> None:
         '''Redraw components and wires to the canvas buffer.'''
@@ -0,0 +1,244 @@
+import hashlib
+import struct
+import zlib
+from array import array
+from typing import List, Tuple
+
+from .canvas import Canvas
+from ..components.component import Component
+from ..components.ioport import IOPort
+from ..components.memory import Memory
+from ..components.memorystore import IMAGE_MODES, MemoryImage, MemoryStore
+from ..components.register import Register
+from ..signal.signal import Signal
+
+MAGIC = b'VPCK'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ20s')
+COUNT = struct.Struct('<I')
+STORE = struct.Struct('<IiBB')
+
+def _fingerprint(canvas:Canvas) -> bytes:
+    '''
+    Get a digest of the canvas netlist that a checkpoint can be restored into.
+
+    The digest covers the type of every component, the ID, width and signage
+    of every IO port, and the ports every wire connects.
+    '''
+    digest = hashlib.sha1()
+    ports = {}
+    for component in canvas._components:
+        digest.update(type(component).__name__.encode() + b';')
+        for port in component.in_ports + component.out_ports:
+            ports[id(port)] = len(ports)
+            digest.update(f'{port.id},{port.width},{int(port.signed)};'.encode())
+    for wire in canvas._wires:
+        wire_out = -1 if wire.wire_out is None else ports.get(id(wire.wire_out), -1)
+        digest.update(f'{ports.get(id(wire.wire_in), -1)}>{wire_out};'.encode())
+    return digest.digest()
+
+def _ports(canvas:Canvas) -> List[IOPort]:
+    '''Get every IO port on the canvas, in component order.'''
+    ports = []
+    for component in canvas._components:
+        ports.extend(component.in_ports)
+        ports.extend(component.out_ports)
+    return ports
+
+def _pack_signals(signals:List[Signal]) -> bytes:
+    '''Pack signals as a count, their raw values and their width/signage bytes.'''
+    raws = array('I', [signal._raw for signal in signals])
+    metas = bytes([signal._width - 1 | signal._signed << 7 for signal in signals])
+    return COUNT.pack(len(signals)) + raws.tobytes() + metas
+
+def _unpack_signals(data:bytes, offset:int, intern:bool=True) -> Tuple[List[Signal], int]:
+    '''
+    Unpack signals packed by _pack_signals.
+
+    Returns:
+        signals: the unpacked signals
+        offset: the offset of the data following the signals
+    '''
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    raws = array('I')
+    raws.frombytes(data[offset:offset + 4 * count])
+    offset += 4 * count
+    metas = data[offset:offset + count]
+    offset += count
+    make = Signal.from_raw if intern else Signal._new_raw
+    signals = [make(raw, (meta & 0x7f) + 1, meta >> 7 == 1) for raw, meta in zip(raws, metas)]
+    return signals, offset
+
+def _pack_store(store:MemoryStore) -> bytes:
+    '''
+    Pack a memory store as its size, offset, signage, image and written cells.
+
+    An image is packed as its mode and path, not its contents.
+    '''
+    cells = sorted(store.cells().items())
+    addresses = array('I', [address for address, _ in cells])
+    image = store.image
+    mode = 0 if image is None else IMAGE_MODES.index(image.mode) + 1
+    header = STORE.pack(len(store), store.offset, store.signed, mode)
+    if image is not None:
+        path = image.path.encode()
+        header += COUNT.pack(len(path)) + path
+    header += COUNT.pack(len(cells))
+    return header + addresses.tobytes() + _pack_signals([signal for _, signal in cells])
+
+def _unpack_store(data:bytes, offset:int) -> Tuple[MemoryStore, int]:
+    '''
+    Unpack a memory store packed by _pack_store.
+
+    Returns:
+        store: the unpacked store
+        offset: the offset of the data following the store
+    '''
+    size, store_offset, signed, mode = STORE.unpack_from(data, offset)
+    offset += STORE.size
+    image = None
+    if mode:
+        length, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        path = data[offset:offset + length].decode()
+        offset += length
+        image = MemoryImage(path, IMAGE_MODES[mode - 1])
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    addresses = array('I')
+    addresses.frombytes(data[offset:offset + 4 * count])
+    offset += 4 * count
+    signals, offset = _unpack_signals(data, offset, False)
+    store = MemoryStore(size, store_offset, signed == 1, image)
+    store._cells = dict(zip(addresses, signals))
+    return store, offset
+
+def _stored(component:Component) -> bool:
+    '''Determine if a component holds stored data besides its ports.'''
+    return isinstance(component, (Memory, Register))
+
+def snapshot(canvas:Canvas) -> bytes:
+    '''
+    Get a compact binary snapshot of the machine state on a canvas.
+
+    The snapshot holds the tick count, every component's counters and value,
+    every IO port value, the contents of every register bank, and the written
+    cells and image path of every memory. Signals are packed as integers and the body is
+    zlib-compressed.
+
+    Parameters:
+        canvas: the canvas to snapshot
+    '''
+    canvas._changed()
+    counters = array('i')
+    values = []
+    for component in canvas._components:
+        counters.extend([component._counter, component._cycles])
+        if isinstance(component, Register):
+            counters.extend([component._read_counter, component._write_counter])
+        values.append(component._value)
+    body = [COUNT.pack(len(counters)), counters.tobytes(), _pack_signals(values)]
+    body.append(_pack_signals([port._value for port in _ports(canvas)]))
+    for component in canvas._components:
+        if isinstance(component, Memory):
+            body.append(b'S' + _pack_store(component._data))
+        elif _stored(component):
+            body.append(b'L' + _pack_signals(component._data))
+    header = HEADER.pack(MAGIC, VERSION, 0, canvas._core_data.ticks, _fingerprint(canvas))
+    return header + zlib.compress(b''.join(body), 1)
+
+class Checkpoint:
+    '''
+    A class to hold a decoded snapshot of the machine state on a canvas.
+
+    Decoding builds every stored signal once. Signals are immutable, so
+    restoring only copies lists and memory stores of them, and one checkpoint
+    can seed many runs in a few milliseconds each.
+
+    Attributes:
+        ticks (int): The tick count when the snapshot was taken
+        fingerprint (bytes): A digest of the netlist the snapshot was taken from
+    '''
+
+    def __init__(self, data:bytes):
+        '''
+        Initialize the Checkpoint object by decoding a snapshot.
+
+        Parameters:
+            data: the snapshot to decode
+        '''
+        magic, version, _, ticks, fingerprint = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not a py-virpu checkpoint')
+        if version != VERSION:
+            raise ValueError(f'Unsupported checkpoint version: {version}')
+        self.ticks = ticks
+        self.fingerprint = fingerprint
+
+        body = zlib.decompress(data[HEADER.size:])
+        count, = COUNT.unpack_from(body)
+        self._counters = array('i')
+        self._counters.frombytes(body[COUNT.size:COUNT.size + 4 * count])
+        offset = COUNT.size + 4 * count
+        self._values, offset = _unpack_signals(body, offset)
+        self._port_values, offset = _unpack_signals(body, offset)
+        self._stored = []
+        while offset < len(body):
+            tag = body[offset:offset + 1]
+            if tag == b'S':
+                stored, offset = _unpack_store(body, offset + 1)
+            else:
+                stored, offset = _unpack_signals(body, offset + 1, False)
+            self._stored.append(stored)
+
+    def restore(self, canvas:Canvas) -> None:
+        '''
+        Restore the machine state on a canvas.
+
+        The canvas must hold the same netlist the snapshot was taken from.
+
+        Parameters:
+            canvas: the canvas to restore
+        '''
+        if self.fingerprint != _fingerprint(canvas):
+            raise ValueError('Checkpoint does not match the components and wires on the canvas')
+        canvas._changed()
+        counters = iter(self._counters)
+        for component, value in zip(canvas._components, self._values):
+            component._counter = next(counters)
+            component._cycles = next(counters)
+            if isinstance(component, Register):
+                component._read_counter = next(counters)
+                component._write_counter = next(counters)
+            component._value = value
+        for port, value in zip(_ports(canvas), self._port_values):
+            port._value = value
+        stored = iter(self._stored)
+        for component in canvas._components:
+            if _stored(component):
+                data = next(stored).copy()
+                if isinstance(data, MemoryStore):
+                    data.follow(component._data)
+                component._data = data
+        canvas._core_data.ticks = self.ticks
+
+def restore(canvas:Canvas, data:bytes) -> None:
+    '''
+    Restore the machine state on a canvas from a snapshot.
+
+    Parameters:
+        canvas: the canvas to restore
+        data: the snapshot to restore
+    '''
+    Checkpoint(data).restore(canvas)
+
+def save(canvas:Canvas, path:str) -> None:
+    '''Save a snapshot of the machine state on a canvas to a file.'''
+    with open(path, 'wb') as file:
+        file.write(snapshot(canvas))
+
+def load(path:str) -> Checkpoint:
+    '''Decode a snapshot file into a checkpoint.'''
+    with open(path, 'rb') as file:
+        return Checkpoint(file.read())
\ No newline at end of file
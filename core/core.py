@@ -8,6 +8,7 @@ from .coredata import CoreData
 from . import coreutils
 from . import logger
 from .graphics import Graphics
+from .profiler import Profiler
 from ..corium import corium, translator
 from ..ui.ui import UI
 
@@ -20,15 +21,23 @@ class Core:
         graphics (Graphics): The current graphics object
         canvas (Canvas): The current canvas object
         ui (UI): The current UI object
+        profiler (Profiler): The profiler toggled from the tools panel
         controller (Controller): The current controller object
     '''
 
-    def __init__(self, program:List[str]=None, execute_n:int=0, visual:bool=True):
+    def __init__(self,
+                    program:List[str]=None,
+                    execute_n:int=0,
+                    visual:bool=True,
+                    memory_path:str=coreutils.MEMORY_FILE
+                ):
         '''
         Initialize the Core object and start the program.
 
         Parameters:
             program: An assembly program to load into memory (default None)
+            memory_path: The file the tools panel dumps and loads data memory
+                with (default coreutils.MEMORY_FILE)
         '''
         corium.init()
         pg.init()
@@ -36,14 +45,16 @@ class Core:
         self._graphics = Graphics(self._core_data, visual)
         self._canvas = Canvas(self._core_data, self._graphics)
         self._ui = UI(self._core_data, self._graphics)
+        self._profiler = Profiler(self._canvas)
         self._controller = Controller(self._core_data, 
                                         self._graphics, 
                                         self._canvas, 
                                         self._ui
                                     )
         
-        coreutils.load_ui(self._core_data, self._ui)
-        coreutils.load_default_setup(self._canvas, program)
+        parts = coreutils.load_default_setup(self._canvas, program)
+        coreutils.load_ui(self._core_data, self._ui, self._profiler, parts['data-mem'],
+                            memory_path)
         self._visual = visual
         self._run(execute_n)
 
@@ -1,11 +1,13 @@
-from typing import List
-
-from pygame.event import Event
+from __future__ import annotations
+from os.path import dirname, join
+from typing import Dict, List, TYPE_CHECKING
 
 from .canvas import Canvas
 from .coredata import CoreData
+from . import logger
 from ..components.aggregator import Aggregator
 from ..components.alu import ALU
+from ..components.component import Component
 from ..components.constant import Constant
 from ..components.controlunit import ControlUnit
 from ..components.counter import Counter
@@ -23,10 +25,28 @@ from ..corium import translator
 from ..panels.button import Button
 from ..panels.cyclepanel import CyclePanel
 from ..panels.valuepanel import ValuePanel
-from ..ui.ui import UI
 
-def load_ui(core_data:CoreData, ui:UI) -> None:
-    '''Load the default PyVirpu UI.'''
+if TYPE_CHECKING:
+    from pygame.event import Event
+    from .profiler import Profiler
+    from ..ui.ui import UI
+
+MEMORY_FILE = join(dirname(logger.LOG_PATH), 'data-mem.hex')
+
+def load_ui(core_data:CoreData,
+                ui:UI,
+                profiler:Profiler=None,
+                memory:Memory=None,
+                memory_path:str=MEMORY_FILE
+            ) -> None:
+    '''
+    Load the default PyVirpu UI.
+
+    With a profiler, a tools panel is added whose button toggles profiling
+    and logs the report when profiling stops. With a data memory, the tools
+    panel also gets buttons to dump the memory to memory_path, next to the
+    log file by default, and to load it back, in the format of its extension.
+    '''
     def get_ticks() -> None: return core_data.ticks
     tick_panel = ValuePanel('Tick Counter', get_ticks)
     ui.register_panel('ticks', (-1, 0), tick_panel)
@@ -85,6 +105,34 @@ def load_ui(core_data:CoreData, ui:UI) -> None:
     utility_panel = CyclePanel('Utilities', utility_btns)
     ui.register_panel('utilities', (-1, 3), utility_panel)
 
+    tool_btns = []
+    if profiler is not None:
+        def toggle_profiler(event:Event) -> None:
+            if not profiler.toggle():
+                logger.log(profiler.report())
+        tool_btns.append(Button('Profiler', toggle_profiler))
+    if memory is not None:
+        from . import memoryio
+        def dump_memory(event:Event) -> None:
+            try:
+                memoryio.save_file(memory._data, memory_path)
+            except OSError as error:
+                logger.log(f'Could not dump data memory: {error}')
+                return
+            logger.log(f'Dumped data memory to {memory_path}')
+        def load_memory(event:Event) -> None:
+            try:
+                count = memoryio.load_file(memory._data, memory_path)
+            except (OSError, ValueError) as error:
+                logger.log(f'Could not load data memory: {error}')
+                return
+            logger.log(f'Loaded {count} words of data memory from {memory_path}')
+        tool_btns.append(Button('Dump Memory', dump_memory))
+        tool_btns.append(Button('Load Memory', load_memory))
+    if tool_btns:
+        tools_panel = CyclePanel('Tools', tool_btns)
+        ui.register_panel('tools', (-1, 4), tools_panel)
+
 
 IF = 2
 ID = 2
@@ -95,8 +143,20 @@ WRT = 2
 
 INS_CYCLES = IF + ID + EX + MEM + WRT
 
-def load_default_setup(canvas:Canvas, program:List[str]) -> None:
-    '''WORK IN PROGRESS'''
+def load_default_setup(canvas:Canvas,
+                        program:List[str],
+                        program_image:str=None
+                    ) -> Dict[str, Component]:
+    '''
+    WORK IN PROGRESS
+
+    With a program image, program memory is backed by the raw machine code
+    words of that file instead of the assembled program.
+
+    Returns:
+        parts: the program counter register, program memory, register bank
+            and data memory, by ID ('ins-reg', 'prog-mem', 'reg', 'data-mem')
+    '''
     ins_mult = Multiplexer()
     ins_mult.width = 16
     ins_mult.signed = False
@@ -130,7 +190,9 @@ def load_default_setup(canvas:Canvas, program:List[str]) -> None:
     canvas.add_wire(wire)
 
     prog_mem = Memory()
-    if program is not None:
+    if program_image is not None:
+        prog_mem.load_program_image(program_image)
+    elif program is not None:
         translation = translator.translate(program)
         prog_mem.load_program(translation)
     prog_mem._cycles = INS_CYCLES
@@ -530,4 +592,11 @@ def load_default_setup(canvas:Canvas, program:List[str]) -> None:
     wire.add_waypoint((6850, 1580))
     wire.add_waypoint((1750, 1580))
     wire.add_waypoint((1750, 1054))
-    canvas.add_wire(wire)
\ No newline at end of file
+    canvas.add_wire(wire)
+
+    return {
+        'ins-reg': ins_reg,
+        'prog-mem': prog_mem,
+        'reg': reg,
+        'data-mem': data_mem
+    }
\ No newline at end of file
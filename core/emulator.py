@@ -0,0 +1,340 @@
+from array import array
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from bitarray.util import ba2int
+
+from . import coreutils
+from .headless import Headless
+from .translation import ALU, TranslationCache
+from ..components.controlunit import ControlUnit
+from ..components.memory import Memory
+from ..components.memorystore import MemoryImage
+from ..components.register import Register
+from ..corium import corium, translator
+from ..signal.signal import Signal
+
+WORD = 1 << 32
+SIGN = 1 << 31
+
+def _word(value:int) -> int:
+    '''Wrap an integer to the value of a signed 32-bit word.'''
+    return (value + SIGN) % WORD - SIGN
+
+class Emulator:
+    '''
+    A class to execute Corium machine code one instruction at a time.
+
+    The emulator is a functional model of the default setup: it decodes
+    instructions like the Decoder, looks up control bits in the same tables
+    as the ControlUnit, and applies the datapath of the default setup to a
+    plain register file and data memory. One step matches INS_CYCLES ticks
+    of the component simulation.
+
+    When compiled, runs without a stop condition execute whole basic blocks
+    translated by a TranslationCache instead of stepping every instruction.
+
+    Attributes:
+        pc (int): The address of the next instruction
+        registers (List[int]): The values of the register bank
+        instructions (int): The number of instructions executed so far
+        ticks (int): The equivalent number of clock cycles run so far
+        compiled (bool): Whether runs execute translated basic blocks
+    '''
+
+    def __init__(self, program:List[str]=None, compiled:bool=False):
+        '''
+        Initialize the Emulator object and load the program.
+
+        Parameters:
+            program: An assembly program to load into memory (default None)
+            compiled: Whether to run translated basic blocks (default False)
+        '''
+        corium.init()
+        self._control = []
+        for bits in corium.get_control_bits():
+            control = Signal(bits, 11, False)
+            self._control.append({port_id: control.field(lo, width).value
+                                    for port_id, lo, width in ControlUnit.FIELDS})
+        words = [] if program is None else translator.translate(program)
+        self._program = [ba2int(word) for word in words]
+        self._length = len(self._program)
+        self._decoded = {}
+        self._blocks = TranslationCache(self._decoded_at) if compiled else None
+        self._undo = None
+        self._memory = list(range(Memory.MAX_MEM))
+        self._mem_out = 0
+        self.registers = [0] * Register.REGISTERS
+        self.pc = 0
+        self.instructions = 0
+
+    @property
+    def compiled(self) -> bool:
+        '''Get whether runs execute translated basic blocks.'''
+        return self._blocks is not None
+
+    @property
+    def ticks(self) -> int:
+        '''Get the equivalent number of clock cycles run so far.'''
+        return self.instructions * coreutils.INS_CYCLES
+
+    def register(self, index:int) -> int:
+        '''Get the value of a register.'''
+        return self.registers[index]
+
+    def word(self, address:int) -> int:
+        '''Get the value of a data memory address.'''
+        return self._memory[address]
+
+    def memory(self, start:int, end:int) -> List[int]:
+        '''Get the values of data memory from address start up to end.'''
+        return self._memory[start:end]
+
+    def set_register(self, index:int, value:int) -> None:
+        '''Set the value of a register before or between runs, wrapped to 32 bits.'''
+        self.registers[index] = _word(value)
+
+    def set_memory(self, address:int, value:int) -> None:
+        '''Set the value of a data memory address before or between runs, wrapped to 32 bits.'''
+        self._memory[address] = _word(value)
+
+    def words(self, start:int, end:int) -> array:
+        '''Get data memory from address start up to end as raw 32-bit words.'''
+        return array('I', [word & 0xffffffff for word in self._memory[start:end]])
+
+    def load_words(self, start:int, words:Iterable[int]) -> None:
+        '''Set data memory from address start to raw 32-bit words.'''
+        for address, word in enumerate(words, start):
+            self._memory[address] = _word(word)
+
+    def load_program_image(self, path:str) -> None:
+        '''Replace the program with the machine code words of a raw binary image.'''
+        image = MemoryImage(path, 'read')
+        self._program = list(image.words(0, len(image)))
+        self._length = len(self._program)
+        self._decoded.clear()
+        if self._blocks is not None:
+            self._blocks = TranslationCache(self._decoded_at)
+
+    def _fetch(self, address:int) -> int:
+        '''Get the instruction word at a program memory address.'''
+        if address < len(self._program):
+            return self._program[address]
+        return address - self._length
+
+    def set_program(self, address:int, word:int) -> None:
+        '''
+        Set the machine code word at a program memory address.
+
+        Decoded instructions and translated blocks holding the address are
+        discarded.
+        '''
+        self._program.extend(range(len(self._program) - self._length, address + 1 - self._length))
+        self._program[address] = word
+        self._decoded.pop(address, None)
+        if self._blocks is not None:
+            self._blocks.invalidate(address, address + 1)
+
+    def _decoded_at(self, address:int) -> Tuple:
+        '''Get the decoded instruction at an address, decoding it if needed.'''
+        decoded = self._decoded.get(address)
+        if decoded is None:
+            decoded = self._decode(address)
+        return decoded
+
+    def _decode(self, address:int) -> Tuple:
+        '''
+        Decode the instruction at a program memory address.
+
+        Returns the register numbers, the sign extended and left shifted
+        immediates, the control bits and the branch target, as the pipeline
+        would compute them.
+        '''
+        ins = self._fetch(address)
+        opcode = ins >> 24
+        args = corium.get_arg_dests(opcode)
+        fields = {'imm': 0, 'reg-a': 0, 'reg-b': 0, 'reg-w': 0}
+        arg_hi = 24
+        for port_id in ['imm', 'reg-a', 'reg-b', 'reg-w']:
+            if port_id in args:
+                arg_w = 16 if port_id == 'imm' else 4
+                arg_hi -= arg_w
+                fields[port_id] = (ins >> arg_hi) & ((1 << arg_w) - 1)
+        imm = fields['imm'] - (1 << 16) if fields['imm'] >> 15 else fields['imm']
+        control = self._control[opcode]
+        next_pc = (address + 1) & 0xffff
+        # The PC adder fits the target to an unsigned 16-bit signal
+        target = Signal.from_value(next_pc + imm, 16, False).value
+        decoded = (
+            fields['reg-a'],
+            fields['reg-b'],
+            fields['reg-w'],
+            (0, imm, _word(fields['imm'] << 16), 0),
+            control['alu-a-src'],
+            control['alu-b-src'],
+            control['alu-op'],
+            control['branch'],
+            control['mem-w'],
+            control['wrt-src'],
+            control['reg-w-con'],
+            next_pc,
+            target
+        )
+        self._decoded[address] = decoded
+        return decoded
+
+    def step(self) -> Tuple[int, int]:
+        '''
+        Execute a single instruction.
+
+        Returns:
+            reg_w: the register written, or None
+            address: the data memory address written, or None
+        '''
+        decoded = self._decoded.get(self.pc)
+        if decoded is None:
+            decoded = self._decode(self.pc)
+        (reg_a, reg_b, reg_w, srcs, a_src, b_src, alu_op,
+            branch, mem_w, wrt_src, reg_w_con, next_pc, target) = decoded
+        registers = self.registers
+        mem_out = self._mem_out
+        data_a = 0 if a_src else registers[reg_a]
+        data_b = registers[reg_b]
+        operand = data_b if b_src == 0 else srcs[b_src]
+        alu = ALU.get(alu_op)
+        result = 0 if alu is None else alu(data_a, operand)
+        address = None
+        old_word = None
+        if mem_w:
+            address = result & 0xffff
+            old_word = self._memory[address]
+            self._memory[address] = data_b
+        else:
+            self._mem_out = self._memory[result & 0xffff]
+        written = None
+        old_reg = None
+        if reg_w_con:
+            old_reg = registers[reg_w]
+            registers[reg_w] = self._mem_out if wrt_src else result
+            written = reg_w
+        self._undo = (self.pc, mem_out, written, old_reg, address, old_word)
+        self.pc = target if branch and result == 0 else next_pc
+        self.instructions += 1
+        return written, address
+
+    def unstep(self) -> None:
+        '''Undo the last executed instruction. Only one step can be undone.'''
+        if self._undo is None:
+            raise ValueError('No instruction to undo')
+        self.pc, self._mem_out, written, old_reg, address, old_word = self._undo
+        if written is not None:
+            self.registers[written] = old_reg
+        if address is not None:
+            self._memory[address] = old_word
+        self.instructions -= 1
+        self._undo = None
+
+    def run(self, instructions:int, until:Callable[['Emulator'], bool]=None) -> bool:
+        '''
+        Run the program for a number of instructions or until a condition holds.
+
+        Parameters:
+            instructions: the maximum number of instructions to run
+            until: a condition checked after every instruction (default None)
+
+        Returns:
+            stopped: boolean indicating if the run stopped on the condition
+        '''
+        step = self.step
+        if until is None and self._blocks is not None:
+            self._run_blocks(instructions)
+            return False
+        if until is None:
+            for _ in range(instructions):
+                step()
+            return False
+        for _ in range(instructions):
+            step()
+            if until(self):
+                return True
+        return False
+
+    def _run_blocks(self, instructions:int) -> None:
+        '''
+        Run a number of instructions through translated blocks.
+
+        Blocks that would overrun the count are stepped instead, and the last
+        instruction is always stepped so it can be undone.
+        '''
+        get = self._blocks.get
+        registers = self.registers
+        memory = self._memory
+        remaining = instructions
+        while remaining > 1:
+            block = get(self.pc)
+            if block is None or block[1] >= remaining:
+                self.step()
+                remaining -= 1
+                continue
+            function, length = block
+            self.pc, self._mem_out = function(registers, memory, self._mem_out)
+            self.instructions += length
+            remaining -= length
+        if remaining == 1:
+            self.step()
+
+    def report(self, ranges:List[Tuple[int, int]]) -> Dict[str, object]:
+        '''
+        Get the current state as a JSON-serializable dict.
+
+        Parameters:
+            ranges: the (start, end) data memory ranges to include
+        '''
+        return {
+            'ticks': self.ticks,
+            'instructions': self.instructions,
+            'pc': self.pc,
+            'registers': list(self.registers),
+            'memory': {f'{start}:{end}': self.memory(start, end) for start, end in ranges}
+        }
+
+def lockstep(program:List[str],
+                instructions:int,
+                mode:str='interpreted'
+            ) -> Dict[str, object]:
+    '''
+    Run the emulator and the component simulation side by side and compare
+    every register and memory write and the program counter after each
+    instruction.
+
+    Parameters:
+        program: the assembly program to run
+        instructions: the number of instructions to compare
+        mode: the way the simulation canvas ticks (default 'interpreted')
+
+    Returns:
+        mismatch: the first difference found, or None if the runs agree
+    '''
+    emulator = Emulator(program)
+    core = Headless(program, mode)
+    for _ in range(instructions):
+        pc = emulator.pc
+        reg_w, address = emulator.step()
+        core.run(coreutils.INS_CYCLES)
+        checks = [('pc', emulator.pc, core.pc)]
+        if reg_w is not None:
+            checks.append((f'r{reg_w}', emulator.register(reg_w), core.register(reg_w)))
+        if address is not None:
+            checks.append((f'm{address}', emulator.word(address), core.word(address)))
+        for target, expected, actual in checks:
+            if expected != actual:
+                return {
+                    'instruction': emulator.instructions - 1,
+                    'pc': pc,
+                    'target': target,
+                    'emulator': expected,
+                    'simulation': actual
+                }
+    if emulator.registers != core.registers:
+        return {'instruction': emulator.instructions, 'target': 'registers',
+                'emulator': emulator.registers, 'simulation': core.registers}
+    return None
\ No newline at end of file
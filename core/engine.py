@@ -0,0 +1,283 @@
+from typing import List
+
+from .coredata import CoreData
+from ..components.component import Component
+from ..components.ioport import IOPort
+from ..components.wire import Wire
+
+class Engine:
+    '''
+    A class to compile components and wires into a single run function.
+
+    The compiled run function performs the same steps as Canvas.tick, in the
+    same order, for any number of clock cycles, but as straight-line code
+    that only does the work that can change a port value:
+    - cycle counters live in local variables for the length of the run, and
+      components that execute every cycle have none;
+    - pure components only execute when a wire delivered a new value to one
+      of their inputs since they last executed;
+    - only the wires driven by components that executed are checked, and a
+      wire only transfers when its source holds a new value;
+    - a port driven by several wires only takes its last wire, as the others
+      are always overwritten in the same cycle.
+    Signals are interned, so a new value is detected by identity. Pure
+    components also keep the outputs they produced for the last CACHE_SIZE
+    distinct sets of input signals, and reuse them instead of executing.
+
+    While methods are shadowed on components or wires, as a profiler does,
+    every component executes on its clock and every wire ticks, in order,
+    through the shadowing methods, so a profile counts the same work as an
+    uncompiled tick.
+
+    Each run also checks that every port holds the signal it held when the
+    last run ended. If a port was set from outside the components between
+    runs, the run starts with a full tick instead, as if uncompiled.
+
+    Attributes:
+        core_data (CoreData): The current core state object
+        compiled (bool): Whether the current netlist has been compiled
+        source (str): The generated source of the compiled run function
+        CACHE_SIZE (int): The number of executions each pure component keeps
+    '''
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, core_data:CoreData):
+        '''
+        Initialize the Engine object.
+
+        Parameters:
+            core_data: The current core state object
+        '''
+        self._core_data = core_data
+        self._run = None
+        self._generation = -1
+        self._components = []
+        self._cycles = []
+        self.source = ''
+
+    @property
+    def compiled(self) -> bool:
+        '''Get whether the current netlist has been compiled.'''
+        return (self._run is not None and
+                self._generation == IOPort.GENERATION and
+                self._cycles == [component._cycles for component in self._components])
+
+    def invalidate(self) -> None:
+        '''Discard the compiled run function after the netlist changes.'''
+        self._run = None
+
+    def compile(self, components:List[Component], wires:List[Wire]) -> None:
+        '''
+        Compile the components and wires into a run function.
+
+        Parameters:
+            components: the components to tick, in order
+            wires: the wires to tick, in order
+        '''
+        names = {}
+        values = {}
+
+        def name_of(prefix:str, obj:object) -> str:
+            '''Get the closure variable name bound to an object.'''
+            key = (prefix, id(obj))
+            if key not in names:
+                names[key] = f'{prefix}{len(names)}'
+                values[names[key]] = obj
+            return names[key]
+
+        owners = {}
+        readers = {}
+        for index, component in enumerate(components):
+            for port in component.out_ports:
+                owners[id(port)] = index
+            for port in component.in_ports:
+                readers[id(port)] = index
+        drivers = {}
+        for wire in wires:
+            if wire.wire_out is not None:
+                drivers[id(wire.wire_out)] = wire
+        sinks = set(drivers)
+        fanout = {}
+        for wire in wires:
+            if wire.wire_out is None or drivers[id(wire.wire_out)] is not wire:
+                continue
+            fanout.setdefault(id(wire.wire_in), (wire.wire_in, []))[1].append(wire)
+        # Wires only run out of order if one reads a port that another drives
+        chained = any(key in sinks for key in fanout)
+
+        # Methods shadowed on the instance, as a profiler does, are always
+        # called, and then every component and wire does all its work
+        clocks = [None if 'tick' in vars(component) else component._clocks()
+                    for component in components]
+        shadowed = ['_execute' in vars(component) for component in components]
+        profiled = any('tick' in vars(obj) or '_execute' in vars(obj)
+                        for obj in components + wires)
+        dirty = [f'd{index}' for index, component in enumerate(components)
+                    if component.PURE and type(component).tick is Component.tick
+                    and not profiled]
+        counters = []
+        state = dirty + [f'e{index}' for index in range(len(components))]
+        lasts = {}
+
+        def transfer(port:IOPort, wires:List[Wire], key:object) -> List[str]:
+            '''Get the lines that transfer a port's value along its wires.'''
+            last = f'l{len(lasts)}'
+            lasts[id(key)] = last
+            state.append(last)
+            lines = [f'v = {name_of("p", port)}._value', f'if v is not {last}:', f'    {last} = v']
+            for wire in wires:
+                sink = name_of('p', wire.wire_out)
+                adapter = wire.wire_out.adapter(port.width, port.signed)
+                if adapter is None:
+                    lines.append(f'    {sink}._value = v')
+                else:
+                    lines.append(f'    {sink}._value = {name_of("a", adapter)}(v)')
+                reader = readers.get(id(wire.wire_out))
+                if reader is not None and f'd{reader}' in dirty:
+                    lines.append(f'    d{reader} = True')
+            return lines
+
+        def copy(in_port:IOPort, out_port:IOPort) -> str:
+            '''Get the line that sets an output port to an input port's value.'''
+            adapter = out_port.adapter(in_port.width, in_port.signed)
+            if adapter is None:
+                return f'{name_of("p", out_port)}._value = {name_of("p", in_port)}._value'
+            return f'{name_of("p", out_port)}._value = {name_of("a", adapter)}({name_of("p", in_port)}._value)'
+
+        def memoize(component:Component, execute:str) -> List[str]:
+            '''
+            Get the lines that execute a pure component, or set its outputs
+            to the ones it last produced from the same input signals.
+            '''
+            memo = name_of('m', {})
+            ins = [name_of('p', port) for port in component.in_ports]
+            outs = [f'{name_of("p", port)}._value' for port in component.out_ports]
+            key = ', '.join(f'id({port}._value)' for port in ins)
+            held = ', '.join(f'{port}._value' for port in ins)
+            lines = [f'key = ({key},)', f'hit = {memo}.get(key)', 'if hit is None:', f'    {execute}']
+            lines.append(f'    if len({memo}) >= {Engine.CACHE_SIZE}:')
+            lines.append(f'        {memo}.clear()')
+            lines.append(f'    {memo}[key] = (({held},), ({", ".join(outs)},))')
+            lines.append('else:')
+            lines.append(f'    {", ".join(outs)}, = hit[1]')
+            return lines
+
+        body = ['core_data.ticks += 1']
+        for index, component in enumerate(components):
+            if clocks[index] is None:
+                body.append(f'{name_of("t", component.tick)}()')
+                body.append(f'e{index} = True')
+                continue
+            for attr, method in clocks[index]:
+                pairs = None
+                if method == component._execute and not shadowed[index]:
+                    pairs = component._passthrough()
+                if pairs is None and f'd{index}' in dirty and not shadowed[index]:
+                    execute = memoize(component, f'{name_of("x", method)}()')
+                elif pairs is None:
+                    execute = [f'{name_of("x", method)}()']
+                else:
+                    execute = [copy(in_port, out_port) for in_port, out_port in pairs]
+                execute.append(f'e{index} = True')
+                if f'd{index}' in dirty:
+                    execute = [f'if d{index}:', f'    d{index} = False'] + [f'    {line}' for line in execute]
+                if component._cycles > 1:
+                    counter = f'k{len(counters)}'
+                    counters.append((index, attr, counter))
+                    body.append(f'{counter} -= 1')
+                    body.append(f'if {counter} == 0:')
+                    body.append(f'    {counter} = y{index}')
+                    execute = [f'    {line}' for line in execute]
+                body.extend(execute)
+        if profiled:
+            body.extend([f'{name_of("w", wire.tick)}()' for wire in wires])
+            body.extend([f'e{index} = False' for index in range(len(components))])
+        elif chained:
+            for wire in wires:
+                if wire.wire_out is None or drivers[id(wire.wire_out)] is not wire:
+                    continue
+                owner = owners.get(id(wire.wire_in))
+                lines = transfer(wire.wire_in, [wire], wire)
+                if owner is None:
+                    body.extend(lines)
+                else:
+                    body.append(f'if e{owner}:')
+                    body.extend([f'    {line}' for line in lines])
+            body.extend([f'e{index} = False' for index in range(len(components))])
+        else:
+            groups = {}
+            for port, port_wires in fanout.values():
+                groups.setdefault(owners.get(id(port)), []).append((port, port_wires))
+            for port, port_wires in groups.pop(None, []):
+                body.extend(transfer(port, port_wires, port))
+            for index in range(len(components)):
+                body.append(f'if e{index}:')
+                body.append(f'    e{index} = False')
+                for port, port_wires in groups.get(index, []):
+                    body.extend([f'    {line}' for line in transfer(port, port_wires, port)])
+
+        ports = {}
+        for component in components:
+            for port in component.in_ports + component.out_ports:
+                ports[id(port)] = port
+        for wire in wires:
+            for port in (wire.wire_in, wire.wire_out):
+                if port is not None:
+                    ports[id(port)] = port
+        held = ', '.join(f'{name_of("p", port)}._value' for port in ports.values())
+        reset = [f'{name} = {"None" if name[0] == "l" else "True"}' for name in state]
+        prologue = [f'if ({held},) != seen:'] + [f'    {line}' for line in reset or ['pass']]
+        epilogue = [f'seen = ({held},)']
+        for index, attr, counter in counters:
+            comp = name_of('c', components[index])
+            cycles = f'y{index} = {comp}._cycles'
+            if cycles not in prologue:
+                prologue.append(cycles)
+            prologue.append(f'{counter} = {comp}.{attr}')
+            epilogue.append(f'{comp}.{attr} = {counter}')
+
+        args = ', '.join(['core_data'] + list(values))
+        lines = [f'def build({args}):']
+        lines += [f'    {line}' for line in reset]
+        lines.append('    seen = None')
+        lines.append('    def run(n):')
+        lines.append(f'        nonlocal {", ".join(state + ["seen"])}')
+        lines += [f'        {line}' for line in prologue]
+        lines.append('        try:')
+        lines.append('            for _ in range(n):')
+        lines += [f'                {line}' for line in body]
+        lines.append('        finally:')
+        lines += [f'            {line}' for line in epilogue]
+        lines.append('    return run')
+        self.source = '\n'.join(lines)
+
+        namespace = {}
+        exec(compile(self.source, '<netlist>', 'exec'), namespace)
+        self._generation = IOPort.GENERATION
+        self._components = list(components)
+        self._cycles = [component._cycles for component in components]
+        self._run = namespace['build'](self._core_data, *values.values())
+
+    def run(self, components:List[Component], wires:List[Wire], ticks:int) -> None:
+        '''
+        Perform a number of clock cycles, compiling the netlist first if needed.
+
+        Parameters:
+            components: the components to tick, in order
+            wires: the wires to tick, in order
+            ticks: the number of clock cycles to perform
+        '''
+        if not self.compiled:
+            self.compile(components, wires)
+        self._run(ticks)
+
+    def tick(self, components:List[Component], wires:List[Wire]) -> None:
+        '''
+        Perform a single clock cycle, compiling the netlist first if needed.
+
+        Parameters:
+            components: the components to tick, in order
+            wires: the wires to tick, in order
+        '''
+        self.run(components, wires, 1)
\ No newline at end of file
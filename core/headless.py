@@ -0,0 +1,519 @@
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from .breakpoints import Breakpoints, OPERATORS
+from .canvas import Canvas
+from .checkpoint import Checkpoint, load, snapshot
+from .coredata import CoreData
+from . import coreutils
+from . import logger
+from ..components.memory import Memory
+from ..components.register import Register
+from ..corium import corium
+from ..signal.signal import Signal
+
+MODES = ['interpreted', 'compiled', 'event-driven', 'netted', 'scheduled']
+RUN_MODES = MODES + ['emulated', 'translated']
+
+CONDITION = re.compile(r'^\s*(pc|r\d+|m\d+)\s*(==|!=|<=|>=|=|<|>)\s*(-?(?:0x)?[0-9a-fA-F]+)\s*$')
+
+class Headless:
+    '''
+    A class to run a program on the default setup without graphics.
+
+    Only the simulation model is built. Pygame is never imported, and no
+    fonts, surfaces or UI panels are created.
+
+    Attributes:
+        core_data (CoreData): The current core state object
+        canvas (Canvas): The canvas holding the default setup
+        breakpoints (Breakpoints): The breakpoints and watchpoints that stop runs
+        ticks (int): The number of clock cycles run so far
+        instructions (int): The number of instructions completed so far
+        pc (int): The address of the instruction being fetched
+        registers (List[int]): The values of the register bank
+    '''
+
+    def __init__(self,
+                    program:List[str],
+                    mode:str='interpreted',
+                    program_image:str=None
+                ):
+        '''
+        Initialize the Headless object and load the program.
+
+        Parameters:
+            program: An assembly program to load into memory
+            mode: The way the canvas ticks, one of MODES (default 'interpreted')
+            program_image: A raw binary image of machine code to load into
+                memory instead of the program (default None)
+        '''
+        if mode not in MODES:
+            raise ValueError(f'Unknown mode: {mode}')
+        corium.init()
+        self.core_data = CoreData()
+        self.canvas = Canvas(self.core_data,
+                                None,
+                                compiled=mode == 'compiled',
+                                event_driven=mode == 'event-driven',
+                                netted=mode == 'netted',
+                                scheduled=mode == 'scheduled'
+                            )
+        self._parts = coreutils.load_default_setup(self.canvas, program, program_image)
+        self.breakpoints = Breakpoints(self.core_data, self._parts)
+
+    @property
+    def ticks(self) -> int:
+        '''Get the number of clock cycles run so far.'''
+        return self.core_data.ticks
+
+    @property
+    def instructions(self) -> int:
+        '''Get the number of instructions completed so far.'''
+        return self.core_data.ticks // coreutils.INS_CYCLES
+
+    @property
+    def pc(self) -> int:
+        '''Get the address of the instruction being fetched.'''
+        return self._parts['ins-reg'].out_by_id['next-ins'].value.value
+
+    @property
+    def registers(self) -> List[int]:
+        '''Get the values of the register bank.'''
+        return [signal.value for signal in self._parts['reg']._data]
+
+    def register(self, index:int) -> int:
+        '''Get the value of a register.'''
+        return self._parts['reg']._data[index].value
+
+    def word(self, address:int) -> int:
+        '''Get the value of a data memory address.'''
+        return self._parts['data-mem']._data[address].value
+
+    def memory(self, start:int, end:int) -> List[int]:
+        '''Get the values of data memory from address start up to end.'''
+        return [signal.value for signal in self._parts['data-mem'][start:end]]
+
+    def set_register(self, index:int, value:int) -> None:
+        '''Set the value of a register before or between runs, wrapped to 32 bits.'''
+        self._parts['reg']._data[index] = Signal.from_raw(value & 0xffffffff, 32, True)
+
+    def set_memory(self, address:int, value:int) -> None:
+        '''Set the value of a data memory address before or between runs, wrapped to 32 bits.'''
+        self._parts['data-mem']._data[address] = Signal.from_raw(value & 0xffffffff, 32, True)
+
+    def words(self, start:int, end:int) -> array:
+        '''Get data memory from address start up to end as raw 32-bit words.'''
+        return self._parts['data-mem']._data.words(start, end)
+
+    def load_words(self, start:int, words:Iterable[int]) -> None:
+        '''Set data memory from address start to raw 32-bit words.'''
+        self._parts['data-mem']._data.load_words(start, words)
+
+    def dirty_ranges(self) -> List[Tuple[int, int]]:
+        '''Get the (start, end) ranges of the data memory pages written since the last clear_dirty.'''
+        return self._parts['data-mem'].dirty_ranges()
+
+    def clear_dirty(self) -> None:
+        '''Mark every data memory page clean.'''
+        self._parts['data-mem'].clear_dirty()
+
+    def diff_memory(self, other:'Headless', start:int=0, end:int=None) -> List[int]:
+        '''Get the data memory addresses from start up to end that differ from another core.'''
+        return self._parts['data-mem'].diff(other._parts['data-mem'], start, end)
+
+    def map_image(self, path:str, mode:str='copy') -> None:
+        '''Back data memory with a raw binary image of 32-bit words, in 'read' or 'copy' mode.'''
+        self._parts['data-mem'].map_image(path, mode)
+
+    def snapshot(self) -> bytes:
+        '''Get a binary snapshot of the machine state.'''
+        return snapshot(self.canvas)
+
+    def restore(self, checkpoint:Union[bytes, Checkpoint]) -> None:
+        '''Restore the machine state from a snapshot or decoded checkpoint.'''
+        if not isinstance(checkpoint, Checkpoint):
+            checkpoint = Checkpoint(checkpoint)
+        checkpoint.restore(self.canvas)
+
+    def run(self, ticks:int, until:Callable[['Headless'], bool]=None) -> bool:
+        '''
+        Run the program for a number of clock cycles or until a condition holds
+        or a breakpoint fires.
+
+        Parameters:
+            ticks: the maximum number of clock cycles to run
+            until: a condition checked after every clock cycle (default None)
+
+        Returns:
+            stopped: boolean indicating if the run stopped on the condition
+                or a breakpoint
+        '''
+        canvas = self.canvas
+        breakpoints = self.breakpoints
+        if breakpoints.active:
+            breakpoints.start()
+            fired = breakpoints.fired
+            for _ in range(ticks):
+                canvas.tick()
+                if fired() or until is not None and until(self):
+                    return True
+            return False
+        if until is None:
+            canvas.run(ticks)
+            return False
+        for _ in range(ticks):
+            canvas.tick()
+            if until(self):
+                return True
+        return False
+
+    def run_until(self, ticks:int, *watches:str) -> List[Dict[str, object]]:
+        '''
+        Run the program until a watch fires, stopping on the tick it fires.
+
+        The watches are added for this run only, alongside any set on the
+        breakpoints. A run without watches set stops after the ticks.
+
+        Parameters:
+            ticks: the maximum number of clock cycles to run
+            watches: watches such as 'pc=12', 'm3' or 'r2>=100'
+
+        Returns:
+            hits: the watches that fired on the last tick run, or an empty
+                list if none fired
+        '''
+        added = [text for text in watches if text not in self.breakpoints.watches]
+        for text in added:
+            self.breakpoints.add(text)
+        try:
+            self.run(ticks)
+        finally:
+            for text in added:
+                self.breakpoints.remove(text)
+        return list(self.breakpoints.hits)
+
+    def report(self, ranges:List[Tuple[int, int]]) -> Dict[str, object]:
+        '''
+        Get the current state as a JSON-serializable dict.
+
+        Parameters:
+            ranges: the (start, end) data memory ranges to include
+        '''
+        return {
+            'ticks': self.ticks,
+            'instructions': self.instructions,
+            'pc': self.pc,
+            'registers': self.registers,
+            'memory': {f'{start}:{end}': self.memory(start, end) for start, end in ranges}
+        }
+
+def parse_condition(text:str) -> Callable[[Headless], bool]:
+    '''
+    Parse a stop condition such as 'r2=55', 'm3>=100' or 'pc==12'.
+
+    'rN' is register N, 'mN' is data memory address N and 'pc' is the address
+    of the instruction being fetched. Values may be decimal or hexadecimal.
+    '''
+    match = CONDITION.match(text)
+    if match is None:
+        raise ValueError(f'Invalid stop condition: {text}')
+    target, op, value = match.groups()
+    compare = OPERATORS[op]
+    value = int(value, 0)
+    if target == 'pc':
+        return lambda core: compare(core.pc, value)
+    index = int(target[1:])
+    if target[0] == 'r':
+        if index >= Register.REGISTERS:
+            raise ValueError(f'Invalid stop condition: {text}')
+        return lambda core: compare(core.register(index), value)
+    if index >= Memory.MAX_MEM:
+        raise ValueError(f'Invalid stop condition: {text}')
+    return lambda core: compare(core.word(index), value)
+
+def parse_range(text:str) -> Tuple[int, int]:
+    '''Parse a data memory range such as '0:16' or '0x10:0x20'.'''
+    try:
+        start, end = text.split(':')
+        return int(start, 0), int(end, 0)
+    except ValueError:
+        raise ValueError(f'Invalid memory range: {text}')
+
+def _profiler(core:Headless, profile:bool) -> 'Profiler':
+    '''Get an enabled profiler on the canvas of a run if profiling, or None.'''
+    if not profile:
+        return None
+    from .profiler import Profiler
+    profiler = Profiler(core.canvas)
+    profiler.enable()
+    return profiler
+
+def _load_files(core:object, texts:List[str]) -> None:
+    '''Load memory files, written as PATH[@START], into data memory.'''
+    from . import memoryio
+    for text in texts:
+        path, start, _ = memoryio.parse_file(text)
+        memoryio.load_file(core, path, start)
+
+def _dump_files(core:object, texts:List[str]) -> None:
+    '''Dump data memory to memory files, written as PATH[@START[:END]].'''
+    from . import memoryio
+    for text in texts:
+        path, start, end = memoryio.parse_file(text)
+        memoryio.save_file(core, path, start or 0, Memory.MAX_MEM if end is None else end)
+
+@dataclass
+class RunOptions:
+    '''
+    A class to hold the options of headless runs.
+
+    The command line builds one from its arguments, and batch jobs build one
+    from their keys, so every run takes the same options.
+
+    Attributes:
+        conditions (List[str]): stop conditions, any of which ends a run
+        ranges (List[Tuple[int, int]]): the (start, end) data memory ranges to report
+        mode (str): the way the canvas ticks, one of RUN_MODES
+        resume_path (str): a checkpoint file to start each run from
+        checkpoint_path (str): a file to save the final state of a run to
+        fast_forward (int): clock cycles to emulate before simulating
+        fast_forward_until (List[str]): conditions that end the fast-forward
+        watches (List[str]): breakpoints and watchpoints, any of which ends a run
+        profile (bool): whether to profile the simulated ticks, adding the
+            text report and collapsed stacks to the result
+        data_image (str): a raw binary image to back data memory with
+        image_mode (str): 'read' or 'copy' for the data image
+        load_files (List[str]): memory files to load into data memory before
+            a run, written as PATH[@START]
+        dump_files (List[str]): memory files to dump data memory to after a
+            run, written as PATH[@START[:END]]
+        registers (Dict[int, int]): values to set registers to before a run,
+            by index
+        memory (Dict[int, int]): values to set data memory to before a run,
+            by address
+        images (bool): whether programs are raw binary images of machine code
+            rather than assembly programs
+    '''
+
+    conditions: List[str] = field(default_factory=list)
+    ranges: List[Tuple[int, int]] = field(default_factory=list)
+    mode: str = 'interpreted'
+    resume_path: str = None
+    checkpoint_path: str = None
+    fast_forward: int = None
+    fast_forward_until: List[str] = field(default_factory=list)
+    watches: List[str] = field(default_factory=list)
+    profile: bool = False
+    data_image: str = None
+    image_mode: str = 'copy'
+    load_files: List[str] = field(default_factory=list)
+    dump_files: List[str] = field(default_factory=list)
+    registers: Dict[int, int] = field(default_factory=dict)
+    memory: Dict[int, int] = field(default_factory=dict)
+    images: bool = False
+
+_checkpoints = {}
+
+def _checkpoint(path:str) -> Checkpoint:
+    '''Get a decoded checkpoint, decoding each file once per process.'''
+    if path not in _checkpoints:
+        _checkpoints[path] = load(path)
+    return _checkpoints[path]
+
+def read_program(path:str) -> List[str]:
+    '''Read the lines of an assembly program.'''
+    with open(path, 'r') as file:
+        return [line.strip() for line in file.readlines()]
+
+class Run:
+    '''
+    A class to set up a headless run from its options, continue it in as
+    many steps as needed, and report it.
+
+    Setting up builds the core the options call for: the instruction-level
+    emulator, a hybrid run that fast-forwards through it before simulating,
+    or the component simulation. The data image, checkpoint, memory files,
+    register and memory values, watches and profiler are applied to it.
+
+    Attributes:
+        core (object): the Headless or Emulator core holding the final state
+        options (RunOptions): the options of the run
+        remaining (int): the number of clock cycles left to run
+        stopped (bool): whether the run stopped on a condition or a watch
+    '''
+
+    def __init__(self,
+                    program:List[str],
+                    ticks:int,
+                    options:RunOptions=None,
+                    program_image:str=None
+                ):
+        '''
+        Initialize the Run object and set up its core.
+
+        With fast_forward, the run starts in the instruction-level emulator
+        for up to that many clock cycles, or until a fast-forward condition
+        holds, and the remaining ticks run in the component simulation.
+
+        Parameters:
+            program: the assembly program to run
+            ticks: the maximum number of clock cycles to run
+            options: the options of the run (default RunOptions())
+            program_image: a raw binary image of machine code to run instead
+                of the assembly program (default None)
+        '''
+        options = options or RunOptions()
+        self.options = options
+        self.remaining = ticks
+        self.stopped = False
+        self._profile = None
+        checks = [parse_condition(text) for text in options.conditions]
+        self._until = None
+        if checks:
+            self._until = lambda core: any(check(core) for check in checks)
+        mode = options.mode
+        if mode in ('emulated', 'translated'):
+            from .emulator import Emulator
+            if (options.resume_path is not None or options.checkpoint_path is not None
+                    or options.watches or options.profile or options.data_image is not None):
+                raise ValueError('Checkpoints, watches, profiles and images need a component '
+                                 'simulation mode')
+            core = Emulator(program, compiled=mode == 'translated')
+            if program_image is not None:
+                core.load_program_image(program_image)
+            self._seed(core)
+            self.core = core
+            self._run = lambda ticks, until: core.run(ticks // coreutils.INS_CYCLES, until)
+            return
+        if options.fast_forward is not None or options.fast_forward_until:
+            from .hybrid import Hybrid
+            if (options.resume_path is not None or options.data_image is not None
+                    or options.load_files or options.registers or options.memory
+                    or program_image is not None):
+                raise ValueError('Fast-forward runs start from the beginning of an assembly '
+                                 'program with an empty data memory')
+            skips = [parse_condition(text) for text in options.fast_forward_until]
+            skip = None
+            if skips:
+                skip = lambda core: any(check(core) for check in skips)
+            hybrid = Hybrid(program, mode)
+            fast_forward = ticks if options.fast_forward is None else options.fast_forward
+            hybrid.fast_forward(min(fast_forward, ticks), skip)
+            for text in options.watches:
+                hybrid.core.breakpoints.add(text)
+            hybrid.simulate(0)
+            self.remaining = ticks - hybrid.ticks
+            self.core = hybrid.core
+            self._run = hybrid.simulate
+        else:
+            core = Headless(program, mode, program_image)
+            if options.data_image is not None:
+                core.map_image(options.data_image, options.image_mode)
+            if options.resume_path is not None:
+                core.restore(_checkpoint(options.resume_path))
+            self._seed(core)
+            for text in options.watches:
+                core.breakpoints.add(text)
+            self.core = core
+            self._run = core.run
+        self._profile = _profiler(self.core, options.profile)
+
+    def _seed(self, core:object) -> None:
+        '''Load the memory files and set the register and memory values of the options.'''
+        _load_files(core, self.options.load_files)
+        for index, value in self.options.registers.items():
+            core.set_register(index, value)
+        for address, value in self.options.memory.items():
+            core.set_memory(address, value)
+
+    def step(self, ticks:int) -> bool:
+        '''
+        Continue the run for up to a number of clock cycles.
+
+        Emulated runs are rounded down to whole instructions.
+
+        Parameters:
+            ticks: the maximum number of clock cycles to run
+
+        Returns:
+            stopped: boolean indicating if the run stopped on a condition or
+                a watch
+        '''
+        ticks = min(ticks, self.remaining)
+        self.remaining -= ticks
+        if self._run(ticks, self._until):
+            self.stopped = True
+        return self.stopped
+
+    def report(self) -> Dict[str, object]:
+        '''
+        Finish the run and report its final state.
+
+        Memory files are dumped and the checkpoint is saved first.
+        '''
+        options = self.options
+        core = self.core
+        _dump_files(core, options.dump_files)
+        if options.checkpoint_path is not None:
+            with open(options.checkpoint_path, 'wb') as file:
+                file.write(core.snapshot())
+        report = core.report(options.ranges)
+        report['stopped'] = self.stopped
+        if options.watches:
+            report['hits'] = core.breakpoints.hits
+        if self._profile is not None:
+            self._profile.disable()
+            report['profile'] = {'report': self._profile.report(),
+                                 'collapsed': self._profile.collapsed()}
+        return report
+
+def run_program(program:List[str],
+                ticks:int,
+                options:RunOptions=None,
+                program_image:str=None
+            ) -> Dict[str, object]:
+    '''
+    Run a program headlessly and report its final state.
+
+    Parameters:
+        program: the assembly program to run
+        ticks: the maximum number of clock cycles to run
+        options: the options of the run (default RunOptions())
+        program_image: a raw binary image of machine code to run instead of
+            the assembly program (default None)
+    '''
+    run = Run(program, ticks, options, program_image)
+    run.step(run.remaining)
+    return run.report()
+
+def run_programs(paths:List[str],
+                    ticks:int,
+                    options:RunOptions=None,
+                    log_path:str=None
+                ) -> Dict[str, Dict[str, object]]:
+    '''
+    Run each program headlessly and report their final states by path.
+
+    A checkpoint path in the options is overwritten by each run, as are the
+    memory files it dumps.
+
+    Parameters:
+        paths: the paths of the assembly programs, or machine code images, to run
+        ticks: the maximum number of clock cycles to run each program
+        options: the options of every run (default RunOptions())
+        log_path: a file to write the component log to (default None)
+    '''
+    options = options or RunOptions()
+    if log_path is not None:
+        logger.init(log_path)
+    results = {}
+    for path in paths:
+        if options.images:
+            results[path] = run_program([], ticks, options, program_image=path)
+        else:
+            results[path] = run_program(read_program(path), ticks, options)
+    logger.cleanup()
+    return results
\ No newline at end of file
@@ -0,0 +1,188 @@
+from typing import Callable, Dict, List, Tuple
+
+from . import coreutils
+from .checkpoint import Checkpoint, snapshot
+from .emulator import Emulator
+from .headless import Headless
+from ..signal.signal import Signal
+
+def _signal(value:int) -> Signal:
+    '''Get the signal for a signed 32-bit word, wrapping instead of clamping.'''
+    return Signal.from_raw(value & 0xffffffff, 32, True)
+
+class Hybrid:
+    '''
+    A class to run a program by fast-forwarding through the emulator and
+    switching to the component simulation for detailed windows.
+
+    Switching to the simulation happens on an instruction boundary. The
+    emulator backs up one instruction, its state is loaded into a reset
+    netlist, and that instruction is simulated again so every stage register
+    and port holds what a full simulation would. Switching back runs the
+    simulation to the next instruction boundary and reads the registers,
+    data memory and PC back out.
+
+    Attributes:
+        emulator (Emulator): The instruction-level emulator
+        core (Headless): The component simulation
+        detailed (bool): Whether the component simulation is running
+        ticks (int): The number of clock cycles run so far
+        instructions (int): The number of instructions completed so far
+        pc (int): The address of the next instruction
+        registers (List[int]): The values of the register bank
+    '''
+
+    def __init__(self, program:List[str], mode:str='interpreted'):
+        '''
+        Initialize the Hybrid object and load the program.
+
+        Parameters:
+            program: An assembly program to load into memory
+            mode: The way the simulation canvas ticks (default 'interpreted')
+        '''
+        self.emulator = Emulator(program, compiled=True)
+        self.core = Headless(program, mode)
+        self._reset = Checkpoint(snapshot(self.core.canvas))
+        self.detailed = False
+
+    @property
+    def _active(self) -> object:
+        '''Get the engine that currently holds the machine state.'''
+        return self.core if self.detailed else self.emulator
+
+    @property
+    def ticks(self) -> int:
+        '''Get the number of clock cycles run so far.'''
+        return self._active.ticks
+
+    @property
+    def instructions(self) -> int:
+        '''Get the number of instructions completed so far.'''
+        return self._active.instructions
+
+    @property
+    def pc(self) -> int:
+        '''Get the address of the next instruction.'''
+        return self._active.pc
+
+    @property
+    def registers(self) -> List[int]:
+        '''Get the values of the register bank.'''
+        return list(self._active.registers)
+
+    def register(self, index:int) -> int:
+        '''Get the value of a register.'''
+        return self._active.register(index)
+
+    def word(self, address:int) -> int:
+        '''Get the value of a data memory address.'''
+        return self._active.word(address)
+
+    def memory(self, start:int, end:int) -> List[int]:
+        '''Get the values of data memory from address start up to end.'''
+        return self._active.memory(start, end)
+
+    def _load_netlist(self) -> None:
+        '''Load the emulator's architectural state into a reset netlist.'''
+        emulator = self.emulator
+        core = self.core
+        canvas = core.canvas
+        parts = core._parts
+        self._reset.restore(canvas)
+
+        parts['reg']._data = [_signal(value) for value in emulator.registers]
+        data = parts['data-mem']._data
+        for address, value in enumerate(emulator._memory):
+            if value != address:
+                data.write(address, _signal(value))
+        parts['data-mem'].out_by_id['data']._value = _signal(emulator._mem_out)
+
+        pc_port = parts['ins-reg'].out_by_id['next-ins']
+        pc_port.value = Signal.from_value(emulator.pc, 16, False)
+        for wire in canvas._wires:
+            if wire.wire_in is pc_port:
+                wire.tick()
+        prog_mem = parts['prog-mem']
+        prog_mem._execute()
+        for wire in canvas._wires:
+            if wire.wire_in in prog_mem.out_ports:
+                wire.tick()
+        core.core_data.ticks = emulator.ticks
+
+    def _to_detailed(self) -> None:
+        '''Switch from the emulator to the component simulation.'''
+        if self.detailed:
+            return
+        self.detailed = True
+        emulator = self.emulator
+        if emulator._undo is None:
+            # Nothing ran since the netlist was last in sync
+            return
+        emulator.unstep()
+        self._load_netlist()
+        emulator.step()
+        self.core.run(coreutils.INS_CYCLES)
+
+    def _to_emulated(self) -> None:
+        '''Switch from the component simulation to the emulator.'''
+        if not self.detailed:
+            return
+        core = self.core
+        parts = core._parts
+        core.run(-core.ticks % coreutils.INS_CYCLES)
+        emulator = self.emulator
+        emulator.registers = core.registers
+        memory = list(range(len(emulator._memory)))
+        for address, signal in parts['data-mem']._data.cells().items():
+            memory[address] = signal.value
+        emulator._memory = memory
+        emulator._mem_out = parts['data-mem'].out_by_id['data'].value.value
+        emulator.pc = core.pc
+        emulator.instructions = core.instructions
+        emulator._undo = None
+        self.detailed = False
+
+    def fast_forward(self, ticks:int, until:Callable[['Hybrid'], bool]=None) -> bool:
+        '''
+        Run the emulator for a number of clock cycles or until a condition holds.
+
+        The condition is checked after every instruction, and the run is
+        rounded down to whole instructions.
+
+        Parameters:
+            ticks: the maximum number of clock cycles to run
+            until: a condition checked after every instruction (default None)
+
+        Returns:
+            stopped: boolean indicating if the run stopped on the condition
+        '''
+        self._to_emulated()
+        check = None if until is None else lambda emulator: until(self)
+        return self.emulator.run(ticks // coreutils.INS_CYCLES, check)
+
+    def simulate(self, ticks:int, until:Callable[['Hybrid'], bool]=None) -> bool:
+        '''
+        Run the component simulation for a number of clock cycles or until a
+        condition holds.
+
+        Parameters:
+            ticks: the maximum number of clock cycles to run
+            until: a condition checked after every clock cycle (default None)
+
+        Returns:
+            stopped: boolean indicating if the run stopped on the condition
+        '''
+        self._to_detailed()
+        check = None if until is None else lambda core: until(self)
+        return self.core.run(ticks, check)
+
+    def report(self, ranges:List[Tuple[int, int]]) -> Dict[str, object]:
+        '''
+        Get the current state as a JSON-serializable dict.
+
+        Parameters:
+            ranges: the (start, end) data memory ranges to include
+        '''
+        report = self._active.report(ranges)
+        report['detailed'] = self.detailed
+        return report
\ No newline at end of file
@@ -1,13 +1,18 @@
+LOG_PATH = 'py-virpu/log.txt'
+
 _log = None
 
-def init():
+def init(path:str=LOG_PATH):
     global _log
-    _log = open('py-virpu/log.txt', 'w')
+    _log = open(path, 'w')
 
 def log(message:str):
     global _log
-    _log.write(message + '\n')
+    if _log is not None:
+        _log.write(message + '\n')
 
 def cleanup():
     global _log
-    _log.close()
\ No newline at end of file
+    if _log is not None:
+        _log.close()
+        _log = None
\ No newline at end of file
@@ -0,0 +1,254 @@
+import struct
+import sys
+from array import array
+from os.path import splitext
+from typing import List, Tuple
+
+from ..components.memory import Memory
+
+FORMATS = ['raw-le', 'raw-be', 'ihex', 'rle']
+EXTENSIONS = {'.hex': 'ihex', '.ihex': 'ihex', '.rle': 'rle', '.be': 'raw-be'}
+
+RLE_MAGIC = b'VPRL'
+RLE_HEADER = struct.Struct('<4sII')
+RLE_RUN = struct.Struct('<IIi')
+IHEX_BYTES = 16
+
+def format_of(path:str) -> str:
+    '''Get the format of a memory file from its extension, raw little-endian by default.'''
+    return EXTENSIONS.get(splitext(path)[1].lower(), 'raw-le')
+
+def encode_raw(words:array, byteorder:str='little') -> bytes:
+    '''Encode words as raw 32-bit words in a byte order.'''
+    words = array('I', words)
+    if byteorder != sys.byteorder:
+        words.byteswap()
+    return words.tobytes()
+
+def decode_raw(data:bytes, byteorder:str='little') -> array:
+    '''Decode raw 32-bit words in a byte order.'''
+    if len(data) % 4:
+        raise ValueError('Raw data is not a whole number of words')
+    words = array('I')
+    words.frombytes(data)
+    if byteorder != sys.byteorder:
+        words.byteswap()
+    return words
+
+def _ihex_record(kind:int, address:int, data:bytes) -> str:
+    '''Format an Intel HEX record with its checksum.'''
+    record = bytes([len(data), address >> 8 & 0xff, address & 0xff, kind]) + data
+    return f':{record.hex().upper()}{-sum(record) & 0xff:02X}'
+
+def encode_ihex(words:array, start:int=0) -> bytes:
+    '''
+    Encode words as Intel HEX.
+
+    Word address a is byte address 4a, and the bytes of each word are in
+    little-endian order. Extended linear address records cover byte
+    addresses past 64 KiB.
+    '''
+    return encode_ihex_runs([(start, words)])
+
+def encode_ihex_runs(runs:List[Tuple[int, array]]) -> bytes:
+    '''Encode runs of (word address, words) as a single Intel HEX file with gaps.'''
+    lines = []
+    upper = None
+    for start, words in runs:
+        data = encode_raw(words)
+        byte_address = start * 4
+        for index in range(0, len(data), IHEX_BYTES):
+            address = byte_address + index
+            if address >> 16 != upper:
+                upper = address >> 16
+                lines.append(_ihex_record(4, 0, upper.to_bytes(2, 'big')))
+            lines.append(_ihex_record(0, address & 0xffff, data[index:index + IHEX_BYTES]))
+    lines.append(_ihex_record(1, 0, b''))
+    return ('\n'.join(lines) + '\n').encode()
+
+def decode_ihex(data:bytes) -> List[Tuple[int, array]]:
+    '''
+    Decode Intel HEX into runs of words.
+
+    Returns:
+        runs: (word address, words) for each run of contiguous data, where
+            bytes missing from a partly covered word are zero
+    '''
+    values = {}
+    base = 0
+    for number, line in enumerate(data.decode().splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(':'):
+            raise ValueError(f'Invalid Intel HEX record on line {number}')
+        record = bytes.fromhex(line[1:])
+        if len(record) < 5 or len(record) != record[0] + 5 or sum(record) & 0xff:
+            raise ValueError(f'Invalid Intel HEX record on line {number}')
+        kind = record[3]
+        payload = record[4:-1]
+        if kind == 0:
+            address = base + (record[1] << 8 | record[2])
+            for index, byte in enumerate(payload):
+                values[address + index] = byte
+        elif kind == 1:
+            break
+        elif kind == 2:
+            base = int.from_bytes(payload, 'big') << 4
+        elif kind == 4:
+            base = int.from_bytes(payload, 'big') << 16
+    words = {}
+    for address, byte in values.items():
+        words[address >> 2] = words.get(address >> 2, 0) | byte << 8 * (address & 3)
+    runs = []
+    for address in sorted(words):
+        if runs and runs[-1][0] + len(runs[-1][1]) == address:
+            runs[-1][1].append(words[address])
+        else:
+            runs.append((address, array('I', [words[address]])))
+    return runs
+
+def encode_rle(words:array, start:int=0) -> bytes:
+    '''
+    Encode words as runs of evenly spaced values.
+
+    Each run is a count, a first value and a step, so constant runs and the
+    counting contents of an untouched memory both take a single run.
+    '''
+    runs = []
+    index = 0
+    while index < len(words):
+        first = words[index]
+        step = 0
+        if index + 1 < len(words):
+            step = (words[index + 1] - first + 0x80000000) % 0x100000000 - 0x80000000
+        count = 1
+        value = first
+        while index + count < len(words) and words[index + count] == (value + step) & 0xffffffff:
+            value = words[index + count]
+            count += 1
+        runs.append(RLE_RUN.pack(count, first, step))
+        index += count
+    return RLE_HEADER.pack(RLE_MAGIC, start, len(runs)) + b''.join(runs)
+
+def decode_rle(data:bytes) -> Tuple[int, array]:
+    '''
+    Decode runs of evenly spaced values.
+
+    Returns:
+        start: the word address of the first word
+        words: the decoded words
+    '''
+    magic, start, count = RLE_HEADER.unpack_from(data)
+    if magic != RLE_MAGIC:
+        raise ValueError('Not a py-virpu run-length memory file')
+    words = array('I')
+    for index in range(count):
+        length, first, step = RLE_RUN.unpack_from(data, RLE_HEADER.size + index * RLE_RUN.size)
+        words.extend([(first + step * n) & 0xffffffff for n in range(length)])
+    return start, words
+
+def dump(memory:object, start:int=0, end:int=Memory.MAX_MEM, fmt:str='raw-le') -> bytes:
+    '''
+    Encode the contents of a memory from address start up to end.
+
+    Parameters:
+        memory: anything with words(start, end) and load_words(start, words),
+            such as a MemoryStore, a Headless core or an Emulator
+        start: the first address (default 0)
+        end: the address to stop at (default Memory.MAX_MEM)
+        fmt: one of FORMATS (default 'raw-le')
+    '''
+    words = memory.words(start, end)
+    if fmt == 'raw-le':
+        return encode_raw(words, 'little')
+    if fmt == 'raw-be':
+        return encode_raw(words, 'big')
+    if fmt == 'ihex':
+        return encode_ihex(words, start)
+    if fmt == 'rle':
+        return encode_rle(words, start)
+    raise ValueError(f'Unknown memory format: {fmt}')
+
+def dump_dirty(memory:object) -> bytes:
+    '''
+    Encode the dirty pages of a memory as Intel HEX, leaving out every
+    clean page.
+
+    Parameters:
+        memory: anything with words(start, end) and dirty_ranges(), such as
+            a MemoryStore or a Headless core
+    '''
+    return encode_ihex_runs([(start, memory.words(start, end))
+                                for start, end in memory.dirty_ranges()])
+
+def load(memory:object, data:bytes, fmt:str='raw-le', start:int=None) -> int:
+    '''
+    Decode words into a memory.
+
+    Raw words are loaded from address start (default 0). Intel HEX and
+    run-length data carry their own addresses, which start moves if given.
+
+    Parameters:
+        memory: anything with words(start, end) and load_words(start, words),
+            such as a MemoryStore, a Headless core or an Emulator
+        data: the encoded words
+        fmt: one of FORMATS (default 'raw-le')
+        start: the address to load raw words at, or to move encoded
+            addresses to (default None)
+
+    Returns:
+        count: the number of words loaded
+    '''
+    if fmt in ('raw-le', 'raw-be'):
+        runs = [(start or 0, decode_raw(data, 'little' if fmt == 'raw-le' else 'big'))]
+    elif fmt == 'ihex':
+        runs = decode_ihex(data)
+    elif fmt == 'rle':
+        runs = [decode_rle(data)]
+    else:
+        raise ValueError(f'Unknown memory format: {fmt}')
+    if fmt in ('ihex', 'rle') and start is not None and runs:
+        shift = start - runs[0][0]
+        runs = [(address + shift, words) for address, words in runs]
+    for address, words in runs:
+        if address < 0 or address + len(words) > Memory.MAX_MEM:
+            raise ValueError('Memory file does not fit in memory')
+        memory.load_words(address, words)
+    return sum(len(words) for _, words in runs)
+
+def save_file(memory:object,
+                path:str,
+                start:int=0,
+                end:int=Memory.MAX_MEM,
+                fmt:str=None
+            ) -> None:
+    '''Dump a memory to a file, in the format of its extension by default.'''
+    with open(path, 'wb') as file:
+        file.write(dump(memory, start, end, fmt or format_of(path)))
+
+def load_file(memory:object, path:str, start:int=None, fmt:str=None) -> int:
+    '''Load a memory from a file, in the format of its extension by default.'''
+    with open(path, 'rb') as file:
+        return load(memory, file.read(), fmt or format_of(path), start)
+
+def parse_file(text:str) -> Tuple[str, int, int]:
+    '''
+    Parse a memory file argument such as 'out.hex', 'in.bin@0x100' or
+    'out.rle@0:64'.
+
+    Returns:
+        path: the path of the file
+        start: the address after '@', or None
+        end: the address after ':', or None
+    '''
+    path, _, where = text.rpartition('@') if '@' in text else (text, '', '')
+    start = end = None
+    try:
+        if where:
+            first, _, last = where.partition(':')
+            start = int(first, 0)
+            end = int(last, 0) if last else None
+    except ValueError:
+        raise ValueError(f'Invalid memory file: {text}')
+    return path, start, end
\ No newline at end of file
@@ -0,0 +1,156 @@
+import time
+from typing import Dict, List
+
+from .canvas import Canvas
+from ..components.component import Component
+from ..signal.signal import count_signals, signals_built
+
+class Profiler:
+    '''
+    A class to time and count the work done by each component and wire on a
+    canvas.
+
+    While enabled, every component's _execute method (or tick method, for
+    components that override it) and every wire's tick and propagate methods
+    are shadowed on the instance by a wrapper that counts calls, time spent
+    and Signals allocated. Disabling removes the wrappers, so a canvas that
+    is not being profiled runs exactly the code it would without a profiler.
+    Signals are counted by the signal module while any profiler is enabled,
+    and each wrapper only adds those built during its own calls, so other
+    canvases are not counted and profilers may overlap in any order.
+
+    So that every call is counted, the compiled engine calls the wrappers
+    instead of inlining, skipping or reusing work, and a netted canvas
+    transfers values along its wires instead of committing nets. Both count
+    the same calls as an interpreted canvas. Event-driven canvases count
+    only the executions and wire transfers they do not skip.
+
+    Attributes:
+        canvas (Canvas): The canvas being profiled
+        enabled (bool): Whether the wrappers are installed
+        stats (Dict[str, List]): Calls, seconds and Signals allocated by
+            instance key, as '<class>;<label>#<id>' for components and
+            'Wire;<from>><to>#<id>' for wires
+    '''
+
+    def __init__(self, canvas:Canvas):
+        '''
+        Initialize the Profiler object.
+
+        Parameters:
+            canvas: The canvas to profile
+        '''
+        self.canvas = canvas
+        self.enabled = False
+        self.stats = {}
+        self._wrapped = []
+
+    def reset(self) -> None:
+        '''Discard the collected stats.'''
+        for stats in self.stats.values():
+            stats[:] = [0, 0.0, 0]
+
+    def _wrap(self, obj:object, name:str, key:str) -> None:
+        '''Shadow a method of an object with a timing and counting wrapper.'''
+        stats = self.stats.setdefault(key, [0, 0.0, 0])
+        function = getattr(obj, name)
+        built = signals_built
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            before = built()
+            start = clock()
+            result = function(*args)
+            stats[1] += clock() - start
+            stats[0] += 1
+            stats[2] += built() - before
+            return result
+
+        setattr(obj, name, wrapper)
+        self._wrapped.append((obj, name))
+
+    def enable(self) -> None:
+        '''Install the wrappers on every component and wire on the canvas.'''
+        if self.enabled:
+            return
+        for component in self.canvas._components:
+            key = f'{type(component).__name__};{component._label}#{component.id}'
+            if type(component).tick is not Component.tick:
+                self._wrap(component, 'tick', key)
+            else:
+                self._wrap(component, '_execute', key)
+        for wire in self.canvas._wires:
+            wire_out = '' if wire.wire_out is None else wire.wire_out.id
+            key = f'Wire;{wire.wire_in.id}>{wire_out}#{id(wire):x}'
+            self._wrap(wire, 'tick', key)
+            self._wrap(wire, 'propagate', key)
+        count_signals(True)
+        self.canvas._changed()
+        self.canvas._profiled = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        '''Remove the wrappers, keeping the collected stats.'''
+        if not self.enabled:
+            return
+        for obj, name in self._wrapped:
+            delattr(obj, name)
+        self._wrapped = []
+        count_signals(False)
+        self.canvas._changed()
+        self.canvas._profiled = False
+        self.enabled = False
+
+    def toggle(self) -> bool:
+        '''Enable the profiler if disabled, or disable it, and get whether it is enabled.'''
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def by_class(self) -> Dict[str, List]:
+        '''Get the calls, seconds and Signals allocated summed by class.'''
+        classes = {}
+        for key, (calls, seconds, signals) in self.stats.items():
+            totals = classes.setdefault(key.split(';')[0], [0, 0.0, 0])
+            totals[0] += calls
+            totals[1] += seconds
+            totals[2] += signals
+        return classes
+
+    def report(self, top:int=10) -> str:
+        '''
+        Build a text report of the hottest classes and instances.
+
+        Parameters:
+            top: the number of instances to list (default 10)
+        '''
+        def rows(stats:Dict[str, List], limit:int=None) -> List[str]:
+            '''Format stats as rows sorted by total time.'''
+            ordered = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)
+            lines = []
+            for key, (calls, seconds, signals) in ordered[:limit]:
+                mean = seconds / calls * 1e6 if calls else 0.0
+                lines.append(f'  {key:<40} {calls:>10} {seconds * 1e3:>10.2f} ms '
+                                f'{mean:>8.2f} us {signals:>10}')
+            return lines
+
+        header = f'  {"":<40} {"calls":>10} {"total":>13} {"mean":>11} {"signals":>10}'
+        total = sum(stats[1] for stats in self.stats.values())
+        lines = [f'Profile at tick {self.canvas._core_data.ticks}, {total * 1e3:.2f} ms measured']
+        lines += ['By class:', header] + rows(self.by_class())
+        lines += [f'Top {top} instances:', header] + rows(self.stats, top)
+        return '\n'.join(lines)
+
+    def collapsed(self) -> str:
+        '''
+        Get the stats as collapsed stacks for flamegraph tools.
+
+        Each line is 'tick;<class>;<instance> <microseconds>'.
+        '''
+        lines = []
+        for key, (calls, seconds, signals) in sorted(self.stats.items()):
+            if calls:
+                lines.append(f'tick;{key} {round(seconds * 1e6)}')
+        return '\n'.join(lines)
\ No newline at end of file
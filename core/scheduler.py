@@ -0,0 +1,126 @@
+from typing import List
+
+from .coredata import CoreData
+from ..components.component import Component
+
+class Scheduler:
+    '''
+    A class to execute components only on the clock cycles they fire.
+
+    Each multi-cycle component is filed in a timing wheel under the tick it
+    next executes on, so ticks on which it would only count down cost
+    nothing. Components that execute every clock cycle gain nothing from
+    the wheel, so they are ticked every clock cycle as usual, as are
+    components that override Component.tick. While a component is scheduled
+    its cycle counter is kept by the scheduler; setting it through
+    Component.counter reschedules the component.
+
+    Attributes:
+        core_data (CoreData): The current core state object
+        active (bool): Whether components are currently scheduled
+    '''
+
+    def __init__(self, core_data:CoreData):
+        '''
+        Initialize the Scheduler object.
+
+        Parameters:
+            core_data: The current core state object
+        '''
+        self._core_data = core_data
+        self._wheel = {}
+        self._due = {}
+        self._index = {}
+        self._always = []
+        self.active = False
+
+    def schedule(self, components:List[Component]) -> None:
+        '''
+        Take over the cycle counters of components and file them by due tick.
+
+        Parameters:
+            components: the components to schedule, in tick order
+        '''
+        self.release()
+        now = self._core_data.ticks
+        for index, component in enumerate(components):
+            self._index[component] = index
+            component._scheduler = self
+            if type(component).tick is not Component.tick or component._cycles == 1:
+                self._always.append((index, component))
+            else:
+                self._file(component, now + component._counter)
+        self.active = True
+
+    def release(self) -> None:
+        '''Hand the remaining cycle counts back to the scheduled components.'''
+        now = self._core_data.ticks
+        for component, due in self._due.items():
+            component._counter = due - now
+        for component in self._index:
+            component._scheduler = None
+        self._wheel = {}
+        self._due = {}
+        self._index = {}
+        self._always = []
+        self.active = False
+
+    def _file(self, component:Component, due:int) -> None:
+        '''File a component under the tick it is due to execute on.'''
+        self._due[component] = due
+        entry = (self._index[component], component)
+        bucket = self._wheel.get(due)
+        if bucket is None:
+            self._wheel[due] = [entry]
+        else:
+            bucket.append(entry)
+
+    def counter(self, component:Component) -> int:
+        '''
+        Get the number of cycles until a scheduled component executes.
+
+        Components ticked every clock cycle keep their own counter.
+        '''
+        due = self._due.get(component)
+        if due is None:
+            return component._counter
+        return due - self._core_data.ticks
+
+    def reschedule(self, component:Component) -> None:
+        '''Refile a component after its cycle counter was set.'''
+        if component not in self._due:
+            return
+        old_due = self._due[component]
+        bucket = self._wheel[old_due]
+        bucket.remove((self._index[component], component))
+        if not bucket:
+            del self._wheel[old_due]
+        self._file(component, self._core_data.ticks + component._counter)
+
+    def tick(self) -> None:
+        '''Execute the components due on the current tick, in tick order.'''
+        now = self._core_data.ticks
+        due = self._wheel.pop(now, None)
+        if due is None:
+            for _, component in self._always:
+                component.tick()
+            return
+        if self._always:
+            due = sorted(due + self._always)
+        else:
+            due.sort()
+        wheel = self._wheel
+        due_at = self._due
+        for entry in due:
+            component = entry[1]
+            if component not in due_at:
+                component.tick()
+                continue
+            component._execute()
+            then = now + component._cycles
+            due_at[component] = then
+            bucket = wheel.get(then)
+            if bucket is None:
+                wheel[then] = [entry]
+            else:
+                bucket.append(entry)
\ No newline at end of file
@@ -0,0 +1,144 @@
+import operator
+from typing import Callable, Dict, Tuple
+
+WORD = 1 << 32
+SIGN = 1 << 31
+
+ALU = {
+    0: operator.and_,
+    1: operator.or_,
+    2: lambda a, b: (a + b + SIGN) % WORD - SIGN,
+    10: lambda a, b: ~a,
+    14: lambda a, b: (a - b + SIGN) % WORD - SIGN,
+    15: lambda a, b: 1 if a < b else 0
+}
+
+ALU_SOURCE = {
+    0: '{a} & {b}',
+    1: '{a} | {b}',
+    2: f'({{a}} + {{b}} + {SIGN}) % {WORD} - {SIGN}',
+    10: '~{a}',
+    14: f'({{a}} - {{b}} + {SIGN}) % {WORD} - {SIGN}',
+    15: '1 if {a} < {b} else 0'
+}
+
+class TranslationCache:
+    '''
+    A class to translate basic blocks of Corium machine code into Python
+    functions.
+
+    A block starts at any address the program reaches and runs up to and
+    including the first branch instruction, or MAX_BLOCK instructions. Each
+    block is compiled into a function that applies the effect of all its
+    instructions as straight-line code with the register numbers, immediates
+    and ALU operations inlined. The function takes the register list, the
+    data memory list and the data memory output, and returns the next PC and
+    the new data memory output.
+
+    Attributes:
+        blocks (int): The number of blocks currently translated
+        sources (Dict[int, str]): The generated source of each block by address
+    '''
+
+    MAX_BLOCK = 64
+
+    def __init__(self, decode:Callable[[int], Tuple]):
+        '''
+        Initialize the TranslationCache object.
+
+        Parameters:
+            decode: a function giving the decoded instruction at an address,
+                as returned by Emulator._decode
+        '''
+        self._decode = decode
+        self._blocks = {}
+        self.sources = {}
+
+    @property
+    def blocks(self) -> int:
+        '''Get the number of blocks currently translated.'''
+        return len(self._blocks)
+
+    def get(self, address:int) -> Tuple[Callable, int]:
+        '''
+        Get the block starting at an address, translating it if needed.
+
+        Returns:
+            block: the block function and its length in instructions, or None
+                if the instruction at the address cannot be translated
+        '''
+        if address in self._blocks:
+            return self._blocks[address]
+        block = self.translate(address)
+        self._blocks[address] = block
+        return block
+
+    def invalidate(self, start:int, end:int) -> None:
+        '''Discard every block holding an address from start up to end.'''
+        for address, block in list(self._blocks.items()):
+            length = 1 if block is None else block[1]
+            if address < end and address + length > start:
+                del self._blocks[address]
+                self.sources.pop(address, None)
+
+    def translate(self, address:int) -> Tuple[Callable, int]:
+        '''
+        Translate the block starting at an address.
+
+        An instruction that fails to decode, such as a branch whose target is
+        out of range, ends the block before it, so that the emulator raises
+        the error when it steps that instruction.
+
+        Returns:
+            block: the block function and its length in instructions, or None
+                if the instruction at the address cannot be translated
+        '''
+        body = []
+        load = None
+        pc = address
+        length = 0
+        end = None
+        while length < TranslationCache.MAX_BLOCK:
+            try:
+                decoded = self._decode(pc)
+            except OverflowError:
+                break
+            (reg_a, reg_b, reg_w, srcs, a_src, b_src, alu_op,
+                branch, mem_w, wrt_src, reg_w_con, next_pc, target) = decoded
+            if alu_op not in ALU:
+                result = '0'
+            elif a_src and (b_src or alu_op == 10):
+                # Both operands are constants, so fold the result
+                result = repr(ALU[alu_op](0, srcs[b_src]))
+            else:
+                data_a = '0' if a_src else f'r[{reg_a}]'
+                operand = f'r[{reg_b}]' if b_src == 0 else repr(srcs[b_src])
+                result = ALU_SOURCE[alu_op].format(a=data_a, b=operand)
+            body.append(f'x = {result}')
+            if mem_w:
+                body.append(f'm[x & 0xffff] = r[{reg_b}]')
+            else:
+                # Only the last load before the output is read is kept
+                if load is not None:
+                    body[load] = None
+                load = len(body)
+                body.append('o = m[x & 0xffff]')
+            if reg_w_con:
+                body.append(f'r[{reg_w}] = ' + ('o' if wrt_src else 'x'))
+                if wrt_src:
+                    load = None
+            length += 1
+            pc = next_pc
+            if branch:
+                end = f'return ({target} if x == 0 else {next_pc}), o'
+                break
+        if length == 0:
+            return None
+        body.append(end or f'return {pc}, o')
+
+        lines = ['def block(r, m, o):'] + [f'    {line}' for line in body if line]
+        source = '\n'.join(lines)
+        namespace = {}
+        exec(compile(source, f'<block {address}>', 'exec'), namespace)
+        self.sources[address] = source
+        return namespace['block'], length
\ No newline at end of file
@@ -1,11 +1,11 @@
 from typing import List, Tuple, Union
 from pickle import load
-from os.path import dirname, realpath
+from os.path import dirname, join, realpath
 
 from bitarray import bitarray
 from bitarray.util import int2ba
 
-PATH_PREFIX = dirname(realpath(__file__)) + '\\data\\'
+PATH_PREFIX = join(dirname(realpath(__file__)), 'data')
 CONTROL_BITS_PATH = 'control-bits.pkl'
 OPCODES_PATH = 'opcodes.pkl'
 
@@ -16,9 +16,9 @@ def init() -> None:
     '''Initialize Corium assembly and machine code data.'''
     global assembly_codes, control_bits, opcodes
     try:
-        with open(PATH_PREFIX + CONTROL_BITS_PATH, 'rb') as file:
+        with open(join(PATH_PREFIX, CONTROL_BITS_PATH), 'rb') as file:
             control_bits = load(file)
-        with open(PATH_PREFIX + OPCODES_PATH, 'rb') as file:
+        with open(join(PATH_PREFIX, OPCODES_PATH), 'rb') as file:
             opcodes = load(file)
     except:
         raise SystemExit('Error: Unable to load corium language!')
@@ -1,11 +1,13 @@
-from typing import Callable, List, Tuple
-
-from pygame import Surface
-from pygame.event import Event
+from __future__ import annotations
+from typing import Callable, List, TYPE_CHECKING, Tuple
 
 from .panel import Panel
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Surface
+    from pygame.event import Event
+
 class Button(Panel):
     '''
     A class to extend Panel to provide on-click functionality.
@@ -1,11 +1,13 @@
-from typing import List, Tuple
-
-from pygame import Surface
-from pygame.event import Event
+from __future__ import annotations
+from typing import List, TYPE_CHECKING, Tuple
 
 from .panel import Panel
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Surface
+    from pygame.event import Event
+
 class CyclePanel(Panel):
     '''
     A class to extend Panel to allow for multiple slides per panel that can
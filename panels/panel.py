@@ -1,10 +1,12 @@
-from typing import Tuple
-
-from pygame import draw, Rect, Surface
-from pygame.event import Event
+from __future__ import annotations
+from typing import TYPE_CHECKING, Tuple
 
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Rect, Surface
+    from pygame.event import Event
+
 class Panel:
     '''
     A class to represent an interactable UI panel.
@@ -20,6 +22,19 @@ class Panel:
         label (object): The object that labels the panel
         hovered (bool): A flag indicating if the mouse is over the panel
     '''
+
+    __slots__ = (
+                    '_x',
+                    '_y',
+                    '_pos',
+                    '_w',
+                    '_h',
+                    '_size',
+                    '_rect',
+                    '_label',
+                    '_hovered'
+                )
+
     def __init__(self, 
                     label:object, 
                     pos:Tuple[int, int]=(0,0), 
@@ -37,7 +52,7 @@ class Panel:
         self._pos = pos
         self._w, self._h = size
         self._size = size
-        self._rect = Rect(pos, size)
+        self._rect = None
         self._label = label
         self._hovered = False
 
@@ -49,7 +64,7 @@ class Panel:
         '''Set the position of the panel's top-left corner.'''
         self._x, self._y = val
         self._pos = val
-        self._rect = Rect(val, self._size)
+        self._rect = None
 
     pos = property(_get_pos, _set_pos)
 
@@ -67,13 +82,21 @@ class Panel:
         '''Set the panel's size.'''
         self._w, self._h = val
         self._size = val
-        self._rect = Rect(self._pos, val)
+        self._rect = None
 
     size = property(_get_size, _set_size)
 
+    @property
+    def rect(self) -> Rect:
+        '''Get the rect that describes the area occupied by the panel.'''
+        if self._rect is None:
+            from pygame import Rect
+            self._rect = Rect(self._pos, self._size)
+        return self._rect
+
     def collides(self, collision_pos:Tuple[int, int]) -> bool:
         '''Detect if a position collides with the panel.'''
-        return self._rect.collidepoint(collision_pos)
+        return self.rect.collidepoint(collision_pos)
         
     def handle_click(self, event:Event) -> None:
         '''Handle a click interaction with the panel.'''
@@ -100,16 +123,17 @@ class Panel:
             render_label: boolean indicating if the label should be rendered
             render_border: boolean indicating if the border should be rendered
         '''
+        from pygame import draw
         if active:
             bg_col = theme.act_col
         else:
             bg_col = theme.bg_col
-        draw.rect(buffer, bg_col, self._rect, border_radius=theme.bord_r)
+        draw.rect(buffer, bg_col, self.rect, border_radius=theme.bord_r)
         if render_border:
-            draw.rect(buffer, theme.bord_col, self._rect, theme.bord_w, theme.bord_r)
+            draw.rect(buffer, theme.bord_col, self.rect, theme.bord_w, theme.bord_r)
         if render_label:
             label = theme.large_text(self._label)
-            label_x = self._rect.centerx - label.get_width() // 2
-            label_y = self._rect.centery - label.get_height() // 2
+            label_x = self.rect.centerx - label.get_width() // 2
+            label_y = self.rect.centery - label.get_height() // 2
             buffer.blit(label, (label_x, label_y))
         self._hovered = False
\ No newline at end of file
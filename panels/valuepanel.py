@@ -1,10 +1,12 @@
-from typing import Callable
-
-from pygame import Surface
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
 
 from .panel import Panel
 from ..ui.theme import Theme
 
+if TYPE_CHECKING:
+    from pygame import Surface
+
 class ValuePanel(Panel):
     '''
     A class to extend Panel for showing current variable values.
@@ -35,10 +37,10 @@ class ValuePanel(Panel):
         super().render(buffer, theme, render_label=False)
         y_off = self._h // 3
         label = theme.large_text(self._label)
-        label_x = self._rect.centerx - label.get_width() // 2
+        label_x = self.rect.centerx - label.get_width() // 2
         label_y = self._y + y_off - label.get_height() // 2
         buffer.blit(label, (label_x, label_y))
         value = theme.medium_text(self._value_getter())
-        value_x = self._rect.centerx - value.get_width() // 2
+        value_x = self.rect.centerx - value.get_width() // 2
         value_y = self._y + 2 * y_off - value.get_height() // 2
         buffer.blit(value, (value_x, value_y))
\ No newline at end of file
@@ -1,66 +1,149 @@
 from __future__ import annotations
 
-from math import pow
+from functools import lru_cache
 from typing import Tuple, Union
 
 from bitarray import bitarray
 from bitarray.util import ba2int, int2ba
 
+CACHE_SIZE = 4096
+
+# The number of callers counting built signals, and the count while any is
+_counting = 0
+_built = 0
+
+def count_signals(counting:bool) -> None:
+    '''
+    Start or stop counting the signals built.
+
+    Starts and stops nest, so counting stays on until every start has been
+    matched by a stop.
+
+    Parameters:
+        counting: whether to start (True) or stop (False) counting
+    '''
+    global _counting
+    _counting = _counting + 1 if counting else max(0, _counting - 1)
+
+def signals_built() -> int:
+    '''Get the number of signals built while counting was on.'''
+    return _built
+
 class Signal:
     '''
     A class to represent bit signals and their decimal values.
 
     Signals act as immutable objects (i.e. the bits, width, signage, and value
-    are not modifiable.)
+    are not modifiable.) A signal is stored as a masked integer along with its
+    width and signage; the bitarray view is only built when it is requested.
+    Signals created from values (rather than bits) are interned, so equal
+    signals are usually the same object.
 
     Attributes:
         bits (bitarray): the individual bits that make up the signal
         width (int): the bit-width of the signal
         signed (bool): the signage of the signal
         value (int): the integer value of the signal
+        raw (int): the bits of the signal as an unsigned integer
     '''
+
+    __slots__ = ('_width', '_signed', '_bits', '_raw', '_value')
+
     def __init__(self, bits:bitarray=None, width:int=32, signed:bool=True):
         '''
         Initialize the signal and compute the decimal value.
+
+        If the length of bits does not match the width, the bits are sign or
+        zero extended (according to signage) or truncated to the width.
         
         Parameters:
             bits: the individual bits that make up the signal (default None)
             width: the bit-width of the signal (default 32)
             signed: the signage of the signal (default True)
         '''
-        self._bits = bits
-        if bits is None:
-            self._bits = bitarray(width)
-            self._bits.setall(0)
+        global _built
+        if _counting:
+            _built += 1
         self._width = width
         self._signed = signed
-        self._value = ba2int(self._bits, signed=signed)
+        self._bits = None
+        if bits is None or len(bits) == 0:
+            self._raw = 0
+        elif len(bits) == width:
+            self._raw = ba2int(bits, signed=False)
+            self._bits = bits
+        else:
+            self._raw = ba2int(bits, signed=signed) & ((1 << width) - 1)
+        self._value = self._raw
+        if signed and self._raw >> (width - 1):
+            self._value -= 1 << width
 
     @classmethod
-    def from_value(cls, value:int, width:int=32, signed:bool=True) -> Signal:
+    def from_raw(cls, raw:int, width:int, signed:bool) -> Signal:
         '''
-        Create a signal from an integer value instead of a bitarray.
+        Get the interned signal for an unsigned bit pattern, skipping the bits.
         
         Parameters:
-            value: the integer value of the signal
-            width: the bit-width of the signal (default 32)
-            signed: the signage of the signal (default True)
+            raw: the unsigned integer representation of the signal's bits
+            width: the bit-width of the signal
+            signed: the signage of the signal
         '''
+        return _intern(raw, width, signed)
+
+    @classmethod
+    def _new_raw(cls, raw:int, width:int, signed:bool) -> Signal:
+        '''
+        Create a new signal directly from a masked integer, skipping the bits.
+        
+        Parameters:
+            raw: the unsigned integer representation of the signal's bits
+            width: the bit-width of the signal
+            signed: the signage of the signal
+        '''
+        global _built
+        if _counting:
+            _built += 1
+        signal = cls.__new__(cls)
+        signal._width = width
+        signal._signed = signed
+        signal._bits = None
+        signal._raw = raw
+        signal._value = raw
+        if signed and raw >> (width - 1):
+            signal._value -= 1 << width
+        return signal
+
+    @staticmethod
+    def _clamp(value:int, width:int, signed:bool) -> int:
+        '''Clamp an integer value and return its masked representation.'''
         if signed:
             if value < 0:
-                min_signal_val = -int(pow(2, width // 2))
+                min_signal_val = -(1 << (width // 2))
                 value = max(min_signal_val, value)
             else:
-                max_signal_val = int(pow(2, width // 2)) - 1
+                max_signal_val = (1 << (width // 2)) - 1
                 value = min(max_signal_val, value)
         else:
             if value < 0:
                 value = 0
             else:
-                max_signal_val = int(pow(2, width))
+                max_signal_val = 1 << width
                 value = min(max_signal_val, value)
-        bits = int2ba(value, width, signed=signed)
-        return Signal(bits, width, signed)
+                if value == max_signal_val:
+                    raise OverflowError(f'{value} does not fit in {width} bits')
+        return value & ((1 << width) - 1)
+
+    @classmethod
+    def from_value(cls, value:int, width:int=32, signed:bool=True) -> Signal:
+        '''
+        Create a signal from an integer value instead of a bitarray.
+        
+        Parameters:
+            value: the integer value of the signal
+            width: the bit-width of the signal (default 32)
+            signed: the signage of the signal (default True)
+        '''
+        return Signal.from_raw(Signal._clamp(value, width, signed), width, signed)
 
     @classmethod
     def from_bool(cls, value:bool) -> Signal:
@@ -70,11 +153,13 @@ class Signal:
         Parameters:
             value: the boolean value of the signal
         '''
-        return Signal.from_value(int(value), 1, False)
+        return Signal.from_raw(int(bool(value)), 1, False)
 
     @property
     def bits(self) -> bitarray:
         '''Get the bits that make up the signal. Setting is disallowed.'''
+        if self._bits is None:
+            self._bits = int2ba(self._raw, self._width, signed=False)
         return self._bits
 
     @property
@@ -87,6 +172,11 @@ class Signal:
         '''Get the signage of the signal. Setting is disallowed.'''
         return self._signed
 
+    @property
+    def raw(self) -> int:
+        '''Get the unsigned integer form of the bits. Setting is disallowed.'''
+        return self._raw
+
     @property
     def value(self) -> int:
         '''Get the decimal value of the signal. Setting is disallowed.'''
@@ -96,19 +186,32 @@ class Signal:
         '''Return a string representation of the signal.'''
         text = f'{"s" if self._signed else "u"}'
         text += f'{self._width}'
-        return f'{self.value} ({text})'
+        return f'{self._value} ({text})'
+
+    def __eq__(self, other:object) -> bool:
+        '''Return True if both signals have the same bits, width and signage.'''
+        if not isinstance(other, Signal):
+            return NotImplemented
+        return (self._raw == other._raw and 
+                self._width == other._width and 
+                self._signed == other._signed)
+
+    def __hash__(self) -> int:
+        '''Return a hash of the signal's bits, width and signage.'''
+        return hash((self._raw, self._width, self._signed))
 
     def __getitem__(self, key:object) -> bitarray:
         '''Return a bit or slice of bits from the signal.'''
-        return self._bits[key]
+        return self.bits[key]
 
     def __bool__(self) -> bool:
         '''Return False if the signal's decimal value is 0 else True.'''
-        return self._bits.any()
+        return self._raw != 0
 
     def __invert__(self) -> Signal:
         '''Return the result of inverting each bit of the signal.'''
-        return Signal(~self._bits, self._width, self._signed)
+        raw = self._raw ^ ((1 << self._width) - 1)
+        return Signal.from_raw(raw, self._width, self._signed)
 
     def __or__(self, other:Signal) -> Signal:
         '''
@@ -118,8 +221,8 @@ class Signal:
         '''
         if self._width != other.width:
             raise ValueError('Signal bit-widths must match!')
-        bits = self._bits | other.bits
-        return Signal(bits, self._width, self._signed)
+        raw = self._raw | other._raw
+        return Signal.from_raw(raw, self._width, self._signed)
 
     def __and__(self, other:Signal) -> Signal:
         '''
@@ -129,8 +232,100 @@ class Signal:
         '''
         if self._width != other.width:
             raise ValueError('Signal bit-widths must match!')
-        bits = self._bits & other.bits
-        return Signal(bits, self._width, self._signed)
+        raw = self._raw & other._raw
+        return Signal.from_raw(raw, self._width, self._signed)
+
+    def field(self, lo:int, width:int, signed:bool=False) -> Signal:
+        '''
+        Return a bit-field of the signal as a new signal.
+
+        Parameters:
+            lo: the position of the field's lowest bit (0 is the signal's LSB)
+            width: the bit-width of the field
+            signed: the signage of the new signal (default False)
+        '''
+        if lo < 0 or width < 1 or lo + width > self._width:
+            raise ValueError('Field must lie within the signal!')
+        raw = (self._raw >> lo) & ((1 << width) - 1)
+        return Signal.from_raw(raw, width, signed)
+
+    @classmethod
+    def concat(cls, *signals:Signal, signed:bool=True) -> Signal:
+        '''
+        Return the concatenation of signals as a new signal.
+
+        The first signal makes up the most significant bits of the result.
+
+        Parameters:
+            signals: the signals to concatenate
+            signed: the signage of the new signal (default True)
+        '''
+        raw = 0
+        width = 0
+        for signal in signals:
+            raw = (raw << signal.width) | signal.raw
+            width += signal.width
+        return Signal.from_raw(raw, width, signed)
+
+    def sign_extend(self, width:int) -> Signal:
+        '''
+        Return the signal widened by replicating its most significant bit.
+
+        This operation retains the signage of the signal that self refers to.
+
+        Parameters:
+            width: the bit-width of the new signal
+        '''
+        if width < self._width:
+            raise ValueError('Signals can only be extended to a larger width!')
+        raw = self._raw
+        if raw >> (self._width - 1):
+            raw |= ((1 << width) - 1) ^ ((1 << self._width) - 1)
+        return Signal.from_raw(raw, width, self._signed)
+
+    def truncate(self, width:int) -> Signal:
+        '''
+        Return the signal narrowed to its least significant bits.
+
+        This operation retains the signage of the signal that self refers to.
+
+        Parameters:
+            width: the bit-width of the new signal
+        '''
+        if width > self._width:
+            raise ValueError('Signals can only be truncated to a smaller width!')
+        raw = self._raw & ((1 << width) - 1)
+        return Signal.from_raw(raw, width, self._signed)
+
+    def add(self, 
+            other:Union[Signal, int], 
+            carry_in:bool=False
+        ) -> Tuple[Signal, bool, bool]:
+        '''
+        Return the result, carry out flag, and signed overflow flag of adding
+        two signals or a signal and an int.
+
+        The sum is computed on the whole word at once. Integers and the carry
+        in are converted to signals of the same width and signage first.
+        This operation retains the signage of the signal that self refers to.
+
+        Parameters:
+            other: the signal or int to add to this signal
+            carry_in: the carry in to the add operation (default False)
+        '''
+        width = self._width
+        if isinstance(other, int):
+            other_raw = Signal._clamp(other, width, self._signed)
+        elif width != other.width:
+            raise ValueError('Signal bit-widths must match!')
+        else:
+            other_raw = other._raw
+        carry_raw = Signal._clamp(int(carry_in), width, self._signed)
+        total = self._raw + other_raw + carry_raw
+        raw = total & ((1 << width) - 1)
+        carry = total >> width == 1
+        overflow = ((self._raw ^ raw) & (other_raw ^ raw)) >> (width - 1) == 1
+        return Signal.from_raw(raw, width, self._signed), carry, overflow
 
     def __add__(self, other:Union[Signal, int]) -> Tuple[Signal, bool]:
         '''
@@ -139,20 +334,10 @@ class Signal:
 
         This operation retains the signage of the signal that self refers to.
         '''
-        if isinstance(other, int):
-            other = Signal.from_value(other, self._width, self._signed)
-        if self._width != other.width:
-            raise ValueError('Signal bit-widths must match!')
-        bits = bitarray(self._width)
-        carry = False
-        for i in range(self._width - 1, -1, -1):
-            bit_res = self[i] + other[i] + carry
-            bits[i] = bit_res % 2
-            carry = bit_res > 1
-        return Signal(bits, self._width, self._signed), carry
+        value, carry, _ = self.add(other)
+        return value, carry
 
     def plus(self, other:Signal, carry_in:bool=False) -> Tuple[Signal, bool]:
-        
         '''
         Return the result and overflow flag of adding two signals.
 
@@ -163,9 +348,8 @@ class Signal:
             other: the signal to add to this signal
             carry_in: the carry in to the add operation (default False)
         '''
-        carry_sum, carry_overflow = self + int(carry_in)
-        val_sum, val_overflow = carry_sum + other
-        return val_sum, carry_overflow or val_overflow
+        value, carry, _ = self.add(other, carry_in)
+        return value, carry
 
     def __sub__(self, other:Signal) -> Tuple[Signal, bool]:
         '''
@@ -173,4 +357,15 @@ class Signal:
 
         This operation retains the signage of the signal that self refers to.
         '''
-        return self.plus(~other, True)
\ No newline at end of file
+        value, carry, _ = self.add(~other, True)
+        return value, carry
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _intern(raw:int, width:int, signed:bool) -> Signal:
+    '''
+    Return the shared signal for a masked integer, width and signage.
+
+    The cache is bounded; the least recently used signals are evicted first.
+    '''
+    return Signal._new_raw(raw, width, signed)
\ No newline at end of file
@@ -0,0 +1,16 @@
+'''
+Load the repository as the package virpu, so tests can import its modules
+with their relative imports intact.
+'''
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if 'virpu' not in sys.modules:
+    _SPEC = importlib.util.spec_from_file_location('virpu', ROOT / '__init__.py',
+                                                   submodule_search_locations=[str(ROOT)])
+    _MODULE = importlib.util.module_from_spec(_SPEC)
+    sys.modules['virpu'] = _MODULE
+    _SPEC.loader.exec_module(_MODULE)
\ No newline at end of file
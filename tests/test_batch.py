@@ -0,0 +1,34 @@
+'''
+Tests that batch jobs run through the same pipeline as headless runs.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.core.batch import job_options, run_job
+from virpu.core.headless import read_program, run_program
+
+PROGRAM = str(Path(__file__).resolve().parent.parent / 'programs' / 'fib.cor')
+
+JOBS = [
+    {'ticks': 2000, 'mem': ['0:8']},
+    {'ticks': 5000, 'mode': 'compiled', 'until': ['m5=8'], 'mem': ['0:8']},
+    {'ticks': 5000, 'mode': 'netted', 'fast-forward': 2000, 'mem': ['0:8']},
+    {'ticks': 5000, 'watch': ['m3']},
+    {'ticks': 3000, 'mode': 'translated', 'registers': {'1': 5}, 'memory': {'7': -1},
+     'mem': ['0:8']}
+]
+
+@pytest.mark.parametrize('job', JOBS)
+def test_job_matches_run_program(job:dict):
+    job = dict(job, program=PROGRAM)
+    result = run_job(job)
+    assert result['status'] in ('done', 'stopped'), result.get('error')
+    report = run_program(read_program(PROGRAM), job['ticks'], job_options(job))
+    assert {key: result[key] for key in report} == report
+    assert result['status'] == ('stopped' if report['stopped'] else 'done')
+
+def test_job_error_is_reported():
+    result = run_job({'program': PROGRAM, 'mode': 'emulated', 'resume': 'missing.ck'})
+    assert result['status'] == 'error'
+    assert result['error'].startswith('ValueError')
\ No newline at end of file
@@ -0,0 +1,89 @@
+'''
+Round-trip tests for checkpoints: a snapshot taken between instruction
+boundaries is restored in every mode, and the run continues exactly as the
+one it was taken from.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.components.constant import Constant
+from virpu.core import checkpoint
+from virpu.core.canvas import Canvas
+from virpu.core.checkpoint import Checkpoint
+from virpu.core.coredata import CoreData
+from virpu.core.coreutils import INS_CYCLES
+from virpu.core.headless import Headless, MODES, read_program
+
+PROGRAMS = sorted((Path(__file__).resolve().parent.parent / 'programs').glob('*.cor'))
+SNAPSHOT_TICK = 100 * INS_CYCLES + 3
+TICKS = 1500
+
+def _state(core:Headless):
+    '''Get the tick count, port values, registers and written memory of a core.'''
+    return (core.ticks,
+            [port.value for component in core.canvas._components
+                for port in component.in_ports + component.out_ports],
+            core.registers,
+            core.memory(0, 64))
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('path', PROGRAMS, ids=lambda path: path.name)
+def test_restore_continues_in_every_mode(path:Path, mode:str):
+    program = read_program(path)
+    reference = Headless(program)
+    reference.run(SNAPSHOT_TICK)
+    data = reference.snapshot()
+    core = Headless(program, mode)
+    core.restore(data)
+    assert _state(core) == _state(reference)
+    for tick in range(TICKS):
+        reference.run(1)
+        core.run(1)
+        assert _state(core) == _state(reference), tick
+    assert core.diff_memory(reference) == []
+
+@pytest.mark.parametrize('mode', MODES)
+def test_snapshot_is_the_same_in_every_mode(mode:str):
+    program = read_program(PROGRAMS[0])
+    reference = Headless(program)
+    core = Headless(program, mode)
+    reference.run(SNAPSHOT_TICK)
+    core.run(SNAPSHOT_TICK)
+    assert core.snapshot() == reference.snapshot()
+
+def test_restore_into_another_netlist_raises():
+    core = Headless(read_program(PROGRAMS[0]))
+    core.run(SNAPSHOT_TICK)
+    canvas = Canvas(CoreData(), None)
+    canvas.add_component(Constant())
+    with pytest.raises(ValueError, match='does not match'):
+        Checkpoint(core.snapshot()).restore(canvas)
+
+def test_restore_after_port_change_raises():
+    program = read_program(PROGRAMS[0])
+    data = Headless(program).snapshot()
+    core = Headless(program)
+    core.canvas._components[0].width = 8
+    with pytest.raises(ValueError, match='does not match'):
+        core.restore(data)
+
+def test_other_versions_and_files_are_rejected():
+    data = Headless(read_program(PROGRAMS[0])).snapshot()
+    header = checkpoint.HEADER.unpack_from(data)
+    newer = checkpoint.HEADER.pack(header[0], checkpoint.VERSION + 1, *header[2:])
+    with pytest.raises(ValueError, match='version'):
+        Checkpoint(newer + data[checkpoint.HEADER.size:])
+    with pytest.raises(ValueError, match='Not a py-virpu checkpoint'):
+        Checkpoint(b'XXXX' + data[4:])
+
+def test_save_and_load(tmp_path:Path):
+    core = Headless(read_program(PROGRAMS[0]))
+    core.run(SNAPSHOT_TICK)
+    path = str(tmp_path / 'run.ck')
+    checkpoint.save(core.canvas, path)
+    loaded = checkpoint.load(path)
+    assert loaded.ticks == SNAPSHOT_TICK
+    restored = Headless(read_program(PROGRAMS[0]))
+    restored.restore(loaded)
+    assert _state(restored) == _state(core)
\ No newline at end of file
@@ -0,0 +1,39 @@
+'''
+Lockstep tests comparing the instruction-level emulator against the
+component simulation after every instruction.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.core.emulator import Emulator, lockstep
+from virpu.core.headless import MODES, read_program
+from virpu.core.translation import ALU, ALU_SOURCE
+
+PROGRAMS = Path(__file__).resolve().parent.parent / 'programs'
+INSTRUCTIONS = 400
+OPERANDS = [0, 1, -1, 7, -65536, 2 ** 31 - 1, -2 ** 31]
+
+@pytest.mark.parametrize('name', ['fib.cor', 'first-n.cor'])
+def test_lockstep_has_no_mismatch(name:str):
+    assert lockstep(read_program(PROGRAMS / name), INSTRUCTIONS) is None
+
+@pytest.mark.parametrize('mode', MODES[1:])
+def test_lockstep_has_no_mismatch_in_other_modes(mode:str):
+    assert lockstep(read_program(PROGRAMS / 'fib.cor'), INSTRUCTIONS // 4, mode) is None
+
+@pytest.mark.parametrize('name', ['fib.cor', 'first-n.cor', 'mult.cor'])
+def test_translated_blocks_match_stepping(name:str):
+    program = read_program(PROGRAMS / name)
+    stepped = Emulator(program)
+    translated = Emulator(program, compiled=True)
+    stepped.run(INSTRUCTIONS)
+    translated.run(INSTRUCTIONS)
+    assert translated.report([(0, 64)]) == stepped.report([(0, 64)])
+
+@pytest.mark.parametrize('alu_op', sorted(ALU))
+def test_alu_table_matches_generated_source(alu_op:int):
+    for a in OPERANDS:
+        for b in OPERANDS:
+            source = ALU_SOURCE[alu_op].format(a=f'({a})', b=f'({b})')
+            assert ALU[alu_op](a, b) == eval(source), (a, b)
\ No newline at end of file
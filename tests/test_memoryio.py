@@ -0,0 +1,101 @@
+'''
+Round-trip tests for memory files: words dumped in every format load back
+into an empty memory unchanged, at their own addresses or moved.
+'''
+import random
+
+import pytest
+
+from virpu.components.memory import Memory
+from virpu.components.memorystore import MemoryStore
+from virpu.core import memoryio
+
+# A run straddling byte address 0x10000 and one at the top of memory
+RANGES = [(0x3ff0, 0x4010), (Memory.MAX_MEM - 0x20, Memory.MAX_MEM)]
+
+def _store() -> MemoryStore:
+    '''Get an empty memory the size of a data memory.'''
+    return MemoryStore(Memory.MAX_MEM)
+
+def _filled(seed:int=0) -> MemoryStore:
+    '''Get a memory with random words written over RANGES.'''
+    rng = random.Random(seed)
+    store = _store()
+    for start, end in RANGES:
+        store.load_words(start, [rng.getrandbits(32) for _ in range(start, end)])
+    return store
+
+@pytest.mark.parametrize('fmt', memoryio.FORMATS)
+@pytest.mark.parametrize('start, end', RANGES)
+def test_round_trip(fmt:str, start:int, end:int):
+    source = _filled()
+    data = memoryio.dump(source, start, end, fmt)
+    target = _store()
+    count = memoryio.load(target, data, fmt, start if fmt.startswith('raw') else None)
+    assert count == end - start
+    assert target.words(start, end) == source.words(start, end)
+    assert target.words(0, start) == _store().words(0, start)
+    assert target.words(end, Memory.MAX_MEM) == _store().words(end, Memory.MAX_MEM)
+
+@pytest.mark.parametrize('fmt', ['ihex', 'rle'])
+def test_encoded_addresses_move_to_start(fmt:str):
+    source = _filled()
+    start, end = RANGES[0]
+    data = memoryio.dump(source, start, end, fmt)
+    target = _store()
+    memoryio.load(target, data, fmt, 0x100)
+    assert target.words(0x100, 0x100 + end - start) == source.words(start, end)
+
+def test_raw_byte_orders():
+    source = _store()
+    source.load_words(0, [0x11223344])
+    assert memoryio.dump(source, 0, 1, 'raw-le') == bytes.fromhex('44332211')
+    assert memoryio.dump(source, 0, 1, 'raw-be') == bytes.fromhex('11223344')
+
+def test_ihex_extended_linear_address():
+    source = _filled()
+    start, end = RANGES[0]
+    lines = memoryio.dump(source, start, end, 'ihex').decode().split()
+    # Byte address 0x10000 is word 0x4000, so the run crosses into segment 1
+    assert lines[0] == ':020000040000FA'
+    assert ':020000040001F9' in lines
+    assert lines[-1] == ':00000001FF'
+    top = memoryio.dump(source, *RANGES[1], 'ihex').decode().split()
+    assert top[0] == ':020000040003F7'
+    assert memoryio.decode_ihex(memoryio.dump(source, start, end, 'ihex')) == \
+        [(start, source.words(start, end))]
+
+def test_ihex_dirty_runs():
+    source = _filled()
+    data = memoryio.dump_dirty(source)
+    target = _store()
+    memoryio.load(target, data, 'ihex')
+    assert target.words(0, Memory.MAX_MEM) == source.words(0, Memory.MAX_MEM)
+
+def test_rle_untouched_memory_is_one_run():
+    data = memoryio.dump(_store(), fmt='rle')
+    assert len(data) == memoryio.RLE_HEADER.size + memoryio.RLE_RUN.size
+    target = _store()
+    target.load_words(5, [1, 2, 3])
+    memoryio.load(target, data, 'rle')
+    assert target.words(0, Memory.MAX_MEM) == _store().words(0, Memory.MAX_MEM)
+
+def test_invalid_data_is_rejected():
+    with pytest.raises(ValueError):
+        memoryio.load(_store(), b'\x00\x01\x02', 'raw-le')
+    with pytest.raises(ValueError):
+        memoryio.load(_store(), b':00000001FE\n', 'ihex')
+    with pytest.raises(ValueError):
+        memoryio.load(_store(), b'XXXX' + bytes(8), 'rle')
+    with pytest.raises(ValueError):
+        memoryio.load(_store(), bytes(8), 'raw-le', Memory.MAX_MEM - 1)
+
+def test_files_use_their_extension(tmp_path):
+    source = _filled()
+    start, end = RANGES[0]
+    for name in ['data.bin', 'data.be', 'data.hex', 'data.rle']:
+        path = str(tmp_path / name)
+        memoryio.save_file(source, path, start, end)
+        target = _store()
+        memoryio.load_file(target, path, start if memoryio.format_of(path).startswith('raw') else None)
+        assert target.words(start, end) == source.words(start, end)
\ No newline at end of file
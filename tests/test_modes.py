@@ -0,0 +1,72 @@
+'''
+Equivalence tests for the Canvas tick modes.
+
+Each bundled program runs in interpreted mode alongside every other mode, and
+the ports, registers and data memory of the two are compared after every tick.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.core.coreutils import INS_CYCLES
+from virpu.core.headless import Headless
+from virpu.signal.signal import Signal
+
+PROGRAMS = sorted((Path(__file__).resolve().parent.parent / 'programs').glob('*.cor'))
+MODES = ['compiled', 'event-driven', 'netted', 'scheduled']
+TICKS = 3000
+
+def _program(path:Path):
+    '''Read an assembly program.'''
+    with open(path, 'r') as file:
+        return [line.strip() for line in file.readlines()]
+
+def _ports(core:Headless):
+    '''Get the value of every port on the canvas.'''
+    return [(port.value.raw, port.value.width, port.value.signed)
+            for component in core.canvas._components
+            for port in component.in_ports + component.out_ports]
+
+def _assert_same(core:Headless, reference:Headless, tick:int):
+    '''Check that two cores hold the same ports, registers and data memory.'''
+    assert core.ticks == reference.ticks, tick
+    assert _ports(core) == _ports(reference), tick
+    assert core.registers == reference.registers, tick
+    assert core.diff_memory(reference) == [], tick
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('path', PROGRAMS, ids=lambda path: path.name)
+def test_mode_matches_interpreted_every_tick(path:Path, mode:str):
+    program = _program(path)
+    reference = Headless(program)
+    core = Headless(program, mode)
+    for tick in range(TICKS):
+        reference.canvas.tick()
+        core.canvas.tick()
+        _assert_same(core, reference, tick)
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('path', PROGRAMS, ids=lambda path: path.name)
+def test_mode_matches_interpreted_over_runs(path:Path, mode:str):
+    program = _program(path)
+    reference = Headless(program)
+    core = Headless(program, mode)
+    for ticks in (1, 7, 250, 1000):
+        reference.run(ticks)
+        core.run(ticks)
+        _assert_same(core, reference, reference.ticks)
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('phase', range(INS_CYCLES))
+def test_mode_picks_up_port_set_between_runs(mode:str, phase:int):
+    program = _program(PROGRAMS[0])
+    reference = Headless(program)
+    core = Headless(program, mode)
+    for headless in (reference, core):
+        headless.run(500 + phase)
+        pc_port = headless.canvas._components[1].out_by_id['next-ins']
+        pc_port.value = Signal.from_value(2, 16, False)
+    for tick in range(3 * INS_CYCLES):
+        reference.run(1)
+        core.run(1)
+        _assert_same(core, reference, tick)
\ No newline at end of file
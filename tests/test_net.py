@@ -0,0 +1,107 @@
+'''
+Tests for nets: sinks set directly, held until the next commit, and ports
+driven by several wires.
+'''
+import pytest
+
+from virpu.components.constant import Constant
+from virpu.components.incrementer import Incrementer
+from virpu.components.ioport import IOPort
+from virpu.components.net import Net, rejoin
+from virpu.components.wire import Wire
+from virpu.core.canvas import Canvas
+from virpu.core.coredata import CoreData
+from virpu.signal.signal import Signal
+
+def _constant(value:int) -> Constant:
+    '''Get a constant component that outputs a value.'''
+    constant = Constant()
+    constant.value = Signal.from_value(value)
+    return constant
+
+def _canvas(netted:bool):
+    '''
+    Get a canvas with two constants both wired to an incrementer's input,
+    and the incrementer.
+    '''
+    canvas = Canvas(CoreData(), None, netted=netted)
+    first = _constant(3)
+    second = _constant(5)
+    incrementer = Incrementer()
+    for component in (first, second, incrementer):
+        canvas.add_component(component)
+    canvas.add_wire(Wire(first.out_by_id['data'], incrementer.in_by_id['data']))
+    canvas.add_wire(Wire(second.out_by_id['data'], incrementer.in_by_id['data']))
+    return canvas, incrementer
+
+def test_sink_set_directly_is_held_until_commit():
+    source = IOPort('data', 'any', 'out')
+    sink = IOPort('data', 'any', 'in', 16, False)
+    held = []
+    net = Net(source, held)
+    net.attach(sink)
+    source.value = Signal.from_value(3)
+    net.commit()
+    assert sink.value == Signal.from_value(3, 16, False)
+    sink.value = Signal.from_value(7, 16, False)
+    source.value = Signal.from_value(4)
+    assert sink.value.value == 7
+    assert held == [(sink, net)]
+    net.commit()
+    assert sink.value == Signal.from_value(4, 16, False)
+    assert held == []
+
+def test_rejoin_reattaches_sinks_of_every_net_sharing_held():
+    held = []
+    sources = [IOPort('data', 'any', 'out') for _ in range(2)]
+    sinks = [IOPort('data', 'any', 'in') for _ in range(2)]
+    nets = [Net(source, held) for source in sources]
+    for net, sink in zip(nets, sinks):
+        net.attach(sink)
+        sink.value = Signal.from_value(9)
+    assert [sink.value.value for sink in sinks] == [9, 9]
+    for net, source in zip(nets, sources):
+        source.value = Signal.from_value(2)
+        net.value = source._value
+    rejoin(held)
+    assert [sink.value.value for sink in sinks] == [2, 2]
+    assert held == []
+
+def test_detach_leaves_sinks_holding_their_values():
+    source = IOPort('data', 'any', 'out')
+    sink = IOPort('data', 'any', 'in')
+    net = Net(source)
+    net.attach(sink)
+    source.value = Signal.from_value(6)
+    net.commit()
+    net.detach()
+    source.value = Signal.from_value(1)
+    assert sink.value.value == 6
+    assert net.sinks == []
+
+@pytest.mark.parametrize('ticks', [1, 2, 5])
+def test_port_with_several_drivers_reads_last_wire(ticks:int):
+    netted, netted_inc = _canvas(True)
+    wired, wired_inc = _canvas(False)
+    for _ in range(ticks):
+        netted.tick()
+        wired.tick()
+    assert netted_inc.in_by_id['data'].value.value == 5
+    assert netted_inc.in_by_id['data'].value == wired_inc.in_by_id['data'].value
+    assert netted_inc.out_by_id['data'].value == wired_inc.out_by_id['data'].value
+
+def test_sink_set_between_ticks_matches_wires():
+    netted, netted_inc = _canvas(True)
+    wired, wired_inc = _canvas(False)
+    for _ in range(2):
+        netted.tick()
+        wired.tick()
+    for incrementer in (netted_inc, wired_inc):
+        incrementer.in_by_id['data'].value = Signal.from_value(9, 16, False)
+    assert netted_inc.in_by_id['data'].value.value == 9
+    for _ in range(3):
+        netted.tick()
+        wired.tick()
+        assert netted_inc.in_by_id['data'].value == wired_inc.in_by_id['data'].value
+        assert netted_inc.out_by_id['data'].value == wired_inc.out_by_id['data'].value
+    assert netted_inc.out_by_id['data'].value.value == 6
\ No newline at end of file
@@ -0,0 +1,80 @@
+'''
+Tests that profiles count the same work in every mode that does not skip
+work, and that profiling leaves runs unchanged.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.core.headless import Headless, read_program
+from virpu.core.profiler import Profiler
+from virpu.signal import signal
+
+PROGRAM = Path(__file__).resolve().parent.parent / 'programs' / 'fib.cor'
+TICKS = 500
+
+def _profile(mode:str):
+    '''Profile a run in a mode and get the profiler and the core.'''
+    core = Headless(read_program(PROGRAM), mode)
+    profiler = Profiler(core.canvas)
+    profiler.enable()
+    core.run(TICKS)
+    profiler.disable()
+    return profiler, core
+
+def _calls(profiler:Profiler):
+    '''Get the calls counted by class.'''
+    return {name: stats[0] for name, stats in profiler.by_class().items()}
+
+@pytest.mark.parametrize('mode', ['compiled', 'netted', 'scheduled'])
+def test_calls_match_interpreted(mode:str):
+    reference, _ = _profile('interpreted')
+    profiler, _ = _profile(mode)
+    assert _calls(reference)['Wire'] == TICKS * len(reference.canvas._wires)
+    assert _calls(profiler) == _calls(reference)
+
+@pytest.mark.parametrize('mode', ['compiled', 'netted', 'event-driven'])
+def test_profiled_run_matches_unprofiled(mode:str):
+    _, profiled = _profile(mode)
+    core = Headless(read_program(PROGRAM), mode)
+    core.run(TICKS)
+    assert profiled.report([(0, 16)]) == core.report([(0, 16)])
+    core.run(TICKS)
+    profiled.run(TICKS)
+    assert profiled.report([(0, 16)]) == core.report([(0, 16)])
+
+def _signals(profiler:Profiler):
+    '''Get the signals counted over every instance.'''
+    return sum(stats[2] for stats in profiler.stats.values())
+
+def test_other_canvases_are_not_counted():
+    core = Headless(read_program(PROGRAM))
+    other = Headless(read_program(PROGRAM))
+    profiler = Profiler(core.canvas)
+    profiler.enable()
+    other.run(TICKS)
+    profiler.disable()
+    assert _signals(profiler) == 0
+
+def _builds_counted() -> bool:
+    '''Check if building a signal is counted.'''
+    built = signal.signals_built()
+    signal.Signal(None, 8, False)
+    return signal.signals_built() == built + 1
+
+def test_overlapping_profilers_keep_counting_until_both_disable():
+    first = Profiler(Headless(read_program(PROGRAM)).canvas)
+    second = Profiler(Headless(read_program(PROGRAM)).canvas)
+    assert not _builds_counted()
+    first.enable()
+    second.enable()
+    first.disable()
+    assert _builds_counted()
+    second.disable()
+    assert not _builds_counted()
+    second.enable()
+    first.enable()
+    second.disable()
+    assert _builds_counted()
+    first.disable()
+    assert not _builds_counted()
\ No newline at end of file
@@ -0,0 +1,59 @@
+'''
+Regression tests for changing cycle counts and counters on a scheduled
+canvas, compared against the same changes on an unscheduled one.
+'''
+from pathlib import Path
+
+import pytest
+
+from virpu.components.component import Component
+from virpu.core.headless import Headless
+
+PROGRAM = Path(__file__).resolve().parent.parent / 'programs' / 'fib.cor'
+
+def _cores():
+    '''Get an unscheduled and a scheduled core running the same program.'''
+    with open(PROGRAM, 'r') as file:
+        program = [line.strip() for line in file.readlines()]
+    return Headless(program), Headless(program, 'scheduled')
+
+def _state(core:Headless):
+    '''Get the counters, port values and registers of a core.'''
+    components = core.canvas._components
+    return ([component.counter for component in components],
+            [port.value for component in components
+                for port in component.in_ports + component.out_ports],
+            core.registers)
+
+def _changes(core:Headless, step:int):
+    '''Change the cycles and counters of a spread of components.'''
+    components = core.canvas._components
+    for index in range(step % 3, len(components), 3):
+        component = components[index]
+        if step % 2:
+            component.cycles = 1 + (index + step) % Component.MAX_CYCLES
+        component.counter = 1 + (index * step) % component.cycles
+
+@pytest.mark.parametrize('ticks', [1, 4, 13])
+def test_counter_and_cycles_changed_mid_run(ticks:int):
+    reference, core = _cores()
+    for step in range(1, 8):
+        for headless in (reference, core):
+            headless.run(ticks)
+            _changes(headless, step)
+        assert _state(core) == _state(reference), step
+        for tick in range(2 * Component.MAX_CYCLES):
+            reference.run(1)
+            core.run(1)
+            assert _state(core) == _state(reference), (step, tick)
+
+def test_counter_set_before_scheduling():
+    reference, core = _cores()
+    for headless in (reference, core):
+        for index, component in enumerate(headless.canvas._components):
+            component.cycles = 4
+            component.counter = 1 + index % 4
+    for tick in range(40):
+        reference.run(1)
+        core.run(1)
+        assert _state(core) == _state(reference), tick
\ No newline at end of file
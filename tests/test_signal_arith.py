@@ -0,0 +1,148 @@
+'''
+Differential tests for the word-level Signal arithmetic.
+
+Every result is compared against the ripple-carry loop that Signal.__add__
+used before, for every width from 1 to 32 and both signednesses.
+'''
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+from bitarray import bitarray
+
+_PATH = Path(__file__).resolve().parent.parent / 'signal' / 'signal.py'
+_SPEC = importlib.util.spec_from_file_location('virpu_signal', _PATH)
+_MODULE = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(_MODULE)
+Signal = _MODULE.Signal
+
+WIDTHS = range(1, 33)
+EXHAUSTIVE_WIDTH = 5
+SAMPLES = 200
+
+def _ripple(a:Signal, b:Signal, carry:bool):
+    '''Add two signals bit by bit, as the original Signal.__add__ did.'''
+    width = a.width
+    bits = bitarray(width)
+    carry_into_msb = False
+    for i in range(width - 1, -1, -1):
+        if i == 0:
+            carry_into_msb = carry
+        bit_res = a[i] + b[i] + carry
+        bits[i] = bit_res % 2
+        carry = bit_res > 1
+    overflow = carry_into_msb != carry
+    return Signal(bits, width, a.signed), carry, overflow
+
+def _old_add(a:Signal, other):
+    '''The original Signal.__add__, converting ints with from_value.'''
+    if isinstance(other, int):
+        other = Signal.from_value(other, a.width, a.signed)
+    value, carry, _ = _ripple(a, other, False)
+    return value, carry
+
+def _old_plus(a:Signal, b:Signal, carry_in:bool=False):
+    '''The original Signal.plus, adding the carry in as a separate int.'''
+    carry_sum, carry_overflow = _old_add(a, int(carry_in))
+    val_sum, val_overflow = _old_add(carry_sum, b)
+    return val_sum, carry_overflow or val_overflow
+
+def _carry_word(width:int, signed:bool, carry_in:bool) -> bool:
+    '''Get the carry in as the word the arithmetic actually adds.'''
+    return bool(Signal.from_value(int(carry_in), width, signed).value)
+
+def _edges(width:int):
+    '''Get the raw values at the word and clamp boundaries of a width.'''
+    top = (1 << width) - 1
+    half = 1 << (width // 2)
+    raws = {0, 1, top, top - 1, 1 << (width - 1), (1 << (width - 1)) - 1,
+            half - 1, half, (-half) & top, (-half - 1) & top}
+    return sorted(raw & top for raw in raws)
+
+def _raws(width:int):
+    '''Get the raw operand values to test at a width.'''
+    if width <= EXHAUSTIVE_WIDTH:
+        return list(range(1 << width))
+    rng = random.Random(width)
+    return _edges(width) + [rng.getrandbits(width) for _ in range(SAMPLES // 10)]
+
+def _pairs(width:int):
+    '''Get the pairs of raw operands to test at a width.'''
+    raws = _raws(width)
+    if width <= EXHAUSTIVE_WIDTH:
+        return [(a, b) for a in raws for b in raws]
+    rng = random.Random(-width)
+    edges = _edges(width)
+    pairs = [(a, b) for a in edges for b in edges]
+    pairs += [(rng.choice(raws), rng.choice(raws)) for _ in range(SAMPLES)]
+    return pairs
+
+def _same(actual:Signal, expected:Signal) -> bool:
+    '''Check two signals for the same bits, width and signage.'''
+    return (actual.bits == expected.bits and actual.width == expected.width
+            and actual.signed == expected.signed and actual.value == expected.value)
+
+@pytest.mark.parametrize('signed', [False, True])
+@pytest.mark.parametrize('width', WIDTHS)
+def test_add_matches_ripple_carry(width:int, signed:bool):
+    for a_raw, b_raw in _pairs(width):
+        a = Signal.from_raw(a_raw, width, signed)
+        b = Signal.from_raw(b_raw, width, signed)
+        for carry_in in (False, True):
+            value, carry, overflow = a.add(b, carry_in)
+            expected = _ripple(a, b, _carry_word(width, signed, carry_in))
+            assert _same(value, expected[0]), (a_raw, b_raw, carry_in)
+            assert carry == expected[1], (a_raw, b_raw, carry_in)
+            assert overflow == expected[2], (a_raw, b_raw, carry_in)
+
+@pytest.mark.parametrize('signed', [False, True])
+@pytest.mark.parametrize('width', WIDTHS)
+def test_dunder_add_and_plus_match_original(width:int, signed:bool):
+    for a_raw, b_raw in _pairs(width):
+        a = Signal.from_raw(a_raw, width, signed)
+        b = Signal.from_raw(b_raw, width, signed)
+        value, carry = a + b
+        expected = _old_add(a, b)
+        assert _same(value, expected[0]) and carry == expected[1], (a_raw, b_raw)
+        for carry_in in (False, True):
+            value, carry = a.plus(b, carry_in)
+            expected = _old_plus(a, b, carry_in)
+            assert _same(value, expected[0]), (a_raw, b_raw, carry_in)
+            assert carry == expected[1], (a_raw, b_raw, carry_in)
+
+@pytest.mark.parametrize('signed', [False, True])
+@pytest.mark.parametrize('width', WIDTHS)
+def test_sub_matches_original(width:int, signed:bool):
+    for a_raw, b_raw in _pairs(width):
+        a = Signal.from_raw(a_raw, width, signed)
+        b = Signal.from_raw(b_raw, width, signed)
+        value, borrow = a - b
+        expected = _old_plus(a, ~b, True)
+        assert _same(value, expected[0]), (a_raw, b_raw)
+        assert borrow == expected[1], (a_raw, b_raw)
+        _, _, overflow = a.add(~b, True)
+        ripple = _ripple(a, ~b, _carry_word(width, signed, True))
+        assert overflow == ripple[2], (a_raw, b_raw)
+
+@pytest.mark.parametrize('signed', [False, True])
+@pytest.mark.parametrize('width', WIDTHS)
+def test_add_int_clamps_like_from_value(width:int, signed:bool):
+    half = 1 << (width // 2)
+    top = 1 << width
+    if signed:
+        values = [0, 1, -1, half - 1, half, half + 1, -half, -half - 1, top, -top]
+    else:
+        values = [0, 1, top - 1, top // 2, max(0, half - 1), -1, -top, top, top + 1]
+    for a_raw in _edges(width):
+        a = Signal.from_raw(a_raw, width, signed)
+        for other in values:
+            if not signed and other >= top:
+                with pytest.raises(OverflowError):
+                    _old_add(a, other)
+                with pytest.raises(OverflowError):
+                    a + other
+                continue
+            value, carry = a + other
+            expected = _old_add(a, other)
+            assert _same(value, expected[0]) and carry == expected[1], (a_raw, other)
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import Tuple
+from __future__ import annotations
+from typing import TYPE_CHECKING, Tuple
 
-from pygame import Surface
-from pygame.font import Font, SysFont
+if TYPE_CHECKING:
+    from pygame import Surface
+    from pygame.font import Font
 
 class Theme:
     '''
@@ -54,9 +56,16 @@ class Theme:
         self.bord_col = bord_col
         self.bord_w = bord_w
         self.bord_r = bord_r
-        self._sm_font = SysFont(font_name, sm_font_size)
-        self._md_font = SysFont(font_name, md_font_size)
-        self._lg_font = SysFont(font_name, lg_font_size)
+        self._font_name = font_name
+        self._font_sizes = (sm_font_size, md_font_size, lg_font_size)
+        self._fonts = None
+
+    def _load_fonts(self) -> Tuple[Font, Font, Font]:
+        '''Get the small, medium and large fonts, loading them on first use.'''
+        if self._fonts is None:
+            from pygame.font import SysFont
+            self._fonts = tuple(SysFont(self._font_name, size) for size in self._font_sizes)
+        return self._fonts
 
     def _render_text(self, text_obj:object, font:Font, inv_col:bool=False) -> Surface:
         '''Render a text version of text_obj using the given font and color.'''
@@ -66,12 +75,12 @@ class Theme:
 
     def small_text(self, text_obj:object, inv_col:bool=False) -> Surface:
         '''Render a text version of text_obj using the small font.'''
-        return self._render_text(text_obj, self._sm_font, inv_col)
+        return self._render_text(text_obj, self._load_fonts()[0], inv_col)
 
     def medium_text(self, text_obj:object, inv_col:bool=False) -> Surface:
         '''Render a text version of text_obj using the medium font.'''
-        return self._render_text(text_obj, self._md_font, inv_col)
+        return self._render_text(text_obj, self._load_fonts()[1], inv_col)
         
     def large_text(self, text_obj:object, inv_col:bool=False) -> Surface:
         '''Render a text version of text_obj using the large font.'''
-        return self._render_text(text_obj, self._lg_font, inv_col)
\ No newline at end of file
+        return self._render_text(text_obj, self._load_fonts()[2], inv_col)
\ No newline at end of file